@@ -0,0 +1,3 @@
+"""
+Ishlash tezligi benchmarklari (python -m benchmarks.<modul>)
+"""
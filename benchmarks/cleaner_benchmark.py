@@ -0,0 +1,169 @@
+"""
+DataCleaner benchmarki: sintetik eksportlar korpusi, har bir bosqich vaqti va xotira cho'qqisi
+
+Ishlatish:
+    python -m benchmarks.cleaner_benchmark --grid quick --output data/benchmarks/cleaner.json
+    python -m benchmarks.cleaner_benchmark --grid full --baseline data/benchmarks/cleaner_baseline.json
+
+Baseline bilan solishtirilganda vaqt yoki xotira --threshold dan ko'proq oshgan holatlar
+sanab chiqiladi va dastur 1 kodi bilan tugaydi (CI uchun).
+"""
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from benchmarks import common
+from bot.utils.data_cleaner import DataCleaner
+from bot.utils.sample_file_generator import SampleFileGenerator
+from bot.utils.upload_preflight import MAX_UPLOAD_CELLS
+
+logger = logging.getLogger(__name__)
+
+# O'lchamlar to'plami: qatorlar × ustunlar
+GRIDS = {
+    'quick': {'rows': [100, 1000], 'columns': [10, 50]},
+    'full': {'rows': [100, 1000, 10_000, 100_000], 'columns': [10, 50, 200, 500]},
+}
+
+# Bot qabul qilmaydigan (preflight rad etadigan) o'lchamlar o'lchanmaydi
+MAX_BENCHMARK_CELLS = MAX_UPLOAD_CELLS
+
+DEFAULT_REPEATS = 3
+DEFAULT_THRESHOLD = 0.25
+
+# Bundan kichik farqlar o'lchash shovqini hisoblanadi
+MIN_REGRESSION_SECONDS = 0.01
+MIN_REGRESSION_MEMORY_MB = 1.0
+
+CASE_FIELDS = ('kind', 'rows', 'columns')
+METRICS = [
+    ('total_seconds', MIN_REGRESSION_SECONDS, 'vaqt (s)'),
+    ('peak_memory_mb', MIN_REGRESSION_MEMORY_MB, 'xotira (MB)'),
+]
+
+
+def _clean(df, answer_key):
+    cleaner = DataCleaner()
+    if answer_key:
+        return cleaner.clean_raw_answers(df, answer_key)
+    return cleaner.clean_data(df)
+
+
+def run_case(generator: SampleFileGenerator, kind: str, n_rows: int, n_columns: int,
+             repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """
+    Bitta holatni o'lchash: eng yaxshi vaqt (repeats marta) va alohida o'tishda xotira cho'qqisi
+
+    Returns:
+        {'kind', 'rows', 'columns', 'input_shape', 'output_shape', 'total_seconds',
+         'peak_memory_mb', 'steps': {bosqich: sekund}}
+    """
+    df, answer_key = generator.generate_synthetic_export(kind, n_rows, n_columns)
+
+    best_seconds = None
+    best_metadata = None
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        cleaned, metadata = _clean(df, answer_key)
+        elapsed = time.perf_counter() - start
+        if best_seconds is None or elapsed < best_seconds:
+            best_seconds, best_metadata = elapsed, metadata
+
+    # tracemalloc vaqtni sekinlashtiradi - xotira alohida o'tishda o'lchanadi
+    tracemalloc.start()
+    try:
+        _clean(df, answer_key)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'kind': kind,
+        'rows': n_rows,
+        'columns': n_columns,
+        'input_shape': list(df.shape),
+        'output_shape': list(best_metadata['final_shape']),
+        'total_seconds': round(best_seconds, 6),
+        'peak_memory_mb': round(peak / (1024 * 1024), 3),
+        'steps': {step: round(seconds, 6) for step, seconds in best_metadata.get('step_timings', {}).items()}
+    }
+
+
+def run_benchmark(grid: str = 'quick', kinds: Optional[List[str]] = None, repeats: int = DEFAULT_REPEATS,
+                  corpus_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Butun to'plamni o'lchash
+
+    Args:
+        grid: GRIDS kaliti
+        kinds: Eksport turlari (default: SampleFileGenerator.SYNTHETIC_KINDS)
+        repeats: Har bir holat necha marta o'lchanadi
+        corpus_dir: Berilsa, korpus Excel fayllar sifatida ham saqlanadi
+
+    Returns:
+        Natijalar ro'yxati (run_case formatida)
+    """
+    generator = SampleFileGenerator(output_dir=corpus_dir or 'data/samples')
+    kinds = kinds or SampleFileGenerator.SYNTHETIC_KINDS
+    sizes = GRIDS[grid]
+
+    results = []
+    for kind in kinds:
+        for n_rows in sizes['rows']:
+            for n_columns in sizes['columns']:
+                if n_rows * n_columns > MAX_BENCHMARK_CELLS:
+                    logger.info(f"⏭️ {kind} {n_rows}×{n_columns}: preflight chegarasidan katta, o'tkazib yuborildi")
+                    continue
+                if corpus_dir:
+                    generator.create_synthetic_sample(kind, n_rows, n_columns)
+                result = run_case(generator, kind, n_rows, n_columns, repeats)
+                logger.info(f"⏱️ {kind} {n_rows}×{n_columns}: {result['total_seconds']:.3f}s, "
+                            f"{result['peak_memory_mb']:.1f} MB")
+                results.append(result)
+    return results
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Vaqt yoki xotira cho'qqisi threshold dan ko'proq oshgan holatlar"""
+    return common.find_regressions(results, baseline, CASE_FIELDS, METRICS, threshold)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DataCleaner benchmarki")
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick')
+    parser.add_argument('--kinds', nargs='+', choices=SampleFileGenerator.SYNTHETIC_KINDS)
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--output', help="Natijalarni JSON faylga yozish")
+    parser.add_argument('--baseline', help="Solishtirish uchun oldingi natijalar (JSON)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Ruxsat etilgan o'sish ulushi (0.25 = 25%%)")
+    parser.add_argument('--corpus-dir', help="Sintetik korpusni Excel fayllar sifatida saqlash")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    # Tozalash jarayonining batafsil loglari benchmark chiqishini bosib ketmasligi uchun
+    logging.getLogger('bot').setLevel(logging.WARNING)
+
+    results = run_benchmark(args.grid, args.kinds, args.repeats, args.corpus_dir)
+
+    if args.output:
+        common.write_json(results, args.output)
+        logger.info(f"💾 Natijalar saqlandi: {args.output}")
+
+    if args.baseline:
+        baseline = common.load_json(args.baseline)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            logger.error("❌ Regressiyalar topildi:\n" + "\n".join(f"  - {item}" for item in regressions))
+            return 1
+        logger.info("✅ Regressiya yo'q")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmarklar uchun umumiy yordamchilar: natijalarni yozish va baseline bilan solishtirish
+"""
+import csv
+import json
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+# (metrika, shovqin chegarasi, hisobotdagi nomi)
+Metric = Tuple[str, float, str]
+
+
+def write_json(results: List[Dict[str, Any]], path: str) -> str:
+    """Natijalarni JSON faylga yozish"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_json(path: str) -> List[Dict[str, Any]]:
+    """Oldingi natijalarni (baseline) o'qish"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_csv(results: List[Dict[str, Any]], path: str) -> str:
+    """Natijalarni tekis CSV jadvalga yozish (ichki lug'atlar 'steps.remove_empty' kabi ustunlarga yoyiladi)"""
+    rows = []
+    for result in results:
+        row = {}
+        for key, value in result.items():
+            if isinstance(value, dict):
+                row.update({f"{key}.{inner}": inner_value for inner, inner_value in value.items()})
+            elif isinstance(value, (list, tuple)):
+                row[key] = 'x'.join(str(item) for item in value)
+            else:
+                row[key] = value
+        rows.append(row)
+
+    fieldnames = []
+    for row in rows:
+        fieldnames.extend(key for key in row if key not in fieldnames)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                     key_fields: Sequence[str], metrics: Sequence[Metric], threshold: float) -> List[str]:
+    """
+    Baseline bilan solishtirish
+
+    Args:
+        results: Joriy natijalar
+        baseline: Oldingi natijalar
+        key_fields: Holatni aniqlaydigan maydonlar (masalan, kind/rows/columns)
+        metrics: Tekshiriladigan metrikalar
+        threshold: Ruxsat etilgan o'sish ulushi (0.25 = 25%)
+
+    Returns:
+        Regressiyalar tavsifi (bo'sh ro'yxat - hammasi joyida)
+    """
+    baseline_by_case = {tuple(item[field] for field in key_fields): item for item in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_case.get(tuple(result[field] for field in key_fields))
+        if previous is None:
+            continue
+
+        label = ' '.join(f"{field}={result[field]}" for field in key_fields)
+        for metric, noise_floor, title in metrics:
+            current, old = result.get(metric), previous.get(metric)
+            if current is None or old is None:
+                continue
+            if current > old * (1 + threshold) and current - old > noise_floor:
+                regressions.append(f"{label}: {title} {old:.3f} → {current:.3f}")
+
+    return regressions
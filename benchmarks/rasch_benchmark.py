@@ -0,0 +1,189 @@
+"""
+RaschAnalyzer masshtablash benchmarki: ma'lum parametrlardan sintetik javoblar
+
+Har bir holat (talabgorlar × savollar × bo'sh javoblar ulushi) uchun rasch_mml,
+qobiliyat baholash, standart xatolar va ishonchlilik vaqti alohida o'lchanadi,
+haqiqiy parametrlarni tiklash xatosi (RMSE, korrelyatsiya) hisoblanadi.
+
+Ishlatish:
+    python -m benchmarks.rasch_benchmark --grid quick --output data/benchmarks/rasch.json --csv data/benchmarks/rasch.csv
+    python -m benchmarks.rasch_benchmark --grid full --baseline data/benchmarks/rasch_baseline.json
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from girth import INVALID_RESPONSE, rasch_mml
+
+from benchmarks import common
+from bot.utils.rasch_analysis import RaschAnalyzer
+
+logger = logging.getLogger(__name__)
+
+GRIDS = {
+    'quick': {'persons': [100, 500], 'items': [10, 30], 'missing': [0.0, 0.1]},
+    'full': {'persons': [100, 500, 2000, 10_000], 'items': [10, 30, 60, 120], 'missing': [0.0, 0.05, 0.2]},
+}
+
+DEFAULT_THRESHOLD = 0.25
+MIN_REGRESSION_SECONDS = 0.02
+
+CASE_FIELDS = ('persons', 'items', 'missing_rate')
+METRICS = [
+    ('total_seconds', MIN_REGRESSION_SECONDS, 'vaqt (s)'),
+    ('mml_seconds', MIN_REGRESSION_SECONDS, 'rasch_mml (s)'),
+    ('ability_seconds', MIN_REGRESSION_SECONDS, 'qobiliyat (s)'),
+]
+
+
+def simulate_responses(n_persons: int, n_items: int, missing_rate: float = 0.0,
+                       seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rasch modelidan dixotomik javoblar
+
+    Qobiliyatlar N(0, 1) dan, qiyinliklar [-2, 2] oralig'ida teng taqsimlangan.
+
+    Returns:
+        (javoblar talabgorlar × savollar - bo'sh javoblar NaN, haqiqiy qobiliyatlar, haqiqiy qiyinliklar)
+    """
+    rng = np.random.default_rng(seed)
+    abilities = rng.normal(0.0, 1.0, n_persons)
+    difficulties = np.linspace(-2.0, 2.0, n_items)
+
+    probabilities = 1 / (1 + np.exp(-(abilities[:, np.newaxis] - difficulties[np.newaxis, :])))
+    responses = (rng.random((n_persons, n_items)) < probabilities).astype(float)
+    if missing_rate > 0:
+        responses[rng.random(responses.shape) < missing_rate] = np.nan
+
+    return responses, abilities, difficulties
+
+
+def _rmse(estimated: np.ndarray, true: np.ndarray) -> float:
+    mask = np.isfinite(estimated)
+    return float(np.sqrt(np.mean((estimated[mask] - true[mask]) ** 2))) if mask.any() else float('nan')
+
+
+def _correlation(estimated: np.ndarray, true: np.ndarray) -> float:
+    mask = np.isfinite(estimated)
+    if mask.sum() < 3 or np.std(estimated[mask]) == 0:
+        return float('nan')
+    return float(np.corrcoef(estimated[mask], true[mask])[0, 1])
+
+
+def run_case(n_persons: int, n_items: int, missing_rate: float = 0.0, seed: int = 0) -> Dict[str, Any]:
+    """
+    Bitta holatni o'lchash
+
+    Bosqichlar RaschAnalyzer.fit bilan bir xil tartibda alohida chaqiriladi, so'ng
+    to'liq fit vaqti ham o'lchanadi (umumiy qo'shimcha xarajatlar bilan).
+
+    Returns:
+        {'persons', 'items', 'missing_rate', 'mml_seconds', 'ability_seconds', 'se_seconds',
+         'reliability_seconds', 'total_seconds', 'difficulty_rmse', 'ability_rmse',
+         'ability_correlation', 'reliability'}
+    """
+    responses, true_abilities, true_difficulties = simulate_responses(n_persons, n_items, missing_rate, seed)
+    analyzer = RaschAnalyzer()
+
+    start = time.perf_counter()
+    girth_matrix = np.where(np.isnan(responses), INVALID_RESPONSE, responses).astype(int)
+    difficulty = np.asarray(rasch_mml(girth_matrix.T)['Difficulty'])
+    mml_seconds = time.perf_counter() - start
+    analyzer.difficulty = difficulty
+
+    start = time.perf_counter()
+    abilities = analyzer._estimate_person_abilities(responses, difficulty)
+    ability_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer._calculate_standard_errors(responses, abilities)
+    se_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reliability = analyzer._estimate_reliability(responses, difficulty)
+    reliability_seconds = time.perf_counter() - start
+
+    frame = pd.DataFrame(responses, columns=[f"Savol_{i + 1}" for i in range(n_items)])
+    start = time.perf_counter()
+    RaschAnalyzer().fit(frame)
+    total_seconds = time.perf_counter() - start
+
+    # Chetki (0 yoki maksimal ball) talabgorlar ±3 ga qotiriladi - tiklash xatosidan chiqariladi
+    extreme = np.isin(abilities, [-3.0, 3.0])
+    estimated_abilities = np.where(extreme, np.nan, abilities)
+
+    return {
+        'persons': n_persons,
+        'items': n_items,
+        'missing_rate': missing_rate,
+        'mml_seconds': round(mml_seconds, 6),
+        'ability_seconds': round(ability_seconds, 6),
+        'se_seconds': round(se_seconds, 6),
+        'reliability_seconds': round(reliability_seconds, 6),
+        'total_seconds': round(total_seconds, 6),
+        'difficulty_rmse': round(_rmse(difficulty - difficulty.mean(), true_difficulties - true_difficulties.mean()), 4),
+        'ability_rmse': round(_rmse(estimated_abilities, true_abilities), 4),
+        'ability_correlation': round(_correlation(estimated_abilities, true_abilities), 4),
+        'reliability': round(reliability, 4)
+    }
+
+
+def run_benchmark(grid: str = 'quick', seed: int = 0) -> List[Dict[str, Any]]:
+    """Butun to'plamni o'lchash"""
+    sizes = GRIDS[grid]
+    results = []
+    for n_persons in sizes['persons']:
+        for n_items in sizes['items']:
+            for missing_rate in sizes['missing']:
+                result = run_case(n_persons, n_items, missing_rate, seed)
+                logger.info(f"⏱️ {n_persons}×{n_items} (bo'sh {missing_rate:.0%}): {result['total_seconds']:.3f}s "
+                            f"[mml {result['mml_seconds']:.3f}s, qobiliyat {result['ability_seconds']:.3f}s], "
+                            f"RMSE b={result['difficulty_rmse']}, θ={result['ability_rmse']}")
+                results.append(result)
+    return results
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Umumiy, rasch_mml yoki qobiliyat vaqti threshold dan ko'proq oshgan holatlar"""
+    return common.find_regressions(results, baseline, CASE_FIELDS, METRICS, threshold)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="RaschAnalyzer masshtablash benchmarki")
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Natijalarni JSON faylga yozish")
+    parser.add_argument('--csv', help="Natijalarni CSV jadvalga yozish")
+    parser.add_argument('--baseline', help="Solishtirish uchun oldingi natijalar (JSON)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Ruxsat etilgan o'sish ulushi (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    results = run_benchmark(args.grid, args.seed)
+
+    if args.output:
+        common.write_json(results, args.output)
+        logger.info(f"💾 Natijalar saqlandi: {args.output}")
+    if args.csv:
+        common.write_csv(results, args.csv)
+        logger.info(f"💾 Jadval saqlandi: {args.csv}")
+
+    if args.baseline:
+        regressions = find_regressions(results, common.load_json(args.baseline), args.threshold)
+        if regressions:
+            logger.error("❌ Regressiyalar topildi:\n" + "\n".join(f"  - {item}" for item in regressions))
+            return 1
+        logger.info("✅ Regressiya yo'q")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
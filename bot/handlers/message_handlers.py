@@ -1,14 +1,32 @@
+import asyncio
 import os
+from functools import partial
 import pandas as pd
 import fitz
 from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from bot.utils.rasch_analysis import RaschAnalyzer
-from bot.utils.pdf_generator import PDFReportGenerator
+from bot.utils.pdf_generator import PDFReportGenerator, calculate_section_scores
 from bot.utils.user_data import UserDataManager
 from bot.utils.student_data import StudentDataManager
-from bot.utils.subject_sections import get_sections, has_sections
+from bot.utils.subject_sections import format_question_list, get_sections, has_sections
 from bot.utils.data_cleaner import DataCleaner
+from bot.utils.cleaning_profiles import CleaningProfileManager
+from bot.utils.upload_loader import get_upload
+from bot.utils.upload_preflight import (
+    ACCEPT, QUEUE, REJECT, HeavyJobQueue, format_preflight_message, preflight_upload
+)
+from bot.utils.answer_scoring import parse_answer_key
+from bot.utils.distractor_analysis import analyze_distractors
+from bot.utils.report_orchestrator import ReportTask, send_reports
+from bot.utils.result_export import (
+    PARQUET_AVAILABLE, export_results_csv, export_results_excel, export_results_parquet, write_parquet
+)
+from bot.utils.workbook_processor import (
+    COMBINED_SHEET_NAME, analyze_workbook, clean_for_analysis, clean_workbook,
+    get_workbook_cleaning_report, sheet_file_suffix, sheets_share_layout, split_participant_column,
+    write_cleaned_workbook
+)
 from bot.utils.test_manager import TestManager
 from bot.utils.payment_manager import PaymentManager
 from bot.utils.bonus_manager import BonusManager # Import BonusManager
@@ -25,6 +43,10 @@ student_data_manager = StudentDataManager()
 test_manager = TestManager()
 payment_manager = PaymentManager()
 bonus_manager = BonusManager() # Initialize BonusManager
+cleaning_profile_manager = CleaningProfileManager()
+
+# Og'ir (katta fayl) tahlillari navbati - boshqa foydalanuvchilar kutib qolmasligi uchun
+heavy_job_queue = HeavyJobQueue()
 
 # Conversation states
 WAITING_FOR_FULL_NAME = 1
@@ -55,6 +77,10 @@ WAITING_FOR_PHOTO = 25
 WAITING_FOR_PAID_TEST_CHOICE = 26
 WAITING_FOR_TEST_PRICE = 27
 
+# Natijalar formati sozlamasi (user_data['report_format'])
+REPORT_FORMAT_LABELS = {'pdf': "📄 PDF", 'excel': "📗 Excel", 'both': "📄📗 Ikkalasi"}
+REPORT_FORMAT_CALLBACKS = {f"report_format_{value}": value for value in REPORT_FORMAT_LABELS}
+
 
 def get_main_keyboard():
     """Create main reply keyboard with 3 buttons"""
@@ -179,21 +205,21 @@ async def perform_test_rasch_analysis(message, context, test_id: str):
         analyzer = RaschAnalyzer()
         results = analyzer.fit(data, person_names=person_names if person_names else None)
 
-        # Generate PDF reports
-        pdf_generator = PDFReportGenerator()
-        user_id = message.chat.id
-
-        # General statistics report
-        general_pdf_path = pdf_generator.generate_report(
-            results,
-            filename=f"test_{test_id}_umumiy_{user_id}"
-        )
+        # Distraktorlar tahlili (tanlangan variantlar bo'yicha)
+        answer_data = test_manager.get_test_answer_matrix(test_id)
+        if answer_data:
+            try:
+                results['distractor_analysis'] = analyze_distractors(
+                    answer_data['answers'],
+                    answer_data['answer_key'],
+                    item_names=answer_data['item_names'],
+                    abilities=results['person_ability'],
+                    n_options=answer_data['n_options']
+                )
+            except ValueError as e:
+                logger.warning(f"Distraktorlar tahlilini bajarib bo'lmadi: {e}")
 
-        # Person results report
-        person_pdf_path = pdf_generator.generate_person_results_report(
-            results,
-            filename=f"test_{test_id}_talabgorlar_{user_id}"
-        )
+        user_id = message.chat.id
 
         await message.reply_text(
             f"✅ *Rasch tahlili tugallandi!*\n\n"
@@ -206,22 +232,13 @@ async def perform_test_rasch_analysis(message, context, test_id: str):
             parse_mode='Markdown'
         )
 
-        # Send general statistics PDF
-        if general_pdf_path and os.path.exists(general_pdf_path):
-            with open(general_pdf_path, 'rb') as pdf_file:
-                await message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(general_pdf_path),
-                    caption="📊 Umumiy statistika"
-                )
-
-        # Send person results PDF
-        with open(person_pdf_path, 'rb') as pdf_file:
-            await message.reply_document(
-                document=pdf_file,
-                filename=os.path.basename(person_pdf_path),
-                caption="👥 Talabgorlar natijalari"
-            )
+        # Umumiy va talabgorlar hisobotlari parallel quriladi, tayyor bo'lishi bilan yuboriladi
+        with PDFReportGenerator() as pdf_generator:
+            await send_reports(pdf_generator, [
+                ReportTask('general', results, "📊 Umumiy statistika", filename=f"test_{test_id}_umumiy_{user_id}"),
+                ReportTask('person', results, "👥 Talabgorlar natijalari",
+                           filename=f"test_{test_id}_talabgorlar_{user_id}"),
+            ], message.reply_document)
 
         await message.reply_text(
             "✅ Barcha hisobotlar yuborildi!\n\n"
@@ -246,7 +263,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     help_message = (
         "📖 *Yordam*\n\n"
         "*Fayl talablari:*\n"
-        "• Format: CSV (.csv) yoki Excel (.xlsx, .xls)\n"
+        "• Format: CSV (.csv), Excel (.xlsx, .xls) yoki Parquet (.parquet)\n"
         "• Qatorlar: Har bir qator - bitta ishtirokchi\n"
         "• Ustunlar: Har bir ustun - bitta savol/item\n"
         "• Qiymatlar: Faqat 0 va 1 (dikotomik ma'lumotlar)\n\n"
@@ -311,26 +328,11 @@ async def sample_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         analyzer = RaschAnalyzer()
         results = analyzer.fit(data.astype(int))
 
-        pdf_generator = PDFReportGenerator()
-
-        # Generate general statistics report
-        general_pdf_path = pdf_generator.generate_report(
-            results,
-            filename="statistika"
-        )
-
         # Get section questions if configured
         user_data = user_data_manager.get_user_data(user_id)
         section_questions = user_data.get('section_questions')
         section_results_enabled = user_data.get('section_results_enabled', False)
 
-        # Generate person results report
-        person_pdf_path = pdf_generator.generate_person_results_report(
-            results,
-            filename="talabgorlar-statistikasi",
-            section_questions=section_questions if section_results_enabled else None
-        )
-
         await update.message.reply_text(
             f"✅ *Namunaviy tahlil tugallandi!*\n\n"
             f"📊 Talabgorlar: {results['n_persons']}\n"
@@ -340,37 +342,18 @@ async def sample_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode='Markdown'
         )
 
-        # Send general statistics PDF
-        if general_pdf_path and os.path.exists(general_pdf_path):
-            with open(general_pdf_path, 'rb') as pdf_file:
-                await update.message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(general_pdf_path),
-                    caption="📊 Namunaviy tahlil - Umumiy statistika"
-                )
-
-        # Send person results PDF
-        with open(person_pdf_path, 'rb') as pdf_file:
-            await update.message.reply_document(
-                document=pdf_file,
-                filename=os.path.basename(person_pdf_path),
-                caption="👥 Namunaviy tahlil - Talabgorlar natijalari"
-            )
-
-        # Generate and send section results if enabled and configured
+        # Hisobotlar parallel quriladi, har biri tayyor bo'lishi bilan yuboriladi
+        report_tasks = [
+            ReportTask('general', results, "📊 Namunaviy tahlil - Umumiy statistika", filename="statistika"),
+            ReportTask('person', results, "👥 Namunaviy tahlil - Talabgorlar natijalari",
+                       filename="talabgorlar-statistikasi",
+                       section_questions=section_questions if section_results_enabled else None),
+        ]
         if section_results_enabled and section_questions:
-            section_pdf_path = pdf_generator.generate_section_results_report(
-                results,
-                filename="bulimlar-statistikasi",
-                section_questions=section_questions
-            )
-
-            with open(section_pdf_path, 'rb') as pdf_file:
-                await update.message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(section_pdf_path),
-                    caption="📋 Namunaviy tahlil - Bo'limlar bo'yicha natijalar"
-                )
+            report_tasks.append(ReportTask('section', results, "📋 Namunaviy tahlil - Bo'limlar bo'yicha natijalar",
+                                           filename="bulimlar-statistikasi", section_questions=section_questions))
+        with PDFReportGenerator() as pdf_generator:
+            await send_reports(pdf_generator, report_tasks, update.message.reply_document)
 
         logger.info(f"Sample analysis completed for user {user_id}")
 
@@ -430,10 +413,10 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Support both .xlsx and .xls Excel formats
-    if file_extension not in ['.csv', '.xlsx', '.xls']:
+    if file_extension not in ['.csv', '.xlsx', '.xls', '.parquet']:
         await update.message.reply_text(
             "❌ Noto'g'ri fayl formati!\n\n"
-            "Iltimos, CSV (.csv) yoki Excel (.xlsx, .xls) formatdagi fayl yuboring."
+            "Iltimos, CSV (.csv), Excel (.xlsx, .xls) yoki Parquet (.parquet) formatdagi fayl yuboring."
         )
         return
 
@@ -450,6 +433,7 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # FILE ANALYZER MODE: Full clean the file
         await update.message.reply_text("🧹 File Analyzer: Fayl to'liq tozalanmoqda va standartlashtirilmoqda...")
 
+        upload = None
         try:
             file = await context.bot.get_file(document.file_id)
             upload_dir = "data/uploads"
@@ -457,66 +441,16 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
             file_path = os.path.join(upload_dir, f"{user_id}_{document.file_name}")
             await file.download_to_drive(file_path)
 
-            # Read file
-            if file_extension == '.csv':
-                try:
-                    data = pd.read_csv(file_path)
-                except Exception:
-                    data = pd.read_csv(file_path, encoding='latin-1')
-            elif file_extension == '.xls':
-                # Try xlrd engine first for old Excel format
-                try:
-                    data = pd.read_excel(file_path, engine='xlrd')
-                except Exception as xlrd_error:
-                    # If xlrd fails, try openpyxl as fallback
-                    logger.warning(f"xlrd failed for .xls file, trying openpyxl: {str(xlrd_error)}")
-                    try:
-                        data = pd.read_excel(file_path, engine='openpyxl')
-                    except Exception as openpyxl_error:
-                        raise Exception(
-                            f"Faylni o'qib bo'lmadi. xlrd xatoligi: {str(xlrd_error)}. "
-                            f"openpyxl xatoligi: {str(openpyxl_error)}"
-                        )
-            else:
-                # Use openpyxl engine for new Excel format (.xlsx)
-                data = pd.read_excel(file_path, engine='openpyxl')
-
-            cleaner = DataCleaner()
-
-            # Perform full cleaning
-            processed_data, metadata = cleaner.clean_data(data)
-            report = cleaner.get_cleaning_report(metadata)
-            output_prefix = "cleaned"
-            operation = "cleaning"
-            success_message = "✅ Tozalangan va standartlashtirilgan fayl tayyor!\n\n" \
-                            "Fayl to'liq tozalandi va standartlashtirildi.\n" \
-                            "Endi uni tahlil qilish uchun qayta yuboring yoki /start orqali chiqing."
-
-            # Send report
-            await update.message.reply_text(report)
-
-            # Save processed file
-            processed_file_path = os.path.join(upload_dir, f"{output_prefix}_{user_id}_{document.file_name}")
-            if file_extension == '.csv':
-                processed_data.to_csv(processed_file_path, index=False)
-            else:
-                # Excel fayllarini openpyxl bilan saqlash
-                processed_data.to_excel(processed_file_path, index=False, engine='openpyxl')
-
-            # Send processed file back to user
-            with open(processed_file_path, 'rb') as processed_file:
-                await update.message.reply_document(
-                    document=processed_file,
-                    filename=f"{output_prefix}_{document.file_name}",
-                    caption=success_message
-                )
-
-            # Cleanup
-            os.remove(file_path)
-            os.remove(processed_file_path)
+            # Read file (format va kodirovka bir marta aniqlanadi)
+            upload = get_upload(file_path, document.file_id)
+            preflight = await _preflight_upload(update.message, upload)
+            if preflight is None:
+                return
 
-            logger.info(f"File {operation} completed successfully for user {user_id}")
-            return
+            # Katta fayllar tahlil bilan bir xil navbatda kutadi (fayl ish oxirida o'chiriladi)
+            job = partial(_clean_upload_job, update, upload, user_id, document.file_name, file_extension, upload_dir)
+            upload = None
+            await _run_heavy_job(context, preflight, job)
 
         except Exception as e:
             logger.error(f"Error processing file for user {user_id}: {str(e)}")
@@ -524,7 +458,11 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 f"❌ Faylni qayta ishlashda xatolik: {str(e)}\n\n"
                 "Iltimos, faylingizni tekshiring va qayta urinib ko'ring."
             )
-            return
+            if upload is not None:
+                upload.discard()
+                if os.path.exists(upload.file_path):
+                    os.remove(upload.file_path)
+        return
 
     # NORMAL MODE: Check payment and analyze the file
     await update.message.reply_text("⏳ Fayl qabul qilindi...")
@@ -538,11 +476,26 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         file_path = os.path.join(upload_dir, f"{user_id}_{document.file_name}")
         await file.download_to_drive(file_path)
 
+        # To'lov va to'liq o'qishdan oldin fayl o'lchamini baholash
+        preflight = await _preflight_upload(update.message, get_upload(file_path, document.file_id))
+        if preflight is None:
+            return
+        context.user_data['pending_preflight'] = preflight
+
         # Save file info for later use
         context.user_data['pending_analysis_file'] = file_path
         context.user_data['pending_analysis_filename'] = document.file_name
+        context.user_data['pending_analysis_file_id'] = document.file_id
         context.user_data['pending_file_extension'] = file_extension
 
+        # Izohda kalit ("1a2b3c...") bo'lsa, fayl xom javoblar sifatida baholanadi
+        answer_key = parse_answer_key(update.message.caption or '')
+        if answer_key:
+            context.user_data['pending_answer_key'] = answer_key
+            await update.message.reply_text(f"🔑 Javoblar kaliti qabul qilindi: {len(answer_key)} ta savol")
+        else:
+            context.user_data.pop('pending_answer_key', None)
+
         # Check if payment is required
         if payment_manager.is_payment_enabled():
             # Send payment invoice
@@ -569,59 +522,324 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
 
 
+async def _clean_upload_job(update: Update, upload, user_id: int, file_name: str, file_extension: str,
+                           upload_dir: str):
+    """File Analyzer ishi: tozalash, javob yuborish va yuklangan faylni o'chirish"""
+    try:
+        await _clean_file_and_reply(update, upload, user_id, file_name, file_extension, upload_dir)
+    except Exception as e:
+        logger.error(f"Error processing file for user {user_id}: {str(e)}")
+        await update.message.reply_text(
+            f"❌ Faylni qayta ishlashda xatolik: {str(e)}\n\n"
+            "Iltimos, faylingizni tekshiring va qayta urinib ko'ring."
+        )
+    finally:
+        upload.discard()
+        if os.path.exists(upload.file_path):
+            os.remove(upload.file_path)
+
+
+async def _clean_file_and_reply(update: Update, upload, user_id: int, file_name: str, file_extension: str,
+                                upload_dir: str):
+    """File Analyzer: faylni to'liq tozalab, standart ko'rinishda qaytarish (og'ir qismlar fon oqimida)"""
+    loop = asyncio.get_running_loop()
+    sheets = await loop.run_in_executor(None, upload.non_empty_sheets)
+
+    if len(sheets) > 1:
+        # Ko'p varaqli kitob: har bir varaq parallel tozalanadi
+        await _clean_workbook_and_reply(update, sheets, user_id, file_name, upload_dir)
+        return
+
+    data = upload.load()
+
+    cleaner = DataCleaner(profile_manager=cleaning_profile_manager)
+
+    # Perform full cleaning (izohda kalit bo'lsa - xom javoblar baholanadi)
+    answer_key = parse_answer_key(update.message.caption or '')
+    if answer_key:
+        processed_data, metadata = await loop.run_in_executor(None, cleaner.clean_raw_answers, data, answer_key)
+    else:
+        processed_data, metadata = await loop.run_in_executor(
+            None, partial(cleaner.clean_data, data, teacher_id=user_id)
+        )
+    report = cleaner.get_cleaning_report(metadata)
+    output_prefix = "cleaned"
+    success_message = "✅ Tozalangan va standartlashtirilgan fayl tayyor!\n\n" \
+                      "Fayl to'liq tozalandi va standartlashtirildi.\n" \
+                      "Endi uni tahlil qilish uchun qayta yuboring yoki /start orqali chiqing."
+
+    # Send report
+    await update.message.reply_text(report)
+
+    # Save processed file
+    processed_file_path = os.path.join(upload_dir, f"{output_prefix}_{user_id}_{file_name}")
+    if file_extension == '.csv':
+        save = partial(processed_data.to_csv, processed_file_path, index=False)
+    elif file_extension == '.parquet':
+        # Parquet: ustun turlari saqlanadi va siqiladi
+        save = partial(write_parquet, processed_data, processed_file_path)
+    else:
+        # Excel fayllarini openpyxl bilan saqlash
+        save = partial(processed_data.to_excel, processed_file_path, index=False, engine='openpyxl')
+    await loop.run_in_executor(None, save)
+
+    # Send processed file back to user
+    try:
+        with open(processed_file_path, 'rb') as processed_file:
+            await update.message.reply_document(
+                document=processed_file,
+                filename=f"{output_prefix}_{file_name}",
+                caption=success_message
+            )
+    finally:
+        os.remove(processed_file_path)
+
+    logger.info(f"File cleaning completed successfully for user {user_id}")
+
+
+async def _clean_workbook_and_reply(update: Update, sheets: dict, user_id: int, file_name: str, upload_dir: str):
+    """File Analyzer: ko'p varaqli kitobning barcha varaqlarini parallel tozalab yuborish"""
+    await update.message.reply_text(f"📑 {len(sheets)} ta varaq topildi. Har biri alohida tozalanmoqda...")
+
+    loop = asyncio.get_running_loop()
+    cleaned, errors = await loop.run_in_executor(None, clean_workbook, sheets)
+
+    await update.message.reply_text(get_workbook_cleaning_report(cleaned, errors), parse_mode='Markdown')
+
+    if not cleaned:
+        await update.message.reply_text("❌ Hech bir varaqni tozalab bo'lmadi. Iltimos, faylingizni tekshiring.")
+        return
+
+    # Ko'p varaqli natija har doim .xlsx formatda saqlanadi
+    output_name = f"cleaned_{os.path.splitext(file_name)[0]}.xlsx"
+    processed_file_path = os.path.join(upload_dir, f"cleaned_{user_id}_{os.path.splitext(file_name)[0]}.xlsx")
+    await loop.run_in_executor(None, write_cleaned_workbook, cleaned, processed_file_path)
+
+    try:
+        with open(processed_file_path, 'rb') as processed_file:
+            await update.message.reply_document(
+                document=processed_file,
+                filename=output_name,
+                caption="✅ Barcha varaqlar tozalandi va standartlashtirildi!\n\n"
+                        "Har bir sinf alohida varaqda saqlandi.\n"
+                        "Endi uni tahlil qilish uchun qayta yuboring yoki /start orqali chiqing."
+            )
+    finally:
+        os.remove(processed_file_path)
+
+    logger.info(f"Workbook cleaning completed for user {user_id}: {len(cleaned)} sheets, {len(errors)} errors")
+
+
+async def perform_workbook_analysis(message, context: ContextTypes.DEFAULT_TYPE, sheets: dict,
+                                    answer_key: list = None, pending: dict = None):
+    """
+    Ko'p varaqli kitob: varaqlarni parallel tahlil qilish, umumiy va har bir varaq bo'yicha hisobot yuborish
+
+    Bitta varaqli fayl kabi javoblar kaliti, Auto File Cleaner, natijalar formati va
+    bo'limlar sozlamalari hisobga olinadi.
+    """
+    user_id = message.chat.id
+    user_data = user_data_manager.get_user_data(user_id)
+    report_format = user_data.get('report_format', 'pdf')
+    send_pdf = report_format != 'excel'
+    section_questions = user_data.get('section_questions') if user_data.get('section_results_enabled', False) else None
+
+    status_message = await message.reply_text(
+        f"📑 {len(sheets)} ta varaq topildi.\n\n⏳ Varaqlar parallel tahlil qilinmoqda...",
+    )
+
+    loop = asyncio.get_running_loop()
+    sheet_results, combined, errors = await loop.run_in_executor(
+        None, partial(analyze_workbook, sheets, answer_key=answer_key,
+                      auto_clean=user_data.get('auto_file_cleaner', False))
+    )
+
+    if not sheet_results:
+        await status_message.edit_text(
+            "❌ Hech bir varaqni tahlil qilib bo'lmadi!\n\n"
+            + "\n".join(f"• {name}: {error}" for name, error in errors.items())
+            + "\n\n💡 'Boshqa' → 'File Analyzer' orqali faylni tozalang."
+        )
+        return
+
+    await status_message.edit_text("📊 Hisobotlar tayyorlanmoqda...")
+
+    # Qisqacha umumiy natija
+    summary_lines = ["📑 *Ko'p varaqli tahlil natijalari*", "━━━━━━━━━━━━━━━━━━━━\n"]
+    for name, results in sheet_results.items():
+        summary_lines.append(f"✅ *{name}*: {results['n_persons']} talabgor, {results['n_items']} savol, "
+                             f"ishonchlilik {results['reliability']:.3f}")
+    for name, error in errors.items():
+        summary_lines.append(f"❌ *{name}*: {error}")
+    if combined is not None:
+        summary_lines.append(f"\n👥 *{COMBINED_SHEET_NAME}*: {combined['n_persons']} talabgor, "
+                             f"ishonchlilik {combined['reliability']:.3f}")
+    if send_pdf:
+        summary_lines.append("\n📄 Hisobotlar PDF faylda yuborilmoqda...")
+    else:
+        summary_lines.append("\n📗 Natijalar Excel faylda yuborilmoqda...")
+    await message.reply_text("\n".join(summary_lines), parse_mode='Markdown')
+
+    reports = []
+    if combined is not None:
+        reports.append((COMBINED_SHEET_NAME, combined))
+    reports.extend(sheet_results.items())
+
+    # Barcha varaqlar hisobotlari parallel quriladi, tayyor bo'lish tartibida yuboriladi
+    report_tasks = []
+    if send_pdf:
+        for name, results in reports:
+            suffix = sheet_file_suffix(name)
+            report_tasks.append(ReportTask('general', results, f"📊 {name}: Umumiy statistika va item parametrlari",
+                                           filename=f"statistika_{suffix}"))
+            report_tasks.append(ReportTask('person', results, f"👥 {name}: Talabgorlar natijalari",
+                                           filename=f"talabgorlar-statistikasi_{suffix}",
+                                           section_questions=section_questions))
+            if section_questions:
+                report_tasks.append(ReportTask('section', results, f"📋 {name}: Bo'limlar bo'yicha natijalar",
+                                               filename=f"bulimlar-statistikasi_{suffix}",
+                                               section_questions=section_questions))
+    with PDFReportGenerator() as pdf_generator:
+        await send_reports(pdf_generator, report_tasks, message.reply_document)
+
+        # Excel/CSV natijalar (sozlamalarda tanlangan bo'lsa) - har bir varaq alohida fayl
+        if report_format in ('excel', 'both'):
+            for name, results in reports:
+                await send_spreadsheet_results(
+                    message, results, pdf_generator,
+                    section_questions=section_questions,
+                    prefix=f"natijalar_{sheet_file_suffix(name)}"
+                )
+
+    await status_message.delete()
+    await message.reply_text(
+        "✅ Barcha hisobotlar yuborildi!",
+        reply_markup=get_main_keyboard()
+    )
+
+    # Yuklangan fayl va kesh _run_analysis_after_payment ichida o'chiriladi
+    _clear_pending_analysis(context, pending)
+
+    logger.info(f"Successfully processed workbook ({len(sheet_results)} sheets) for user {user_id}")
+
+
+async def _preflight_upload(message, upload):
+    """
+    Katta fayllarni to'liq o'qishdan oldin tekshirish
+
+    Returns:
+        Preflight bahosi yoki None (fayl rad etilgan - fayl o'chiriladi)
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        estimate = await loop.run_in_executor(None, preflight_upload, upload)
+    except Exception as e:
+        # Baholab bo'lmasa - odatdagi yo'l bilan davom etiladi (xatolik o'qish bosqichida chiqadi)
+        logger.warning(f"Preflight bajarilmadi {upload.file_path}: {e}")
+        return {'decision': ACCEPT, 'estimated_seconds': 0.0}
+
+    wait_seconds = heavy_job_queue.expected_wait() if estimate['decision'] == QUEUE else 0.0
+    notice = format_preflight_message(estimate, wait_seconds)
+    if notice:
+        await message.reply_text(notice)
+
+    if estimate['decision'] == REJECT:
+        upload.discard()
+        if os.path.exists(upload.file_path):
+            os.remove(upload.file_path)
+        return None
+
+    return estimate
+
+
+# Tahlil kutayotgan fayl holati (context.user_data kalitlari)
+PENDING_ANALYSIS_KEYS = (
+    'pending_analysis_file', 'pending_analysis_filename', 'pending_analysis_file_id',
+    'pending_file_extension', 'pending_answer_key', 'pending_preflight', 'pending_payment_file',
+)
+
+
+def _clear_pending_analysis(context: ContextTypes.DEFAULT_TYPE, pending: dict = None):
+    """
+    Tahlil qilingan fayl holatini tozalash
+
+    Navbatda kutgan ish tugaguncha o'qituvchi yangi fayl yuborgan bo'lsa, yangi fayl holati saqlanadi.
+    """
+    for key in PENDING_ANALYSIS_KEYS:
+        if pending is None or context.user_data.get(key) is pending.get(key):
+            context.user_data.pop(key, None)
+
+
+async def _run_heavy_job(context: ContextTypes.DEFAULT_TYPE, preflight, job):
+    """
+    Og'ir ishni bajarish: katta fayl (QUEUE) og'ir ishlar navbatida fon vazifasi sifatida kutadi
+
+    Yangilanishlar ketma-ket ishlanadi - navbatdagi ish handler ichida kutsa, boshqa
+    o'qituvchilarning yangilanishlari ham to'xtab qolardi va navbatda hech qachon ikkinchi ish bo'lmasdi.
+    """
+    if preflight and preflight['decision'] == QUEUE:
+        heavy_job_queue.submit(preflight['estimated_seconds'], job, context.application.create_task)
+    else:
+        await job()
+
+
 async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_TYPE):
     """Perform Rasch analysis after successful payment"""
+    # Fayl holati hozir olinadi - navbatda kutish paytida yangi fayl yuborilsa ham aralashmaydi
+    pending = {key: context.user_data.get(key) for key in PENDING_ANALYSIS_KEYS}
+    context.user_data.pop('pending_preflight', None)
+    await _run_heavy_job(context, pending['pending_preflight'],
+                         partial(_run_analysis_after_payment, message, context, pending))
+
+
+async def _run_analysis_after_payment(message, context: ContextTypes.DEFAULT_TYPE, pending: dict):
+    """Tahlilni bajarish (perform_analysis_after_payment ichidan chaqiriladi)"""
     user_id = message.chat.id
 
-    file_path = context.user_data.get('pending_analysis_file')
-    file_extension = context.user_data.get('pending_file_extension')
+    file_path = pending.get('pending_analysis_file')
+    file_id = pending.get('pending_analysis_file_id')
 
     if not file_path or not os.path.exists(file_path):
         await message.reply_text("❌ Fayl topilmadi. Iltimos, qayta fayl yuboring.")
         return
 
+    # Fayl bir marta o'qiladi - tozalash va tahlil bosqichlari shu DataFrame'dan foydalanadi
+    # Tahlil uchun keraksiz ustunlar (Evalbee metadata) o'qilmaydi
+    upload = get_upload(file_path, file_id, prune_columns=True)
+    auto_cleaned = False
+    # O'qish, tozalash va fit fon oqimida - bot boshqa o'qituvchilar uchun javob berishda davom etadi
+    loop = asyncio.get_running_loop()
+
     try:
-        if file_extension == '.csv':
-            try:
-                data = pd.read_csv(file_path)
-            except Exception:
-                data = pd.read_csv(file_path, encoding='latin-1')
-        else:
-            data = pd.read_excel(file_path)
-
-        # Birinchi ustun "Talabgor" bo'lsa, uni olib tashlash kerak
-        # File Analyzer tozalangan faylda birinchi ustun har doim ism ustuni
-        participant_column = None
-        if len(data.columns) > 0:
-            first_col = data.columns[0]
-            first_col_lower = str(first_col).lower()
-            # Agar birinchi ustun ism ustuni bo'lsa (raqam emas)
-            if any(keyword in first_col_lower for keyword in ['talabgor', 'name', 'ism', 'student', 'participant', 'foydalanuvchi']):
-                participant_column = first_col
-                logger.info(f"✅ Talabgor ustuni aniqlandi va olib tashlanadi: {first_col}")
-
-        # Talabgor ism-familiyalarini saqlab qolish
-        person_names = None
-        if participant_column:
-            person_names = data[participant_column].tolist()
-            logger.info(f"✅ {len(person_names)} ta talabgor ismlari saqlandi")
-            response_data = data.drop(columns=[participant_column])
-        else:
-            response_data = data
+        sheets = await loop.run_in_executor(None, upload.non_empty_sheets)
+        # Xom javoblar fayli kalit bilan yuborilgan bo'lsa - variantlar darhol baholanadi
+        answer_key = pending.get('pending_answer_key')
+        if sheets_share_layout(sheets):
+            # Ko'p varaqli kitob (har bir sinf - alohida varaq): alohida va birgalikda tahlil qilinadi
+            await perform_workbook_analysis(message, context, sheets, answer_key=answer_key, pending=pending)
+            return
 
-        # Convert all columns to numeric, handling errors
-        numeric_data = response_data.copy()
-        for col in numeric_data.columns:
-            numeric_data[col] = pd.to_numeric(numeric_data[col], errors='coerce')
+        # Varaqlar bitta test emas (izoh, kalit va h.k.) - birinchi ma'lumotli varaq tahlil qilinadi
+        data = next(iter(sheets.values())) if sheets else upload.load()
 
-        # Remove any rows or columns that are all NaN after conversion
-        numeric_data = numeric_data.dropna(how='all', axis=0)
-        numeric_data = numeric_data.dropna(how='all', axis=1)
+        if answer_key:
+            numeric_data, person_names = await loop.run_in_executor(
+                None, partial(clean_for_analysis, data, answer_key=answer_key)
+            )
+            auto_cleaned = True
+        else:
+            numeric_data, person_names = await loop.run_in_executor(None, split_participant_column, data)
 
         # Check if we have valid data
+        if answer_key and (numeric_data.empty or numeric_data.shape[0] < 2 or numeric_data.shape[1] < 2):
+            await message.reply_text(
+                "❌ Kalit bo'yicha baholangandan keyin ma'lumotlar yetarli emas!\n\n"
+                "Iltimos, fayl va kalitdagi savollar sonini tekshiring."
+            )
+            return
+
         if numeric_data.empty or numeric_data.shape[0] < 2 or numeric_data.shape[1] < 2:
             # Check if auto file cleaner is enabled
-            user_id = message.chat.id
             user_data = user_data_manager.get_user_data(user_id)
             auto_cleaner_enabled = user_data.get('auto_file_cleaner', False)
 
@@ -632,54 +850,10 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
                 )
 
                 try:
-                    # Read original file again
-                    if file_extension == '.csv':
-                        try:
-                            original_data = pd.read_csv(file_path)
-                        except Exception:
-                            original_data = pd.read_csv(file_path, encoding='latin-1')
-                    else:
-                        original_data = pd.read_excel(file_path)
-
-                    # Clean the file using DataCleaner
-                    cleaner = DataCleaner()
-                    cleaned_data, metadata = cleaner.clean_data(original_data)
-
-                    # Save cleaned file temporarily
-                    upload_dir = "data/uploads"
-                    os.makedirs(upload_dir, exist_ok=True)
-                    cleaned_file_path = os.path.join(upload_dir, f"auto_cleaned_{user_id}_{context.user_data.get('pending_analysis_filename', 'file')}")
-
-                    if file_extension == '.csv':
-                        cleaned_data.to_csv(cleaned_file_path, index=False)
-                    else:
-                        cleaned_data.to_excel(cleaned_file_path, index=False, engine='openpyxl')
-
-                    # Now use cleaned data for analysis
-                    # Remove participant column from cleaned data and save names
-                    person_names = None
-                    if len(cleaned_data.columns) > 0:
-                        first_col = cleaned_data.columns[0]
-                        first_col_lower = str(first_col).lower()
-                        if any(keyword in first_col_lower for keyword in ['talabgor', 'name', 'ism', 'student', 'participant']):
-                            person_names = cleaned_data[first_col].tolist()
-                            logger.info(f"✅ {len(person_names)} ta talabgor ismlari saqlandi")
-                            cleaned_data = cleaned_data.drop(columns=[first_col])
-                            logger.info(f"✅ Tozalangan fayldan talabgor ustuni olib tashlandi: {first_col}")
-
-                    # Convert to numeric
-                    for col in cleaned_data.columns:
-                        cleaned_data[col] = pd.to_numeric(cleaned_data[col], errors='coerce')
-
-                    cleaned_data = cleaned_data.dropna(how='all', axis=0)
-                    cleaned_data = cleaned_data.dropna(how='all', axis=1)
-
-                    # Update file_path to cleaned version
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    file_path = cleaned_file_path
-                    data = cleaned_data
-                    numeric_data = cleaned_data
+                    numeric_data, person_names = await loop.run_in_executor(
+                        None, clean_for_analysis, data, cleaning_profile_manager, user_id
+                    )
+                    auto_cleaned = True
 
                     # Check again
                     if numeric_data.empty or numeric_data.shape[0] < 2 or numeric_data.shape[1] < 2:
@@ -687,8 +861,6 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
                             "❌ Tozalashdan keyin ham ma'lumotlar yetarli emas!\n\n"
                             "Iltimos, faylingizni tekshiring va qayta yuboring."
                         )
-                        if os.path.exists(cleaned_file_path):
-                            os.remove(cleaned_file_path)
                         return
 
                     # Continue with analysis (don't return, let it flow to analyzer below)
@@ -703,26 +875,16 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
                     return
             else:
                 # AUTO CLEANER DISABLED: Show error with manual clean option
-                keyboard = [
-                    [InlineKeyboardButton("🧹 Faylni avtomatik tozalash", callback_data='auto_clean_file')],
-                    [InlineKeyboardButton("❌ Bekor qilish", callback_data='cancel_clean')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-
+                # (yuklangan fayl o'chiriladi - tozalangandan keyin qayta yuboriladi)
                 await message.reply_text(
                     "❌ Ma'lumotlar formatida xatolik!\n\n"
                     "Faylingiz talabga javob bermayapti. Sabablari:\n"
                     "• Talabgor ismlari ustuni mavjud (faqat 0/1 ma'lumotlar kerak)\n"
                     "• Qo'shimcha metadata ustunlar bor\n"
                     "• Bo'sh yoki noto'g'ri formatdagi ustunlar\n\n"
-                    "✅ Yechim: File Analyzer orqali avtomatik tozalash\n\n"
-                    "💡 Maslahat: Auto File Cleaner'ni yoqing (⚙️ Sozlamalar → 🧽 Auto File Cleaner)",
-                    reply_markup=reply_markup
+                    "✅ Yechim: ⚙️ Sozlamalar → 🧹 File Analyzer orqali tozalab, faylni qayta yuboring\n\n"
+                    "💡 Maslahat: Auto File Cleaner'ni yoqing (⚙️ Sozlamalar → 🧽 Auto File Cleaner)"
                 )
-
-                # Save file path for auto-clean
-                context.user_data['pending_clean_file'] = file_path
-                context.user_data['pending_clean_filename'] = context.user_data.get('pending_analysis_filename', 'file')
                 return
 
         # Initialize status message for progress updates
@@ -730,58 +892,30 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
 
         try:
             analyzer = RaschAnalyzer()
-            results = analyzer.fit(numeric_data, person_names=person_names)
+            results = await loop.run_in_executor(None, partial(analyzer.fit, numeric_data, person_names=person_names))
         except Exception as analysis_error:
             # If analyzer.fit() fails, check if auto cleaner is enabled
-            user_id = message.chat.id
             user_data = user_data_manager.get_user_data(user_id)
             auto_cleaner_enabled = user_data.get('auto_file_cleaner', False)
 
-            if auto_cleaner_enabled:
+            # Tozalangan ma'lumot ham muvaffaqiyatsiz bo'lsa, qayta tozalashdan foyda yo'q
+            if auto_cleaner_enabled and not auto_cleaned:
                 # AUTO CLEAN MODE: Automatically clean the file and retry analysis
                 await status_message.edit_text("🧽 Auto File Cleaner: Fayl tozalanmoqda...", parse_mode='Markdown')
 
                 try:
-                    # Read original file again
-                    if file_extension == '.csv':
-                        try:
-                            original_data = pd.read_csv(file_path)
-                        except Exception:
-                            original_data = pd.read_csv(file_path, encoding='latin-1')
-                    else:
-                        original_data = pd.read_excel(file_path)
-
-                    # Clean the file using DataCleaner
-                    cleaner = DataCleaner()
-                    cleaned_data, metadata = cleaner.clean_data(original_data)
-
-                    # Now use cleaned data for analysis
-                    # Remove participant column from cleaned data and save names
-                    person_names = None
-                    if len(cleaned_data.columns) > 0:
-                        first_col = cleaned_data.columns[0]
-                        first_col_lower = str(first_col).lower()
-                        if any(keyword in first_col_lower for keyword in ['talabgor', 'name', 'ism', 'student', 'participant']):
-                            person_names = cleaned_data[first_col].tolist()
-                            logger.info(f"✅ {len(person_names)} ta talabgor ismlari saqlandi")
-                            cleaned_data = cleaned_data.drop(columns=[first_col])
-                            logger.info(f"✅ Tozalangan fayldan talabgor ustuni olib tashlandi: {first_col}")
-
-                    # Convert to numeric
-                    for col in cleaned_data.columns:
-                        cleaned_data[col] = pd.to_numeric(cleaned_data[col], errors='coerce')
-
-                    cleaned_data = cleaned_data.dropna(how='all', axis=0)
-                    cleaned_data = cleaned_data.dropna(how='all', axis=1)
-
-                    # Update numeric_data to cleaned version
-                    numeric_data = cleaned_data
+                    # Keshdagi asl DataFrame qayta o'qilmasdan tozalanadi
+                    numeric_data, person_names = await loop.run_in_executor(
+                        None, clean_for_analysis, data, cleaning_profile_manager, user_id
+                    )
 
                     # Retry analysis with cleaned data
                     await status_message.edit_text("⏳ Tahlil qilinmoqda...\n\n▰▰▰▱▱▱▱▱▱▱ 40%\n_Tozalangan fayl tahlil qilinmoqda..._", parse_mode='Markdown')
 
                     analyzer = RaschAnalyzer()
-                    results = analyzer.fit(numeric_data, person_names=person_names)
+                    results = await loop.run_in_executor(
+                        None, partial(analyzer.fit, numeric_data, person_names=person_names)
+                    )
 
                 except Exception as clean_error:
                     logger.error(f"Auto clean error after analyzer failure: {clean_error}")
@@ -801,16 +935,12 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
 
         summary_text = analyzer.get_summary(results)
 
-        pdf_generator = PDFReportGenerator()
-
-        # Generate general statistics report
-        general_pdf_path = pdf_generator.generate_report(
-            results,
-            filename="statistika"
-        )
+        # Natijalar formati: PDF, Excel yoki ikkalasi
+        user_data = user_data_manager.get_user_data(user_id)
+        report_format = user_data.get('report_format', 'pdf')
+        send_pdf = report_format != 'excel'
 
         # Get section questions if configured
-        user_data = user_data_manager.get_user_data(user_id)
         section_questions = user_data.get('section_questions')
         selected_subject = user_data.get('subject', '')
 
@@ -819,8 +949,8 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
 
         if section_results_enabled and not section_questions and selected_subject and has_sections(selected_subject):
             # Store results temporarily
+            # Barcha hisobotlar bo'limlar kiritilgach bir vaqtda quriladi
             context.user_data['pending_results'] = results
-            context.user_data['pending_general_pdf'] = general_pdf_path
             context.user_data['status_message'] = status_message # Pass status message for updates
 
             # Start section configuration
@@ -853,12 +983,17 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
         # Update status message to 95% if not configuring sections
         await status_message.edit_text("📊 *Tahlil qilinmoqda...*\n\n▰▰▰▰▰▰▰▰▰▰ 95%\n_Yakunlanmoqda..._", parse_mode='Markdown')
 
-        # Generate person results report
-        person_pdf_path = pdf_generator.generate_person_results_report(
-            results,
-            filename="talabgorlar-statistikasi",
-            section_questions=section_questions if section_results_enabled else None
-        )
+        # Hisobotlar xulosa yuborilgach parallel quriladi va tayyor bo'lishi bilan yuboriladi
+        report_tasks = []
+        if send_pdf:
+            report_tasks = [
+                ReportTask('general', results, "📊 Umumiy statistika va item parametrlari", filename="statistika"),
+                ReportTask('person', results, "👥 Talabgorlar natijalari (Umumiy)", filename="talabgorlar-statistikasi",
+                           section_questions=section_questions if section_results_enabled else None),
+            ]
+            if section_results_enabled and section_questions:
+                report_tasks.append(ReportTask('section', results, "📋 Bo'limlar bo'yicha natijalar (T-Score)",
+                                               filename="bulimlar-statistikasi", section_questions=section_questions))
 
         # Update status message to 100%
         await status_message.edit_text("✅ *Tahlil yakunlandi!*\n\n▰▰▰▰▰▰▰▰▰▰ 100%\n_Natijalar yuborilmoqda..._", parse_mode='Markdown')
@@ -930,40 +1065,35 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
                 summary_text += "\n━━━━━━━━━━━━━━━━━━━━\n"
             else:
                 summary_text = f"📊 *Tahlil Natijalari - Qisqacha*\n\n"
-            summary_text += "📄 Batafsil natijalar PDF faylda yuborilmoqda..."
+            if send_pdf:
+                summary_text += "📄 Batafsil natijalar PDF faylda yuborilmoqda..."
+            else:
+                summary_text += "📗 Batafsil natijalar Excel faylda yuborilmoqda..."
 
             await message.reply_text(summary_text, parse_mode='Markdown')
 
-        # Send general statistics PDF
-        if general_pdf_path and os.path.exists(general_pdf_path):
-            with open(general_pdf_path, 'rb') as pdf_file:
-                await message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(general_pdf_path),
-                    caption="📊 Umumiy statistika va item parametrlari"
-                )
-
-        # Send person results PDF
-        with open(person_pdf_path, 'rb') as pdf_file:
-            await message.reply_document(
-                document=pdf_file,
-                filename=os.path.basename(person_pdf_path),
-                caption="👥 Talabgorlar natijalari (Umumiy)"
-            )
-
-        # Generate and send section results if enabled and configured
-        if section_results_enabled and section_questions:
-            section_pdf_path = pdf_generator.generate_section_results_report(
-                results,
-                filename="bulimlar-statistikasi",
-                section_questions=section_questions
-            )
-
-            with open(section_pdf_path, 'rb') as pdf_file:
-                await message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(section_pdf_path),
-                    caption="📋 Bo'limlar bo'yicha natijalar (T-Score)"
+        # Ish papkasi xatolik bo'lsa ham o'chiriladi
+        with PDFReportGenerator() as pdf_generator:
+            await send_reports(pdf_generator, report_tasks, message.reply_document)
+
+            # Parquet yuklangan bo'lsa, natijalar ham Parquet formatda yuboriladi
+            if pending.get('pending_file_extension') == '.parquet' and PARQUET_AVAILABLE:
+                parquet_paths = export_results_parquet(results, pdf_generator.output_dir)
+                for kind, parquet_path in parquet_paths.items():
+                    with open(parquet_path, 'rb') as parquet_file:
+                        await message.reply_document(
+                            document=parquet_file,
+                            filename=os.path.basename(parquet_path),
+                            caption="📦 Talabgorlar natijalari (Parquet)" if kind == 'persons' else "📦 Savollar parametrlari (Parquet)"
+                        )
+                    os.remove(parquet_path)
+
+            # Excel/CSV natijalar (sozlamalarda tanlangan bo'lsa)
+            if report_format in ('excel', 'both'):
+                await send_spreadsheet_results(
+                    message, results, pdf_generator,
+                    section_questions=section_questions if section_results_enabled else None,
+                    as_csv=pending.get('pending_file_extension') == '.csv'
                 )
 
         await message.reply_text(
@@ -1002,15 +1132,8 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
         #         parse_mode='Markdown'
         #     )
 
-        # Cleanup
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         # Clear pending data
-        context.user_data.pop('pending_analysis_file', None)
-        context.user_data.pop('pending_analysis_filename', None)
-        context.user_data.pop('pending_file_extension', None)
-        context.user_data.pop('pending_payment_file', None)
+        _clear_pending_analysis(context, pending)
 
         logger.info(f"Successfully processed file for user {user_id}")
 
@@ -1042,6 +1165,11 @@ async def perform_analysis_after_payment(message, context: ContextTypes.DEFAULT_
                 f"'Boshqa' → 'File Analyzer' orqali faylni tozalang.\n\n"
                 f"Yordam: /help"
             )
+    finally:
+        # Har qanday natijada (muvaffaqiyat, yetarli emas, xatolik) fayl va uning keshi o'chiriladi
+        upload.discard()
+        if os.path.exists(file_path):
+            os.remove(file_path)
 
 
 async def handle_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1083,7 +1211,8 @@ async def handle_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"  • Tahlillar: {total_analyses} ta\n\n"
         f"⚙️ *Sozlamalar:*\n"
         f"  • Bo'limlar bo'yicha natijalash: {'✅' if section_results_enabled else '❌'}\n"
-        f"  • Auto File Cleaner: {'✅' if auto_file_cleaner else '❌'}\n\n"
+        f"  • Auto File Cleaner: {'✅' if auto_file_cleaner else '❌'}\n"
+        f"  • Natijalar formati: {REPORT_FORMAT_LABELS[user_data.get('report_format', 'pdf')]}\n\n"
         f"━━━━━━━━━━━━━━━━━━━━\n"
         f"Ma'lumotlarni tahrirlash uchun quyidagi tugmalardan foydalaning:"
     )
@@ -1924,6 +2053,19 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
         )
         await query.answer("❌ Auto File Cleaner o'chirildi!")
 
+    # Handle results format selection
+    elif query.data in REPORT_FORMAT_CALLBACKS:
+        report_format = REPORT_FORMAT_CALLBACKS[query.data]
+        user_data_manager.update_user_field(user_id, 'report_format', report_format)
+
+        format_text, reply_markup = get_report_format_view(report_format)
+        await query.edit_message_text(
+            format_text,
+            parse_mode='Markdown',
+            reply_markup=reply_markup
+        )
+        await query.answer(f"✅ Natijalar formati: {REPORT_FORMAT_LABELS[report_format]}")
+
     # Handle detailed statistics view
     elif query.data == 'view_detailed_stats':
         user_id = update.effective_user.id
@@ -2072,7 +2214,6 @@ async def handle_section_questions_input(update: Update, context: ContextTypes.D
 
         # Get pending results if available
         pending_results = context.user_data.get('pending_results')
-        pending_general_pdf = context.user_data.get('pending_general_pdf')
 
         # Show summary
         summary = f"✅ *{current_subject}* fani uchun bo'limlar konfiguratsiyasi tugallandi!\n\n"
@@ -2096,50 +2237,27 @@ async def handle_section_questions_input(update: Update, context: ContextTypes.D
             if status_message:
                 await status_message.edit_text("📊 *Tahlil qilinmoqda...*\n\n▰▰▰▰▰▰▰▰▰▰ 95%\n_Yakunlanmoqda..._", parse_mode='Markdown')
 
-            pdf_generator = PDFReportGenerator()
-
-            # Generate general person results (without sections)
-            person_pdf_path = pdf_generator.generate_person_results_report(
-                pending_results,
-                filename=f"talabgorlar_natijalari_{user_id}",
-                section_questions=None
-            )
-
-            # Generate section results in separate PDF
-            section_pdf_path = pdf_generator.generate_section_results_report(
-                pending_results,
-                filename="bulimlar-statistikasi",
-                section_questions=section_questions
-            )
+            report_format = user_data_manager.get_user_data(user_id).get('report_format', 'pdf')
 
             # Update status message to 100%
             if status_message:
                 await status_message.edit_text("✅ *Tahlil yakunlandi!*\n\n▰▰▰▰▰▰▰▰▰▰ 100%\n_Natijalar yuborilmoqda..._", parse_mode='Markdown')
 
-            # Send general statistics PDF
-            if pending_general_pdf and os.path.exists(pending_general_pdf):
-                with open(pending_general_pdf, 'rb') as pdf_file:
-                    await update.message.reply_document(
-                        document=pdf_file,
-                        filename=os.path.basename(pending_general_pdf),
-                        caption="📊 Umumiy statistika va item parametrlari"
-                    )
-
-            # Send general person results PDF
-            with open(person_pdf_path, 'rb') as pdf_file:
-                await update.message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(person_pdf_path),
-                    caption="👥 Talabgorlar natijalari (Umumiy)"
-                )
-
-            # Send section results PDF
-            with open(section_pdf_path, 'rb') as pdf_file:
-                await update.message.reply_document(
-                    document=pdf_file,
-                    filename=os.path.basename(section_pdf_path),
-                    caption="📋 Bo'limlar bo'yicha natijalar (T-Score)"
-                )
+            with PDFReportGenerator() as pdf_generator:
+                # Umumiy, talabgorlar (bo'limlarsiz) va bo'limlar hisobotlari parallel quriladi
+                if report_format != 'excel':
+                    await send_reports(pdf_generator, [
+                        ReportTask('general', pending_results, "📊 Umumiy statistika va item parametrlari",
+                                   filename="statistika"),
+                        ReportTask('person', pending_results, "👥 Talabgorlar natijalari (Umumiy)",
+                                   filename=f"talabgorlar_natijalari_{user_id}"),
+                        ReportTask('section', pending_results, "📋 Bo'limlar bo'yicha natijalar (T-Score)",
+                                   filename="bulimlar-statistikasi", section_questions=section_questions),
+                    ], update.message.reply_document)
+
+                if report_format in ('excel', 'both'):
+                    await send_spreadsheet_results(update.message, pending_results, pdf_generator,
+                                                   section_questions=section_questions)
 
         # Clear temporary data
         context.user_data['configuring_sections'] = False
@@ -2148,7 +2266,6 @@ async def handle_section_questions_input(update: Update, context: ContextTypes.D
         context.user_data['section_questions'] = {}
         context.user_data['current_subject'] = None
         context.user_data['pending_results'] = None
-        context.user_data['pending_general_pdf'] = None
         context.user_data['status_message'] = None # Clear status message
 
     return True
@@ -2225,45 +2342,6 @@ def parse_question_numbers(text: str) -> tuple[list, str]:
     return (question_numbers, error_msg)
 
 
-def format_question_list(questions: list) -> str:
-    """
-    Format a list of question numbers into a readable string
-
-    Args:
-        questions: List of question numbers
-
-    Returns:
-        Formatted string
-    """
-    if not questions:
-        return "Yo'q"
-
-    # Group consecutive numbers into ranges
-    questions = sorted(questions)
-    ranges = []
-    start = questions[0]
-    end = questions[0]
-
-    for i in range(1, len(questions)):
-        if questions[i] == end + 1:
-            end = questions[i]
-        else:
-            if start == end:
-                ranges.append(str(start))
-            else:
-                ranges.append(f"{start}-{end}")
-            start = questions[i]
-            end = questions[i]
-
-    # Add the last range
-    if start == end:
-        ranges.append(str(start))
-    else:
-        ranges.append(f"{start}-{end}")
-
-    return ", ".join(ranges)
-
-
 async def handle_profile_edit(update: Update, context: ContextTypes.DEFAULT_TYPE, text: str):
     """Handle profile editing text input"""
     user_id = update.effective_user.id
@@ -2319,6 +2397,7 @@ def get_settings_keyboard(user_id: int = None):
         [KeyboardButton("📊 Fan bo'limlari bo'yicha natijalash")],
         [KeyboardButton("✍️ Yozma ish funksiyasi")],
         [KeyboardButton("🧽 Auto File Cleaner")],
+        [KeyboardButton("📑 Natijalar formati")],
         [KeyboardButton("◀️ Ortga")]
     ]
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
@@ -2591,6 +2670,77 @@ async def handle_auto_file_cleaner(update: Update, context: ContextTypes.DEFAULT
     )
 
 
+def get_report_format_view(report_format: str):
+    """Natijalar formati sozlamasi matni va tugmalari"""
+    format_text = (
+        f"📑 *Natijalar formati*\n\n"
+        f"Hozirgi holat: *{REPORT_FORMAT_LABELS[report_format]}*\n\n"
+        f"• 📄 PDF: grafiklar va jadvallar bilan hisobotlar\n"
+        f"• 📗 Excel: talabgorlar va savollar jadvali (formulalar, rangli darajalar) - "
+        f"katta guruhlarda bir necha soniyada tayyor\n"
+        f"• 📄📗 Ikkalasi: PDF hisobotlar va Excel jadval\n\n"
+        f"Formatni tanlang:"
+    )
+
+    keyboard = [[
+        InlineKeyboardButton(
+            f"✔️ {label}" if value == report_format else label,
+            callback_data=f"report_format_{value}"
+        )
+        for value, label in REPORT_FORMAT_LABELS.items()
+    ]]
+    return format_text, InlineKeyboardMarkup(keyboard)
+
+
+async def handle_report_format(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle Results Format button"""
+    user_id = update.effective_user.id
+    user_data = user_data_manager.get_user_data(user_id)
+
+    format_text, reply_markup = get_report_format_view(user_data.get('report_format', 'pdf'))
+    await update.message.reply_text(
+        format_text,
+        parse_mode='Markdown',
+        reply_markup=reply_markup
+    )
+
+
+async def send_spreadsheet_results(message, results: dict, pdf_generator: PDFReportGenerator,
+                                   section_questions: dict = None, as_csv: bool = False,
+                                   prefix: str = 'natijalar'):
+    """
+    Natijalarni Excel (yoki CSV yuklangan bo'lsa CSV) fayllarda yuborish
+
+    Fayllar hisobot ishining papkasiga yoziladi va pdf_generator.cleanup() bilan o'chiriladi.
+    """
+    section_scores = calculate_section_scores(results, section_questions) if section_questions else None
+
+    loop = asyncio.get_running_loop()
+    if as_csv:
+        csv_paths = await loop.run_in_executor(
+            None, partial(export_results_csv, results, pdf_generator.output_dir, prefix=prefix,
+                    section_scores=section_scores)
+        )
+        documents = [
+            (csv_paths['persons'], "📄 Talabgorlar natijalari (CSV)"),
+            (csv_paths['items'], "📄 Savollar parametrlari (CSV)")
+        ]
+    else:
+        xlsx_path = await loop.run_in_executor(
+            None, partial(export_results_excel, results, pdf_generator.output_dir, prefix=prefix,
+                    section_scores=section_scores)
+        )
+        documents = [(xlsx_path, "📗 Talabgorlar va savollar natijalari (Excel)")]
+
+    for path, caption in documents:
+        with open(path, 'rb') as document:
+            await message.reply_document(
+                document=document,
+                filename=os.path.basename(path),
+                caption=caption
+            )
+
+
 async def handle_students(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Students button - show list of students"""
     user_id = update.effective_user.id
@@ -2790,6 +2940,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await handle_writing_task(update, context)
     elif message_text == "🧽 Auto File Cleaner":
         await handle_auto_file_cleaner(update, context)
+    elif message_text == "📑 Natijalar formati":
+        await handle_report_format(update, context)
     # Handle test creation buttons
     elif message_text == "➕ Yangi test yaratish":
         await handle_create_test(update, context)
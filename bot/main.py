@@ -29,6 +29,7 @@ from bot.handlers.payment_handlers import (
     admin_panel_command
 )
 from bot.utils.error_notifier import error_notifier
+from bot.utils.process_pool import shutdown_process_pool
 
 load_dotenv()
 
@@ -56,6 +57,11 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
         )
 
 
+async def post_shutdown(application: Application):
+    """Bot to'xtaganda umumiy jarayonlar havzasini yopish (worker jarayonlari qolib ketmasin)"""
+    shutdown_process_pool()
+
+
 async def main():
     """Start the bot"""
     bot_token = os.getenv('BOT_TOKEN')
@@ -75,7 +81,7 @@ async def main():
     except Exception as e:
         logger.warning(f"Admin IDs yuklanmadi: {e}")
     
-    application = Application.builder().token(bot_token).build()
+    application = Application.builder().token(bot_token).post_shutdown(post_shutdown).build()
     
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("restart", restart_command))
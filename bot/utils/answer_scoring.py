@@ -0,0 +1,127 @@
+"""
+Xom javoblarni (tanlangan variantlar) kalit bilan solishtirib 0/1 matritsaga aylantirish
+"""
+import importlib.util
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bot.utils.answer_parser import parse_answer_string
+
+# Variant harfidan keyin keladigan ajratgichlar: "A) ...", "A. ...", "A - ..."
+OPTION_LABEL_SEPARATORS = [')', '.', ' ', ':', '-']
+
+BLANK_ANSWER = ''
+
+# pyarrow bo'lsa satr amallari Arrow yadrolarida bajariladi (bir necha barobar tezroq)
+ANSWER_STRING_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') is not None else 'string'
+
+# Butun son ko'rinishidagi float matni: "1.0" -> "1"
+INTEGRAL_FLOAT_PATTERN = r'^([+-]?\d+)\.0+$'
+
+
+def _normalize_column(column: pd.Series) -> pd.Series:
+    """Bitta ustunni satr amallari bilan normallashtirish (katakma-katak Python chaqiruvisiz)"""
+    text = column.astype(ANSWER_STRING_DTYPE)
+    # Faqat matndan iborat ustunlarda float bo'lishi mumkin emas - regex o'tkazib yuboriladi
+    if pd.api.types.is_float_dtype(column) or (
+            column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in ('string', 'empty')):
+        integral = text.str.endswith('.0', na=False)
+        if integral.any():
+            text[integral] = text[integral].str.replace(INTEGRAL_FLOAT_PATTERN, r'\1', regex=True)
+    return text.str.strip().str.upper()
+
+
+def normalize_answers(values: Union[pd.DataFrame, pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Javoblarni solishtirish uchun bir xil ko'rinishga keltirish
+
+    Bo'sh qiymatlar '' ga, qolganlari chetdagi bo'shliqlarsiz katta harfli matnga aylantiriladi.
+    Butun son ko'rinishidagi float qiymatlar (1.0, shuningdek '1.0' matni) '1' bo'ladi.
+    """
+    frame = pd.DataFrame(values)
+    return frame.apply(_normalize_column).fillna(BLANK_ANSWER).to_numpy(dtype=str)
+
+
+def parse_answer_key(text: str) -> Optional[List[str]]:
+    """
+    "1a2b3c" yoki "1a2b3(ayb)" ko'rinishidagi kalitni ro'yxatga aylantirish
+
+    Returns:
+        Har bir savol uchun to'g'ri javob (['A', 'B', 'AYB']) yoki None (format noto'g'ri bo'lsa)
+    """
+    if not text:
+        return None
+
+    numbers = [int(num) for num in re.findall(r'(\d+)(?:[a-zA-Z]|\()', text.replace(' ', ''))]
+    if not numbers:
+        return None
+
+    success, parsed, _ = parse_answer_string(text, max(numbers))
+    if not success:
+        return None
+
+    return [
+        item['text_answer'].upper() if item['is_text_answer'] else chr(ord('A') + item['correct_answer'])
+        for item in parsed
+    ]
+
+
+def score_answers(answers: pd.DataFrame, key: Union[pd.DataFrame, Sequence[Any]],
+                  question_names: Optional[List[str]] = None) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """
+    Tanlangan variantlarni kalit bilan bitta vektorlashtirilgan solishtirishda baholash
+
+    Javob kalitga teng bo'lsa yoki bitta harfli kalit bilan boshlansa ("A) Toshkent") to'g'ri
+    hisoblanadi. Bo'sh javob - noto'g'ri.
+
+    Args:
+        answers: Talabgorlar × savollar, tanlangan variantlar
+        key: Har bir talabgor uchun kalit (answers bilan bir xil o'lchamli DataFrame, Evalbee)
+             yoki har bir savol uchun bitta kalit (ro'yxat)
+        question_names: Natija ustunlari nomlari (default: answers ustunlari)
+
+    Returns:
+        (0/1 Int8 DataFrame, distraktorlar chastotasi {savol: {'key', 'counts', 'blank'}})
+    """
+    question_names = question_names or [str(col) for col in answers.columns]
+    chosen = normalize_answers(answers)
+
+    if isinstance(key, pd.DataFrame):
+        keys = normalize_answers(key)
+    else:
+        if len(key) != chosen.shape[1]:
+            raise ValueError(f"Kalitda {len(key)} ta javob bor, faylda esa {chosen.shape[1]} ta savol")
+        keys = np.broadcast_to(normalize_answers(pd.Series(list(key))).reshape(1, -1), chosen.shape)
+
+    answered = chosen != BLANK_ANSWER
+    correct = chosen == keys
+    # "A) Toshkent" kabi yorliqli javoblar faqat harfli kalitlar uchun: raqamli kalit '1' bilan '1.5' mos emas
+    letter_keys = np.char.isalpha(keys) & (np.char.str_len(keys) == 1)
+    if letter_keys.any():
+        for separator in OPTION_LABEL_SEPARATORS:
+            correct |= letter_keys & np.char.startswith(chosen, np.char.add(keys, separator))
+    correct &= answered & (keys != BLANK_ANSWER)
+
+    scored = pd.DataFrame(correct.astype(np.int8), columns=question_names, index=answers.index).astype('Int8')
+
+    # Variantlar chastotasi - barcha savollar bitta guruhlashda
+    long = pd.DataFrame({
+        'question': np.repeat(np.arange(chosen.shape[1])[np.newaxis, :], chosen.shape[0], axis=0).ravel(),
+        'answer': chosen.ravel()
+    })
+    counts = long[long['answer'] != BLANK_ANSWER].groupby(['question', 'answer']).size()
+    blanks = (~answered).sum(axis=0)
+
+    distractors = {}
+    for idx, name in enumerate(question_names):
+        question_keys = keys[:, idx][keys[:, idx] != BLANK_ANSWER]
+        distractors[name] = {
+            'key': pd.Series(question_keys).mode().iloc[0] if len(question_keys) else None,
+            'counts': counts.loc[idx].to_dict() if idx in counts.index.get_level_values(0) else {},
+            'blank': int(blanks[idx])
+        }
+
+    return scored, distractors
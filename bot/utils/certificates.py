@@ -0,0 +1,293 @@
+"""
+Sertifikatlarni ommaviy yaratish: bitta shablon, ko'p talabgor
+
+Test uchun umumiy qismlar (sarlavha, test/fan ma'lumoti, jadval ko'rinishi,
+tushuntirish, sana) bir marta o'lchanadi va joylashuvi hisoblanadi. Har bir
+talabgor uchun faqat canvas primitivlari chiziladi - platypus hujjati,
+Paragraph va Table har safar qaytadan qurilmaydi. Katta guruhlar
+uchun ish umumiy jarayonlar havzasida bo'laklarga bo'linishi mumkin.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from bot.utils import report_styles
+from bot.utils.process_pool import submit_to_pool
+
+logger = logging.getLogger(__name__)
+
+# Shundan ko'p sertifikat bo'lsa va processes > 1 bo'lsa jarayonlar havzasi ishlatiladi
+PARALLEL_CERTIFICATE_THRESHOLD = 200
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+CONTENT_WIDTH = PAGE_WIDTH - 2 * inch
+
+NAME_FONT_SIZE = 22
+MIN_NAME_FONT_SIZE = 12
+
+TABLE_LABELS = ["To'g'ri javoblar", 'Natija (foiz)', 'Daraja', 'Qobiliyat darajasi', 'T-Score', 'Theta (θ)']
+TABLE_COL_WIDTHS = (3 * inch, 2 * inch)
+TABLE_HEADER_HEIGHT = 30
+TABLE_ROW_HEIGHT = 22
+GRADE_ROW = 2
+
+
+def certificate_grade(percentage: float) -> Tuple[str, colors.Color]:
+    """Foiz bo'yicha baho va uning rangi"""
+    if percentage >= 90:
+        return "A (A'lo)", colors.HexColor('#27AE60')
+    if percentage >= 80:
+        return "B (Yaxshi)", colors.HexColor('#2ECC71')
+    if percentage >= 70:
+        return "C (Qoniqarli)", colors.HexColor('#F39C12')
+    if percentage >= 60:
+        return "D (O'rtacha)", colors.HexColor('#E67E22')
+    return "F (Qoniqarsiz)", colors.HexColor('#E74C3C')
+
+
+def ability_level(theta: float) -> str:
+    """Theta bo'yicha qobiliyat darajasi"""
+    if theta >= 2.0:
+        return "Juda yuqori"
+    if theta >= 1.0:
+        return "Yuqori"
+    if theta >= 0:
+        return "O'rtacha"
+    if theta >= -1.0:
+        return "O'rtachadan past"
+    return "Past"
+
+
+# (shrift, o'lcham, rang, matn) - bitta qatordagi bo'laklar
+TextRun = Tuple[str, float, colors.Color, str]
+
+
+@dataclass(frozen=True)
+class _PlacedLine:
+    """Bir marta joylashtirilgan markazlangan matn qatori: [(x, y, shrift, o'lcham, rang, matn)]"""
+    runs: Tuple[Tuple[float, float, str, float, colors.Color, str], ...]
+
+
+def _fit_font_size(text: str, font: str, size: float, min_size: float = MIN_NAME_FONT_SIZE,
+                   max_width: float = CONTENT_WIDTH) -> float:
+    """Matn max_width ga sig'maguncha shrift o'lchamini kichraytirish"""
+    while size > min_size and stringWidth(text, font, size) > max_width:
+        size -= 1
+    return size
+
+
+class CertificateTemplate:
+    """
+    Bitta test uchun sertifikat shabloni
+
+    Statik matnlar bir marta o'lchanib, har bir bo'lakning koordinatasi saqlanadi;
+    render() Paragraph/Table qurmasdan faqat canvas primitivlarini chizadi.
+    """
+
+    def __init__(self, test_name: str, subject: str, issued_on: Optional[str] = None):
+        self.test_name = test_name
+        self.subject = subject
+        self.issued_on = issued_on or datetime.now().strftime('%d.%m.%Y')
+
+        self.fonts = report_styles.fonts()
+        regular, bold = self.fonts.regular, self.fonts.bold
+        dark = colors.HexColor('#2C3E50')
+        grey = colors.HexColor('#7F8C8D')
+        self._static: List[_PlacedLine] = []
+
+        # Yuqoridan pastga; ism va jadval uchun joy qoldiriladi
+        cursor = PAGE_HEIGHT - 2 * inch - 28
+        self._line([(bold, 28, dark, "SERTIFIKAT")], cursor)
+        cursor -= 40
+        self._line([(regular, 16, colors.HexColor('#34495E'), "TEST NATIJALARI")], cursor)
+
+        self.name_baseline = cursor - 60
+        cursor = self.name_baseline - 55
+
+        for label, value in (("Test:", test_name), ("Fan:", subject)):
+            text = f"{label} {value}"
+            size = _fit_font_size(text, regular, 12, min_size=7)
+            self._line([(bold, size, dark, f"{label} "), (regular, size, dark, str(value))], cursor)
+            cursor -= 18
+
+        self.table_top = cursor - 0.4 * inch
+        self.table_left = (PAGE_WIDTH - sum(TABLE_COL_WIDTHS)) / 2
+        cursor = self.table_top - TABLE_HEADER_HEIGHT - TABLE_ROW_HEIGHT * len(TABLE_LABELS) - 0.5 * inch
+
+        explanation = [
+            [(bold, "Tushuntirish:")],
+            [(regular, "• "), (bold, "T-Score:"),
+             (regular, " Standartlashtirilgan ball (o'rtacha=50, standart og'ish=10)")],
+            [(regular, "• "), (bold, "Theta (θ):"),
+             (regular, " Rasch modeli bo'yicha qobiliyat darajasi")],
+            [(regular, "• Yuqori theta qiymati yuqori qobiliyatni bildiradi")],
+        ]
+        for parts in explanation:
+            self._line([(font, 9, grey, text) for font, text in parts], cursor)
+            cursor -= 12
+
+        self._line([(regular, 10, colors.HexColor('#95A5A6'), f"Sana: {self.issued_on}")], cursor - 0.8 * inch)
+
+    def _line(self, runs: List[TextRun], baseline: float) -> None:
+        """Bo'laklardan iborat qatorni sahifa markaziga joylashtirish"""
+        widths = [stringWidth(text, font, size) for font, size, _, text in runs]
+        x = (PAGE_WIDTH - sum(widths)) / 2
+        placed = []
+        for (font, size, color, text), width in zip(runs, widths):
+            placed.append((x, baseline, font, size, color, text))
+            x += width
+        self._static.append(_PlacedLine(tuple(placed)))
+
+    def _draw_table(self, pdf: canvas.Canvas, values: List[str], grade_color: colors.Color) -> None:
+        label_width, value_width = TABLE_COL_WIDTHS
+        left, top = self.table_left, self.table_top
+        width = label_width + value_width
+
+        pdf.setFillColor(colors.HexColor('#34495E'))
+        pdf.rect(left, top - TABLE_HEADER_HEIGHT, width, TABLE_HEADER_HEIGHT, stroke=0, fill=1)
+        pdf.setFillColor(colors.whitesmoke)
+        pdf.setFont(self.fonts.bold, 12)
+        header_y = top - TABLE_HEADER_HEIGHT / 2 - 4
+        pdf.drawCentredString(left + label_width / 2, header_y, "Ko'rsatkich")
+        pdf.drawCentredString(left + label_width + value_width / 2, header_y, 'Qiymat')
+
+        pdf.setFont(self.fonts.regular, 11)
+        for row, (label, value) in enumerate(zip(TABLE_LABELS, values)):
+            row_top = top - TABLE_HEADER_HEIGHT - row * TABLE_ROW_HEIGHT
+            pdf.setFillColor(colors.white if row % 2 == 0 else colors.HexColor('#F8F9FA'))
+            pdf.rect(left, row_top - TABLE_ROW_HEIGHT, width, TABLE_ROW_HEIGHT, stroke=0, fill=1)
+            if row == GRADE_ROW:
+                pdf.setFillColor(grade_color)
+                pdf.rect(left + label_width, row_top - TABLE_ROW_HEIGHT, value_width, TABLE_ROW_HEIGHT,
+                         stroke=0, fill=1)
+
+            text_y = row_top - TABLE_ROW_HEIGHT / 2 - 4
+            pdf.setFillColor(colors.black)
+            pdf.drawCentredString(left + label_width / 2, text_y, label)
+            if row == GRADE_ROW:
+                pdf.setFillColor(colors.white)
+                pdf.setFont(self.fonts.bold, 11)
+            pdf.drawCentredString(left + label_width + value_width / 2, text_y, value)
+            pdf.setFont(self.fonts.regular, 11)
+
+        # Katakchalar chegaralari
+        pdf.setStrokeColor(colors.grey)
+        pdf.setLineWidth(1)
+        bottom = top - TABLE_HEADER_HEIGHT - TABLE_ROW_HEIGHT * len(TABLE_LABELS)
+        for y in [top, top - TABLE_HEADER_HEIGHT] + [
+                top - TABLE_HEADER_HEIGHT - (row + 1) * TABLE_ROW_HEIGHT for row in range(len(TABLE_LABELS))]:
+            pdf.line(left, y, left + width, y)
+        for x in (left, left + label_width, left + width):
+            pdf.line(x, top, x, bottom)
+
+    def render(self, filepath: str, student: Dict[str, Any]) -> str:
+        """
+        Bitta talabgor sertifikatini yozish
+
+        Args:
+            filepath: PDF fayl yo'li
+            student: {'student_name', 'score', 'max_score', 'percentage', 'theta', 't_score'}
+        """
+        percentage = student['percentage']
+        theta = student['theta']
+        grade, grade_color = certificate_grade(percentage)
+
+        # Bir sahifali kichik fayl: siqish (zlib + ASCII85) vaqtning katta qismini olardi
+        pdf = canvas.Canvas(filepath, pagesize=A4, pageCompression=0)
+        pdf.setTitle(f"{self.test_name} - {student['student_name']}")
+
+        for line in self._static:
+            for x, y, font, size, color, text in line.runs:
+                pdf.setFont(font, size)
+                pdf.setFillColor(color)
+                pdf.drawString(x, y, text)
+
+        # Ism sahifa kengligiga sig'maguncha kichraytiriladi
+        name = str(student['student_name'])
+        pdf.setFont(self.fonts.bold, _fit_font_size(name, self.fonts.bold, NAME_FONT_SIZE))
+        pdf.setFillColor(colors.HexColor('#2980B9'))
+        pdf.drawCentredString(PAGE_WIDTH / 2, self.name_baseline, name)
+
+        self._draw_table(pdf, [
+            f"{student['score']}/{student['max_score']}",
+            f"{percentage:.1f}%",
+            grade,
+            ability_level(theta),
+            f"{student['t_score']:.1f}",
+            f"{theta:.2f}",
+        ], grade_color)
+
+        pdf.showPage()
+        pdf.save()
+        return filepath
+
+
+def _render_batch(test_name: str, subject: str, issued_on: str, output_dir: str,
+                  students: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Bir guruh sertifikatlarni bitta shablon bilan yozish (worker jarayonida ham ishlaydi)
+
+    Bitta talabgor ma'lumotidagi xatolik butun guruhni to'xtatmaydi - uning o'rnida None qaytadi.
+    """
+    template = CertificateTemplate(test_name, subject, issued_on)
+    paths = []
+    for student in students:
+        try:
+            paths.append(template.render(os.path.join(output_dir, f"{student['filename']}.pdf"), student))
+        except Exception as e:
+            logger.error(f"{student.get('student_name')} uchun sertifikat yaratishda xatolik: {e}")
+            paths.append(None)
+    return paths
+
+
+def render_certificates(test_name: str, subject: str, students: List[Dict[str, Any]], output_dir: str,
+                        processes: Optional[int] = None) -> List[Optional[str]]:
+    """
+    Bitta test bo'yicha ko'p talabgorga sertifikat yaratish
+
+    Args:
+        test_name: Test nomi
+        subject: Fan nomi
+        students: Har biri {'student_name', 'score', 'max_score', 'percentage', 'theta', 't_score', 'filename'}
+        output_dir: PDF fayllar papkasi
+        processes: Parallel bo'laklar soni (None/1 - shu jarayonda; PARALLEL_CERTIFICATE_THRESHOLD dan
+            kichik guruhlar har doim shu jarayonda yoziladi)
+
+    Returns:
+        PDF fayl yo'llari (students tartibida; yaratib bo'lmagan sertifikat o'rnida None)
+    """
+    issued_on = datetime.now().strftime('%d.%m.%Y')
+    workers = min(processes or 1, len(students))
+
+    if workers > 1 and len(students) >= PARALLEL_CERTIFICATE_THRESHOLD:
+        chunk_size = -(-len(students) // workers)
+        chunks = [students[i:i + chunk_size] for i in range(0, len(students), chunk_size)]
+        try:
+            # Umumiy forkserver havzasi - bot jarayoni fork qilinmaydi, havza yopilmaydi
+            futures = [submit_to_pool(_render_batch, test_name, subject, issued_on, output_dir, chunk)
+                       for chunk in chunks]
+            paths = [path for future in futures for path in future.result()]
+            _log_rendered(paths, students, f"{len(chunks)} ta bo'lakda parallel ")
+            return paths
+        except (OSError, RuntimeError) as e:
+            # Jarayon ochib bo'lmasa yoki havza buzilsa - ketma-ket ishlash
+            logger.warning(f"Jarayonlar havzasida sertifikat yaratib bo'lmadi, ketma-ket ishlanadi: {e}")
+
+    paths = _render_batch(test_name, subject, issued_on, output_dir, students)
+    _log_rendered(paths, students)
+    return paths
+
+
+def _log_rendered(paths: List[Optional[str]], students: List[Dict[str, Any]], where: str = "") -> None:
+    failed = [student['filename'] for student, path in zip(students, paths) if path is None]
+    logger.info(f"🎓 {len(paths) - len(failed)} ta sertifikat {where}yaratildi")
+    if failed:
+        logger.warning(f"⚠️ {len(failed)} ta sertifikat yaratilmadi: {', '.join(map(str, failed))}")
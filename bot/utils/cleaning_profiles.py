@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CleaningProfileManager:
+    """
+    O'qituvchilar uchun tozalash profillari (ustun rollari) keshi
+
+    Har hafta bir xil Evalbee/Google Forms shaklidagi fayl yuklanganda ustun
+    rollari qayta aniqlanmaydi - sarlavha "barmoq izi" bo'yicha saqlangan profil
+    ishlatiladi.
+    """
+
+    # Har bir o'qituvchi uchun saqlanadigan profillar soni
+    MAX_PROFILES_PER_TEACHER = 20
+
+    # last_used shu vaqtdan eskirgandagina faylga yoziladi (eng eski profillarni tanlash uchun yetarli)
+    LAST_USED_RESOLUTION = timedelta(hours=1)
+
+    def __init__(self, data_file: str = "data/cleaning_profiles.json"):
+        self.data_file = data_file
+        # Hali faylga yozilmagan ishlatilishlar soni {(teacher_id, fingerprint): hits}
+        self._pending_hits: Dict[tuple, int] = {}
+        self._ensure_file_exists()
+
+    def _ensure_file_exists(self):
+        """Create data file if it doesn't exist"""
+        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        if not os.path.exists(self.data_file):
+            with open(self.data_file, 'w', encoding='utf-8') as f:
+                json.dump({}, f, ensure_ascii=False)
+
+    def _load_profiles(self) -> Dict:
+        """Load all profiles from file"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _save_profiles(self, profiles: Dict):
+        """Save profiles to file"""
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            json.dump(profiles, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def fingerprint(columns: Iterable[Any]) -> str:
+        """
+        Sarlavha tartibi bo'yicha barmoq izi (katta-kichik harf va chetdagi bo'shliqlar hisobga olinmaydi)
+
+        Args:
+            columns: Asl fayl ustunlari
+
+        Returns:
+            SHA-1 hex qator
+        """
+        header = '\x1f'.join(str(col).strip().lower() for col in columns)
+        return hashlib.sha1(header.encode('utf-8')).hexdigest()
+
+    def get_profile(self, teacher_id: int, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Saqlangan profilni olish
+
+        Returns:
+            Profil (kept_columns, name_columns, question_columns, removed_columns) yoki None
+        """
+        profiles = self._load_profiles()
+        return profiles.get(str(teacher_id), {}).get(fingerprint)
+
+    def save_profile(self, teacher_id: int, fingerprint: str, profile: Dict[str, Any]):
+        """Aniqlangan ustun rollarini saqlash (eng eski profillar o'chiriladi)"""
+        profiles = self._load_profiles()
+        teacher_profiles = profiles.setdefault(str(teacher_id), {})
+
+        now = datetime.now().isoformat()
+        teacher_profiles[fingerprint] = {
+            **profile,
+            'created_at': teacher_profiles.get(fingerprint, {}).get('created_at', now),
+            'last_used': now,
+            'hits': 0
+        }
+
+        if len(teacher_profiles) > self.MAX_PROFILES_PER_TEACHER:
+            oldest = sorted(teacher_profiles, key=lambda key: teacher_profiles[key].get('last_used', ''))
+            for key in oldest[:len(teacher_profiles) - self.MAX_PROFILES_PER_TEACHER]:
+                del teacher_profiles[key]
+
+        self._save_profiles(profiles)
+        logger.info(f"💾 Tozalash profili saqlandi: teacher={teacher_id}, {fingerprint[:10]}")
+
+    def mark_used(self, teacher_id: int, fingerprint: str, profile: Optional[Dict[str, Any]] = None):
+        """
+        Profil ishlatilganini qayd etish
+
+        Har bir kesh tegishida butun JSON qayta yozilmaydi: last_used LAST_USED_RESOLUTION dan
+        eskirgandagina yangilanadi, oradagi ishlatilishlar xotirada yig'ilib keyingi yozuvda qo'shiladi.
+
+        Args:
+            profile: get_profile natijasi (berilsa, fayl qayta o'qilmaydi)
+        """
+        key = (str(teacher_id), fingerprint)
+        pending = self._pending_hits.get(key, 0) + 1
+        now = datetime.now()
+
+        if profile is not None:
+            try:
+                last_used = datetime.fromisoformat(profile.get('last_used', ''))
+            except ValueError:
+                last_used = None
+            if last_used is not None and now - last_used < self.LAST_USED_RESOLUTION:
+                self._pending_hits[key] = pending
+                return
+
+        profiles = self._load_profiles()
+        stored = profiles.get(str(teacher_id), {}).get(fingerprint)
+        self._pending_hits.pop(key, None)
+        if stored is None:
+            return
+
+        stored['last_used'] = now.isoformat()
+        stored['hits'] = stored.get('hits', 0) + pending
+        self._save_profiles(profiles)
+
+    def delete_profile(self, teacher_id: int, fingerprint: str) -> bool:
+        """Profilni o'chirish (masalan, noto'g'ri aniqlangan bo'lsa)"""
+        profiles = self._load_profiles()
+        teacher_profiles = profiles.get(str(teacher_id), {})
+        if fingerprint not in teacher_profiles:
+            return False
+
+        del teacher_profiles[fingerprint]
+        self._save_profiles(profiles)
+        return True
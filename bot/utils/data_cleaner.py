@@ -2,61 +2,132 @@
 import pandas as pd
 import numpy as np
 import re
-from typing import Tuple, Dict, Any, List
+import time
+from contextlib import contextmanager
+from typing import Tuple, Dict, Any, List, Optional
 import logging
 
+from bot.utils.answer_scoring import score_answers
+from bot.utils.cleaning_profiles import CleaningProfileManager
+from bot.utils.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# Ustun nomlari uchun oldindan kompilyatsiya qilingan pattern'lar
+NUMERIC_NAME_PATTERN = r'^\d+$'
+Q_NAME_PATTERN = r'^[Qq][\s_-]?\d+'
+ITEM_NAME_PATTERN = r'^item[\s_-]?\d+'
+NUMERIC_TEXT_PATTERN = r'^\d+\.?\d*$'
+
+EVALBEE_MARKS_RE = re.compile(r'^Q\s+(\d+)\s+Marks$', re.IGNORECASE)
+EVALBEE_OPTIONS_RE = re.compile(r'^Q\s+(\d+)\s+Options$', re.IGNORECASE)
+EVALBEE_KEY_RE = re.compile(r'^Q\s+(\d+)\s+Key$', re.IGNORECASE)
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], step: str):
+    """Bosqich vaqtini timings lug'atiga qo'shish (sekundlarda)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[step] = timings.get(step, 0.0) + time.perf_counter() - start
+
+
+def _coerce_numeric(col_data: pd.Series) -> pd.Series:
+    """pd.to_numeric(errors='coerce'), xatolik bo'lsa bo'sh ustun"""
+    try:
+        return pd.to_numeric(col_data, errors='coerce')
+    except Exception as e:
+        logger.warning(f"Raqamga aylantirishda xatolik {col_data.name}: {e}")
+        return pd.Series(np.nan, index=col_data.index)
+
 
 class DataCleaner:
     """Super aqlli data cleaner - turli xil test fayllarini aniqlash va tozalash"""
     
-    def __init__(self):
+    # SAVOL USTUNLARI UCHUN KEYWORDS (ko'proq variant)
+    QUESTION_KEYWORDS = [
+        # O'zbekcha
+        'savol', 'savol_', 'so\'roq', 'soroq', 'test', 'topshiriq',
+        # Inglizcha
+        'question', 'item', 'problem', 'task', 'quiz',
+        # Fanlar
+        'matematik', 'mantiq', 'fizika', 'kimyo', 'biologiya',
+        'ingliz', 'ona tili', 'adabiyot', 'tarix', 'geografiya',
+        'informatika', 'matematika', 'algebra', 'geometriya',
+        # Qisqa shakllar
+        'mat', 'fiz', 'kim', 'bio', 'geo', 'inf', 'ing'
+    ]
+    
+    # ISM-FAMILIYA USTUNLARI UCHUN KEYWORDS (ko'proq variant)
+    PARTICIPANT_NAME_KEYWORDS = [
+        # O'zbekcha
+        'talabgor', 'talabgor_ismi', 'o\'quvchi', 'oquvchi', 
+        'abituriyent', 'ism', 'familiya', 'f.i.o', 'fio',
+        'ism-familiya', 'ismfamiliya', 'ismi', 'familyasi',
+        'to\'liq ism', 'toliq_ism', 'foydalanuvchi', 'user',
+        # Inglizcha
+        'student', 'participant', 'name', 'full name', 
+        'fullname', 'full_name', 'student_name', 'learner',
+        'candidate', 'examinee', 'name surname', 'surname',
+        # Ruscha
+        'фио', 'имя', 'студент', 'участник'
+    ]
+    
+    # O'CHIRISH KERAK BO'LGAN USTUNLAR UCHUN KEYWORDS
+    REMOVABLE_METADATA_KEYWORDS = [
+        'email', 'e-mail', 'time', 'date', 'timestamp', 'vaqt',
+        'telegram', '@', 'phone', 'tel', 'created', 'updated',
+        'id', 'uuid', 'guid', 'code', 'key', 'session', 'raqam',
+        'duration', 'ip', 'address', 'score', 'ball', 'natija'
+    ]
+    
+    # Evalbee formatida ism ustuni prioritet guruhlari
+    # Prioritet: 'name' > 'student' > 'talabgor' > 'ism' > 'exam'
+    # 'exam' oxirgi o'rinda chunki ko'pincha test nomi emas, talabgor ismi kerak
+    EVALBEE_NAME_KEYWORD_GROUPS = [
+        ['name', 'full name', 'fullname'],  # Eng yuqori prioritet
+        ['student', 'student name', 'student_name'],
+        ['talabgor', 'talabgor_ismi'],
+        ['ism', 'familiya', 'fio'],
+        ['exam']  # Eng past prioritet
+    ]
+    
+    # Kalit so'z qidiruvchilari klass uchun bir marta quriladi (kalit so'zlar ro'yxatlari shu yerdan o'qiladi)
+    _question_matcher = KeywordMatcher(QUESTION_KEYWORDS)
+    _participant_name_matcher = KeywordMatcher(PARTICIPANT_NAME_KEYWORDS)
+    _removable_metadata_matcher = KeywordMatcher(REMOVABLE_METADATA_KEYWORDS)
+    _evalbee_name_matcher = KeywordMatcher(kw for group in EVALBEE_NAME_KEYWORD_GROUPS for kw in group)
+    _evalbee_name_group = {kw: idx for idx, group in enumerate(EVALBEE_NAME_KEYWORD_GROUPS) for kw in group}
+    _unique_id_matcher = KeywordMatcher(['id', 'code', 'key', 'uuid'])
+    _first_column_id_matcher = KeywordMatcher(['id', 'code', 'raqam', 'uuid'])
+    _row_number_matcher = KeywordMatcher(['t/r', '№', 'n', '#', 'row', 'index'])
+    
+    # Hisobotda ko'rsatiladigan noto'g'ri (0/1 emas) kataklar soni
+    MAX_REPORTED_INVALID_CELLS = 50
+    
+    # Header/metadata qatorlarini qidirish oralig'i
+    HEADER_SCAN_MIN_ROWS = 10
+    HEADER_SCAN_MAX_ROWS = 200
+    HEADER_SCAN_FRACTION = 0.05
+    
+    def __init__(self, profile_manager: Optional[CleaningProfileManager] = None):
         self.min_binary_ratio = 0.7  # At least 70% of values should be 0 or 1
         
-        # SAVOL USTUNLARI UCHUN KEYWORDS (ko'proq variant)
-        self.question_keywords = [
-            # O'zbekcha
-            'savol', 'savol_', 'so\'roq', 'soroq', 'test', 'topshiriq',
-            # Inglizcha
-            'question', 'item', 'problem', 'task', 'quiz',
-            # Fanlar
-            'matematik', 'mantiq', 'fizika', 'kimyo', 'biologiya',
-            'ingliz', 'ona tili', 'adabiyot', 'tarix', 'geografiya',
-            'informatika', 'matematika', 'algebra', 'geometriya',
-            # Qisqa shakllar
-            'mat', 'fiz', 'kim', 'bio', 'geo', 'inf', 'ing'
-        ]
-        
-        # ISM-FAMILIYA USTUNLARI UCHUN KEYWORDS (ko'proq variant)
-        self.participant_name_keywords = [
-            # O'zbekcha
-            'talabgor', 'talabgor_ismi', 'o\'quvchi', 'oquvchi', 
-            'abituriyent', 'ism', 'familiya', 'f.i.o', 'fio',
-            'ism-familiya', 'ismfamiliya', 'ismi', 'familyasi',
-            'to\'liq ism', 'toliq_ism', 'foydalanuvchi', 'user',
-            # Inglizcha
-            'student', 'participant', 'name', 'full name', 
-            'fullname', 'full_name', 'student_name', 'learner',
-            'candidate', 'examinee', 'name surname', 'surname',
-            # Ruscha
-            'фио', 'имя', 'студент', 'участник'
-        ]
+        # Takroriy fayl shakllari uchun ustun rollari keshi (ixtiyoriy)
+        self.profile_manager = profile_manager
         
-        # O'CHIRISH KERAK BO'LGAN USTUNLAR UCHUN KEYWORDS
-        self.removable_metadata_keywords = [
-            'email', 'e-mail', 'time', 'date', 'timestamp', 'vaqt',
-            'telegram', '@', 'phone', 'tel', 'created', 'updated',
-            'id', 'uuid', 'guid', 'code', 'key', 'session', 'raqam',
-            'duration', 'ip', 'address', 'score', 'ball', 'natija'
-        ]
-        
-    def clean_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    def clean_data(self, df: pd.DataFrame, teacher_id: Optional[int] = None,
+                   rescore_raw_answers: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Faylni to'liq tozalash va tahlil uchun tayyorlash
         
         Args:
             df: Raw DataFrame from uploaded file
+            teacher_id: O'qituvchi ID (profile_manager bilan birga - saqlangan profilni ishlatish uchun)
+            rescore_raw_answers: Evalbee faylida Marks o'rniga Options/Key bo'yicha qayta baholash
+                (o'qituvchi kalit yuborganda; Marks ustunlari bo'lmasa har doim qayta baholanadi)
             
         Returns:
             Tuple of (cleaned_df, metadata_dict)
@@ -72,26 +143,61 @@ class DataCleaner:
         
         logger.info(f"🔍 Fayl tahlili boshlandi. Asl o'lcham: {df.shape}")
         
-        # Step 1: Bo'sh qatorlar va ustunlarni o'chirish
-        df = self._remove_empty_rows_cols(df, metadata)
+        # Sarlavha barmoq izi asl ustunlar bo'yicha olinadi
+        fingerprint = None
+        if self.profile_manager is not None and teacher_id is not None:
+            fingerprint = self.profile_manager.fingerprint(df.columns)
         
-        # Step 2: Header/metadata qatorlarini o'chirish
-        df = self._remove_metadata_rows(df, metadata)
+        # Har bir bosqich vaqti (benchmark va sekin fayllarni tahlil qilish uchun)
+        timings = metadata.setdefault('step_timings', {})
         
-        # Step 3: SUPER SMART: Savol va ism-familiya ustunlarini aniqlash
-        df = self._smart_column_detection(df, metadata)
+        # Step 1: Bo'sh qatorlar va ustunlarni o'chirish
+        with _timed(timings, 'remove_empty'):
+            df = self._remove_empty_rows_cols(df, metadata)
+        
+        # Tezkor yo'l: fayl allaqachon toza 0/1 matritsa bo'lsa (ism ustuni + savollar),
+        # header qatorlari va ism nomzodlari tahlili butunlay o'tkazib yuboriladi
+        with _timed(timings, 'fast_path_check'):
+            clean_layout = self._detect_clean_matrix(df)
+        if clean_layout is not None:
+            df = self._apply_clean_layout(df, clean_layout, metadata)
+        else:
+            # Step 2: Header/metadata qatorlarini o'chirish
+            # (xom variantli Evalbee faylida barcha kataklar matn - bu bosqich o'tkazib yuboriladi)
+            with _timed(timings, 'metadata_rows'):
+                if not self._evalbee_answer_columns(df):
+                    df = self._remove_metadata_rows(df, metadata)
+            
+            # Step 3: SUPER SMART: Savol va ism-familiya ustunlarini aniqlash
+            # Saqlangan profil mos kelsa, aniqlash bosqichi butunlay o'tkazib yuboriladi
+            with _timed(timings, 'column_detection'):
+                profile_df = None
+                if fingerprint is not None:
+                    profile = self.profile_manager.get_profile(teacher_id, fingerprint)
+                    if profile is not None:
+                        profile_df = self._apply_cleaning_profile(df, profile, metadata)
+                
+                if profile_df is not None:
+                    df = profile_df
+                    self.profile_manager.mark_used(teacher_id, fingerprint, profile)
+                else:
+                    df = self._smart_column_detection(df, metadata, rescore_raw_answers)
+                    if fingerprint is not None:
+                        self._store_cleaning_profile(teacher_id, fingerprint, df, metadata)
         
         # Step 4: Raqamga aylantirish va bo'sh qiymatlarni to'ldirish
-        df = self._convert_to_numeric(df, metadata)
+        with _timed(timings, 'convert_numeric'):
+            df = self._convert_to_numeric(df, metadata)
         
         # Step 5: Binary data tekshiruvi
-        is_valid, validation_msg = self._validate_binary_data(df, metadata)
+        with _timed(timings, 'validate_binary'):
+            is_valid, validation_msg = self._validate_binary_data(df, metadata)
         if not is_valid:
             metadata['warnings'].append(validation_msg)
         
         # Step 6: Ustun nomlarini standartlashtirish
-        df = self._standardize_column_names(df, metadata)
-        
+        with _timed(timings, 'standardize_names'):
+            df = self._standardize_column_names(df, metadata)
         metadata['final_shape'] = df.shape
         
         logger.info(f"✅ Tozalash yakunlandi. Yakuniy o'lcham: {df.shape}")
@@ -100,6 +206,195 @@ class DataCleaner:
         
         return df, metadata
     
+    def clean_raw_answers(self, df: pd.DataFrame, answer_key: List[str]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Xom javoblar faylini (Google Forms va h.k.) berilgan kalit bilan baholash
+        
+        Ism ustuni aqlli tahlil bilan topiladi, metadata ustunlari (timestamp, email, score...)
+        chiqarib tashlanadi, savol ustunlari esa qolgan ustunlarning oxirgi len(answer_key) tasi.
+        O'z kalit ustunlari bor Evalbee fayllari odatdagidek clean_data orqali tozalanadi.
+        
+        Args:
+            df: Raw DataFrame from uploaded file
+            answer_key: Har bir savol uchun to'g'ri javob (['A', 'C', ...])
+            
+        Returns:
+            Tuple of (cleaned_df, metadata_dict)
+        """
+        if self._evalbee_answer_columns(df):
+            return self.clean_data(df, rescore_raw_answers=True)
+        
+        metadata = {
+            'original_shape': df.shape,
+            'removed_columns': [],
+            'removed_rows': [],
+            'warnings': [],
+            'detected_question_columns': [],
+            'detected_name_columns': []
+        }
+        
+        logger.info(f"🔍 Xom javoblar fayli tahlili boshlandi. Asl o'lcham: {df.shape}, kalit: {len(answer_key)} ta")
+        
+        timings = metadata.setdefault('step_timings', {})
+        
+        # Xom javoblar matn bo'lgani uchun header qatorlarini qidirish bosqichi o'tkazib yuboriladi
+        with _timed(timings, 'remove_empty'):
+            df = self._remove_empty_rows_cols(df, metadata)
+        
+        with _timed(timings, 'column_detection'):
+            name_candidates = self._analyze_name_candidates(df)
+        name_column = None
+        if name_candidates:
+            best = max(name_candidates, key=lambda col: name_candidates[col]['score'])
+            if name_candidates[best]['score'] >= 20:
+                name_column = best
+                metadata['detected_name_columns'].append({
+                    'column': name_candidates[best]['column_name'],
+                    'reason': f"Aqlli tahlil: {name_candidates[best]['score']} ball",
+                    'confidence': name_candidates[best]['confidence']
+                })
+        
+        answer_candidates = [
+            col for col in df.columns
+            if col != name_column
+            and not self._removable_metadata_matcher.matches(str(col).strip().lower())
+        ]
+        if len(answer_candidates) < len(answer_key):
+            raise ValueError(f"Faylda {len(answer_candidates)} ta javob ustuni bor, kalitda esa {len(answer_key)} ta javob")
+        
+        answer_columns = answer_candidates[len(answer_candidates) - len(answer_key):]
+        answer_set = set(answer_columns)
+        
+        # Bitta vektorlashtirilgan solishtirishda baholash
+        with _timed(timings, 'scoring'):
+            scored, distractors = score_answers(df[answer_columns], answer_key)
+        metadata['scoring'] = 'raw_answers'
+        metadata['distractor_frequencies'] = distractors
+        
+        for col in answer_columns:
+            metadata['detected_question_columns'].append({
+                'column': str(col).strip(),
+                'reason': 'Xom javob kalit bilan baholandi',
+                'confidence': 'high'
+            })
+        for col in df.columns:
+            if col != name_column and col not in answer_set:
+                metadata['removed_columns'].append({
+                    'name': str(col).strip(),
+                    'reason': 'Savol ham, ism ham emas',
+                    'type': 'metadata'
+                })
+        
+        df = pd.concat([df[[name_column]], scored], axis=1) if name_column is not None else scored
+        metadata['preserved_participant_columns'] = [name_column] if name_column is not None else []
+        
+        with _timed(timings, 'convert_numeric'):
+            df = self._convert_to_numeric(df, metadata)
+        with _timed(timings, 'validate_binary'):
+            is_valid, validation_msg = self._validate_binary_data(df, metadata)
+        if not is_valid:
+            metadata['warnings'].append(validation_msg)
+        with _timed(timings, 'standardize_names'):
+            df = self._standardize_column_names(df, metadata)
+        
+        metadata['final_shape'] = df.shape
+        logger.info(f"✅ Xom javoblar baholandi. Yakuniy o'lcham: {df.shape}")
+        
+        return df, metadata
+    
+    def _is_question_name(self, col_name: str) -> bool:
+        """Ustun nomi savol ustuniga o'xshaydimi (faqat sarlavha bo'yicha, _classify_columns qoidalari)"""
+        name_lower = col_name.lower()
+        return bool(
+            re.match(NUMERIC_NAME_PATTERN, col_name)
+            or re.match(Q_NAME_PATTERN, col_name)
+            or self._question_matcher.matches(name_lower)
+            or re.match(ITEM_NAME_PATTERN, name_lower)
+            or (len(col_name) <= 5 and re.search(r'\d', col_name) is not None)
+        )
+    
+    def _detect_clean_matrix(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Allaqachon toza faylni arzon tekshiruv bilan aniqlash
+        
+        Toza fayl: bitta matnli ism ustuni, ixtiyoriy tartib raqami ustuni (1..n) va
+        kamida 2 ta savol nomli, bo'sh katak va 0/1 dan boshqa qiymati yo'q ustunlar.
+        Ism/tartib ustunlari savollardan oldin turishi kerak.
+        
+        Returns:
+            {'name_column', 'row_number_columns', 'question_columns'} yoki None
+        """
+        if len(df) < 2 or len(df.columns) < 3:
+            return None
+        
+        dtypes = df.dtypes
+        question_columns = [
+            col for col in df.columns
+            if (pd.api.types.is_numeric_dtype(dtypes[col]) or pd.api.types.is_bool_dtype(dtypes[col]))
+            and self._is_question_name(str(col).strip())
+        ]
+        leading = list(df.columns[:len(df.columns) - len(question_columns)])
+        if len(question_columns) < 2 or not 1 <= len(leading) <= 2 or list(df.columns[len(leading):]) != question_columns:
+            return None
+        
+        # Barcha savol kataklari bitta o'tishda tekshiriladi
+        block = df[question_columns].to_numpy(dtype=float, na_value=np.nan)
+        if not ((block == 0) | (block == 1)).all():
+            return None
+        
+        name_column = None
+        row_number_columns = []
+        for col in leading:
+            values = df[col]
+            if values.dtype == object and name_column is None:
+                texts = values.dropna()
+                if len(texts) < len(values) * 0.5 or pd.to_numeric(texts, errors='coerce').notna().mean() >= 0.5:
+                    return None
+                name_column = col
+            elif pd.api.types.is_integer_dtype(values.dtype) and (
+                    np.array_equal(values.to_numpy(), np.arange(1, len(values) + 1))
+                    or np.array_equal(values.to_numpy(), np.arange(len(values)))):
+                row_number_columns.append(col)
+            else:
+                return None
+        
+        if name_column is None:
+            return None
+        
+        return {
+            'name_column': name_column,
+            'row_number_columns': row_number_columns,
+            'question_columns': question_columns
+        }
+    
+    def _apply_clean_layout(self, df: pd.DataFrame, layout: Dict[str, Any], metadata: Dict) -> pd.DataFrame:
+        """Toza fayl uchun ustun rollarini evristikalarsiz belgilash (metadata shakli odatdagidek)"""
+        name_column = layout['name_column']
+        
+        metadata['file_format'] = 'standard'
+        metadata['fast_path'] = True
+        metadata['detected_name_columns'].append({
+            'column': str(name_column).strip(),
+            'reason': "Toza fayl: yagona matn ustuni",
+            'confidence': 'high'
+        })
+        for col in layout['question_columns']:
+            metadata['detected_question_columns'].append({
+                'column': str(col).strip(),
+                'reason': "Toza fayl: 0/1 ustun",
+                'confidence': 'high'
+            })
+        for col in layout['row_number_columns']:
+            metadata['removed_columns'].append({
+                'name': str(col).strip(),
+                'reason': 'Tartib raqami ustuni',
+                'type': 'metadata'
+            })
+        metadata['preserved_participant_columns'] = [name_column]
+        
+        logger.info(f"⚡ Toza fayl aniqlandi: {name_column} + {len(layout['question_columns'])} savol (tezkor yo'l)")
+        return df[[name_column] + layout['question_columns']]
+    
     def _remove_empty_rows_cols(self, df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
         """Bo'sh qatorlar va ustunlarni o'chirish"""
         initial_shape = df.shape
@@ -118,39 +413,83 @@ class DataCleaner:
         return df
     
     def _remove_metadata_rows(self, df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
-        """Header va metadata qatorlarini aniqlash va o'chirish"""
-        rows_to_remove = []
+        """
+        Header va metadata qatorlarini aniqlash va o'chirish
         
-        # Faqat birinchi 10 qatorni tekshirish
-        for idx in range(min(10, len(df))):
-            row = df.iloc[idx]
-            
-            try:
-                # Raqamga aylantirib ko'rish
-                numeric_count = pd.to_numeric(row, errors='coerce').notna().sum()
-                total_count = row.notna().sum()
-                
-                if total_count > 0:
-                    numeric_ratio = numeric_count / total_count
-                    
-                    # Agar 50% dan kam raqam bo'lsa - bu header qator
-                    if numeric_ratio < 0.5:
-                        rows_to_remove.append(idx)
-                        metadata['removed_rows'].append({
-                            'index': idx,
-                            'reason': 'Header/metadata qator (matn)',
-                            'sample': str(row.iloc[:3].tolist())[:50]
-                        })
-            except Exception as e:
-                logger.warning(f"Qator {idx} tahlilida xatolik: {e}")
-        
-        if rows_to_remove:
-            df = df.drop(rows_to_remove).reset_index(drop=True)
+        Yuqoridagi K ta qator bitta blok sifatida raqamga aylantiriladi (katta fayllarda
+        K o'sadi - uzun preamble ham topiladi). Pastdagi ma'lumotlarda raqamli bo'lgan
+        ustunlar (javoblar) aniqlanadi: shu ustunlarda raqami bor va matni yo'q qator
+        talabgor qatori hisoblanadi va hech qachon o'chirilmaydi - Familiya/Ism/Sinf kabi
+        matnli ustunlar ko'p bo'lsa ham. Preamble birinchi shunday qatorda tugaydi.
+        """
+        scan_rows = self._header_scan_rows(len(df))
+        if scan_rows == 0:
+            return df
+        
+        block = df.iloc[:scan_rows]
+        
+        try:
+            # Butun blokni bitta operatsiyada raqamga aylantirish
+            is_numeric = self._numeric_cell_mask(block)
+            # Pastdagi qatorlar namunasi: ko'pchilik qiymati raqam bo'lgan ustunlar - javob ustunlari
+            body = df.iloc[scan_rows:scan_rows + self.HEADER_SCAN_MAX_ROWS] if len(df) > scan_rows else block
+            body_filled = body.notna().to_numpy()
+            body_numeric = self._numeric_cell_mask(body)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                body_columns = (body_filled.sum(axis=0) > 0) & (
+                    body_numeric.sum(axis=0) / body_filled.sum(axis=0) >= 0.5)
+        except Exception as e:
+            logger.warning(f"Header qatorlar tahlilida xatolik: {e}")
+            return df
+        
+        filled = block.notna().to_numpy()
+        numeric_counts = is_numeric.sum(axis=1)
+        total_counts = filled.sum(axis=1)
+        
+        # Agar 50% dan kam raqam bo'lsa - bu header qator
+        with np.errstate(divide='ignore', invalid='ignore'):
+            numeric_ratios = numeric_counts / total_counts
+        is_header = (total_counts > 0) & (numeric_ratios < 0.5)
+        
+        # Javob ustunlarida raqam bor, matn yo'q - talabgor qatori (qisman to'ldirilgan bo'lsa ham)
+        if body_columns.any():
+            body_like = (is_numeric[:, body_columns].any(axis=1)
+                         & ~(filled & ~is_numeric)[:, body_columns].any(axis=1))
+            is_header &= ~body_like
+        
+        # Birinchi qatorlar mustaqil tekshiriladi, qolganlari faqat uzluksiz preamble bo'lsa
+        leading_block = np.logical_and.accumulate(is_header | (total_counts == 0))
+        positions = np.arange(scan_rows)
+        rows_to_remove = np.flatnonzero(is_header & ((positions < self.HEADER_SCAN_MIN_ROWS) | leading_block))
+        
+        for idx in rows_to_remove:
+            metadata['removed_rows'].append({
+                'index': int(idx),
+                'reason': 'Header/metadata qator (matn)',
+                'sample': str(block.iloc[idx, :3].tolist())[:50]
+            })
+        
+        if len(rows_to_remove):
+            df = df.drop(df.index[rows_to_remove]).reset_index(drop=True)
             logger.info(f"🗑️ {len(rows_to_remove)} ta metadata qator o'chirildi")
         
         return df
     
-    def _smart_column_detection(self, df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
+    @staticmethod
+    def _numeric_cell_mask(frame: pd.DataFrame) -> np.ndarray:
+        """Qaysi kataklar raqamga aylanadi (butun jadval bitta operatsiyada)"""
+        values = frame.to_numpy()
+        numeric = pd.to_numeric(pd.Series(values.ravel()), errors='coerce')
+        return numeric.notna().to_numpy().reshape(values.shape)
+    
+    def _header_scan_rows(self, n_rows: int) -> int:
+        """Header qidirish uchun tekshiriladigan qatorlar soni (fayl hajmiga qarab)"""
+        scan_rows = int(n_rows * self.HEADER_SCAN_FRACTION)
+        scan_rows = max(self.HEADER_SCAN_MIN_ROWS, min(scan_rows, self.HEADER_SCAN_MAX_ROWS))
+        return min(scan_rows, n_rows)
+    
+    def _smart_column_detection(self, df: pd.DataFrame, metadata: Dict,
+                                rescore_raw_answers: bool = False) -> pd.DataFrame:
         """
         SUPER SMART: Savol va ism-familiya ustunlarini aqlli ravishda aniqlash
         EVALBEE FORMAT: Q X Options, Q X Key, Q X Marks pattern'ini qo'llab-quvvatlaydi
@@ -167,14 +506,17 @@ class DataCleaner:
         if evalbee_format:
             logger.info("🎯 EVALBEE FORMAT ANIQLANDI!")
             metadata['file_format'] = 'evalbee'
-            return self._clean_evalbee_format(df, metadata)
+            return self._clean_evalbee_format(df, metadata, rescore_raw_answers)
         
         metadata['file_format'] = 'standard'
         logger.info("📋 STANDART FORMAT")
         
+        # Barcha ustunlar bir marta profillanadi (raqam/binary/unique/matn statistikasi)
+        profile = self._profile_columns(df)
+
         # AQLLI ISM-FAMILIYA ANIQLASH
         # Avval barcha ustunlarni tahlil qilib, eng mos kelganini topamiz
-        name_candidates = self._analyze_name_candidates(df)
+        name_candidates = self._analyze_name_candidates(df, profile)
         
         # Eng yuqori ball olgan ustunni topish
         best_name_column = None
@@ -216,11 +558,206 @@ class DataCleaner:
                 })
                 logger.warning(f"⚠️ ISM-FAMILIYA ANIQLANMADI. Birinchi ustun ishlatiladi: {df.columns[0]}")
         
-        # Endi barcha ustunlarni tahlil qilish
-        for col_idx, col in enumerate(df.columns):
+        # Endi barcha ustunlarni profil jadvali asosida tasniflash
+        for col, role, reason, confidence in self._classify_columns(profile, name_candidates,
+                                                                    detected_name_columns, best_name_column):
             col_name = str(col).strip()
-            col_name_lower = col_name.lower()
-            col_data = df[col]
+            
+            if role == 'question':
+                detected_question_columns.append(col)
+                metadata['detected_question_columns'].append({
+                    'column': col_name,
+                    'reason': reason,
+                    'confidence': confidence
+                })
+                logger.info(f"✅ {col_name} → SAVOL ({reason})")
+            else:
+                columns_to_remove.append(col)
+                metadata['removed_columns'].append({
+                    'name': col_name,
+                    'reason': reason,
+                    'type': role
+                })
+                logger.info(f"❌ {col_name} → O'CHIRILDI ({reason})")
+        
+        # O'chirish kerak bo'lgan ustunlarni o'chirish
+        if columns_to_remove:
+            df = df.drop(columns=columns_to_remove)
+            logger.info(f"🗑️ {len(columns_to_remove)} ta metadata ustun o'chirildi")
+        
+        # Metadata'ga saqlash
+        metadata['preserved_participant_columns'] = detected_name_columns
+        
+        logger.info(f"📊 JAMI: {len(detected_name_columns)} ism, "
+                   f"{len(detected_question_columns)} savol, "
+                   f"{len(columns_to_remove)} o'chirildi")
+        
+        return df
+    
+    def _apply_cleaning_profile(self, df: pd.DataFrame, profile: Dict, metadata: Dict) -> Optional[pd.DataFrame]:
+        """
+        Saqlangan profil bo'yicha ustunlarni ajratish
+        
+        Returns:
+            Tanlangan ustunlar DataFrame'i yoki None (profil bu faylga mos kelmasa)
+        """
+        columns_by_name = {}
+        for col in df.columns:
+            columns_by_name.setdefault(str(col).strip(), col)
+        
+        removed_by_name = {item['name']: item for item in profile.get('removed_columns', [])}
+        known_columns = set(profile.get('kept_columns', [])) | set(removed_by_name)
+        unknown_columns = [name for name in columns_by_name if name not in known_columns]
+        if unknown_columns:
+            logger.info(f"♻️ Profil mos kelmadi, yangi ustunlar: {unknown_columns[:3]}")
+            return None
+        
+        question_names = set(profile.get('question_columns', []))
+        kept_columns = [columns_by_name[name] for name in profile['kept_columns'] if name in columns_by_name]
+        name_columns = [columns_by_name[name] for name in profile.get('name_columns', []) if name in columns_by_name]
+        question_columns = [col for col in kept_columns if str(col).strip() in question_names]
+        if not question_columns:
+            return None
+        
+        for col in name_columns:
+            metadata['detected_name_columns'].append({
+                'column': str(col).strip(),
+                'reason': 'Saqlangan profil',
+                'confidence': 'high'
+            })
+        for col in question_columns:
+            metadata['detected_question_columns'].append({
+                'column': str(col).strip(),
+                'reason': 'Saqlangan profil',
+                'confidence': 'high'
+            })
+        for name in columns_by_name:
+            if name in removed_by_name:
+                metadata['removed_columns'].append(dict(removed_by_name[name]))
+        
+        metadata['preserved_participant_columns'] = name_columns
+        metadata['file_format'] = profile.get('file_format', 'standard')
+        metadata['cleaning_profile'] = 'cached'
+        
+        logger.info(f"♻️ Saqlangan profil ishlatildi: {len(name_columns)} ism, "
+                   f"{len(question_columns)} savol, {len(metadata['removed_columns'])} o'chirildi")
+        
+        return df[kept_columns]
+    
+    def _store_cleaning_profile(self, teacher_id: int, fingerprint: str, df: pd.DataFrame, metadata: Dict):
+        """Aniqlangan ustun rollarini profil sifatida saqlash"""
+        # Ism ustuni taxminiy (fallback) aniqlangan bo'lsa, xato profil saqlanmaydi
+        if any(item.get('confidence') == 'low' for item in metadata['detected_name_columns']):
+            return
+        
+        # Xom javoblardan baholangan ustunlar asl faylda yo'q - har safar qayta baholanadi
+        if metadata.get('scoring') == 'raw_answers':
+            return
+        
+        name_columns = [str(col).strip() for col in metadata.get('preserved_participant_columns', [])]
+        kept_columns = [str(col).strip() for col in df.columns]
+        question_columns = [name for name in kept_columns if name not in name_columns]
+        if not question_columns:
+            return
+        
+        try:
+            self.profile_manager.save_profile(teacher_id, fingerprint, {
+                'file_format': metadata.get('file_format', 'standard'),
+                'kept_columns': kept_columns,
+                'name_columns': name_columns,
+                'question_columns': question_columns,
+                'removed_columns': [
+                    {'name': item['name'], 'reason': item['reason'], 'type': item['type']}
+                    for item in metadata['removed_columns']
+                ]
+            })
+        except Exception as e:
+            logger.warning(f"Tozalash profilini saqlab bo'lmadi: {e}")
+    
+    def _profile_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Barcha ustunlarni bir o'tishda profillash
+        
+        Returns:
+            DataFrame (index = ustunlar): nom belgilari, to'ldirilganlik, raqam/binary
+            ulushlari, unique soni va matn ustunlari uchun uzunlik/bo'sh joy statistikasi
+        """
+        names = pd.Series([str(col).strip() for col in df.columns], index=df.columns, dtype=object)
+        names_lower = names.str.lower()
+        dtypes = df.dtypes
+        
+        profile = pd.DataFrame({
+            'name': names,
+            'name_lower': names_lower,
+            # Ustun nomi pattern'lari - barcha ustunlar uchun bir vaqtda
+            'name_is_number': names.str.match(NUMERIC_NAME_PATTERN),
+            'name_is_q': names.str.match(Q_NAME_PATTERN),
+            'name_is_item': names_lower.str.match(ITEM_NAME_PATTERN),
+            'name_short_digit': (names.str.len() <= 5) & names.str.contains(r'\d'),
+            # Ma'lumot turlari
+            'is_object': [dtype == 'object' for dtype in dtypes],
+            'is_text_dtype': [dtype == 'object' or dtype == 'string' for dtype in dtypes],
+            'is_string_dtype': [pd.api.types.is_string_dtype(dtype) for dtype in dtypes],
+        }, index=df.columns)
+        
+        profile['n_rows'] = len(df)
+        profile['non_null'] = df.notna().sum().values
+        profile['n_unique'] = df.nunique(dropna=True).values
+        
+        # Raqamga bir marta aylantirish - binary statistikasi shu jadvaldan olinadi
+        numeric = df.apply(_coerce_numeric)
+        profile['numeric_count'] = numeric.notna().sum().values
+        profile['binary_count'] = numeric.isin([0, 1]).sum().values
+        profile['has_zero'] = numeric.eq(0).any().values
+        profile['has_one'] = numeric.eq(1).any().values
+        
+        # Matn statistikasi faqat object ustunlar uchun
+        text_stats = self._text_profile(df.loc[:, profile['is_object'].values])
+        for stat in ['avg_length', 'space_ratio', 'numeric_text_ratio', 'first_value']:
+            profile[stat] = text_stats[stat].reindex(profile.index) if len(text_stats) else None
+        
+        return profile
+    
+    def _text_profile(self, block: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ustunlar blokining matn statistikasi (bo'sh bo'lmagan qiymatlar str ko'rinishida)
+        Barcha ustunlar bitta uzun jadvalga yoyilib, bir guruhlashda hisoblanadi
+        """
+        columns = ['avg_length', 'space_ratio', 'numeric_text_ratio', 'first_value']
+        if block.shape[1] == 0 or block.shape[0] == 0:
+            return pd.DataFrame(columns=columns)
+        
+        # object'ga o'tkazish - melt turli turdagi ustunlarni float'ga aylantirib yubormasligi uchun
+        long = block.astype(object).melt(var_name='__column__', value_name='__value__')
+        long = long[long['__value__'].notna()]
+        text = long['__value__'].astype(str)
+        
+        grouped = pd.DataFrame({
+            '__column__': long['__column__'].values,
+            'avg_length': text.str.len().values,
+            'space_ratio': text.str.contains(' ', regex=False).values,
+            'numeric_text_ratio': text.str.match(NUMERIC_TEXT_PATTERN).values,
+            'first_value': text.values,
+        }).groupby('__column__', sort=False)
+        
+        stats = grouped[['avg_length', 'space_ratio', 'numeric_text_ratio']].mean()
+        stats['first_value'] = grouped['first_value'].first()
+        return stats
+    
+    def _classify_columns(self, profile: pd.DataFrame, name_candidates: Dict,
+                          detected_name_columns: List, best_name_column) -> List[Tuple[Any, str, str, str]]:
+        """
+        Profil jadvali asosida ustunlarni tasniflash
+        
+        Returns:
+            [(ustun, rol, sabab, ishonch)] - rol: 'question' yoki o'chirish turi
+            ('duplicate_name_column', 'metadata', 'unknown_metadata')
+        """
+        decisions = []
+        
+        for col, p in zip(profile.index, profile.itertuples(index=False)):
+            col_name = p.name
+            col_name_lower = p.name_lower
             
             # ISM-FAMILIYA ustuni allaqachon aniqlangan
             if col in detected_name_columns:
@@ -229,223 +766,172 @@ class DataCleaner:
             # Duplikat ism-familiya ustunlarini o'chirish
             if col in name_candidates and name_candidates[col]['score'] >= 40:
                 # Bu ham ism-familiya bo'lishi mumkin, lekin ikkinchisi
-                columns_to_remove.append(col)
-                metadata['removed_columns'].append({
-                    'name': col_name,
-                    'reason': f'Ikkinchi ism ustuni (birinchisi: {name_candidates[best_name_column]["column_name"]})',
-                    'type': 'duplicate_name_column'
-                })
-                logger.info(f"❌ {col_name} → O'CHIRILDI (duplikat ism ustuni)")
+                decisions.append((col, 'duplicate_name_column',
+                                  f'Ikkinchi ism ustuni (birinchisi: {name_candidates[best_name_column]["column_name"]})',
+                                  None))
                 continue
             
             # ===========================================
             # 2. SAVOL USTUNLARINI ANIQLASH
             # ===========================================
             
-            is_question_column = False
-            detection_reason = ""
+            detection_reason = None
             
             # 2.1: Raqam bilan boshlanadi (1, 2, 3, ...)
-            if re.match(r'^\d+$', col_name):
-                is_question_column = True
+            if p.name_is_number:
                 detection_reason = f"Raqam bilan boshlangan: {col_name}"
             
             # 2.2: Q yoki q bilan boshlanadi (Q1, q2, Q_1, ...)
-            elif re.match(r'^[Qq][\s_-]?\d+', col_name):
-                is_question_column = True
+            elif p.name_is_q:
                 detection_reason = f"Q/q pattern: {col_name}"
             
             # 2.3: Savol, Question, Item keywords
-            elif any(keyword in col_name_lower for keyword in self.question_keywords):
-                is_question_column = True
-                for keyword in self.question_keywords:
-                    if keyword in col_name_lower:
-                        detection_reason = f"Keyword: {keyword}"
-                        break
+            elif (keyword := self._question_matcher.find(col_name_lower)) is not None:
+                detection_reason = f"Keyword: {keyword}"
             
             # 2.4: Item pattern (Item1, Item_2, ...)
-            elif re.match(r'^item[\s_-]?\d+', col_name_lower):
-                is_question_column = True
+            elif p.name_is_item:
                 detection_reason = f"Item pattern: {col_name}"
             
             # 2.5: Column nomi juda qisqa va boshida raqam bor
-            elif len(col_name) <= 5 and any(char.isdigit() for char in col_name):
-                is_question_column = True
+            elif p.name_short_digit:
                 detection_reason = f"Qisqa nom + raqam: {col_name}"
             
-            # 2.6: REMOVED - bu check fallback'da bajariladi (strong evidence bilan)
-            
-            if is_question_column:
-                detected_question_columns.append(col)
-                metadata['detected_question_columns'].append({
-                    'column': col_name,
-                    'reason': detection_reason,
-                    'confidence': 'medium' if '0/1' in detection_reason else 'high'
-                })
-                logger.info(f"✅ {col_name} → SAVOL ({detection_reason})")
+            if detection_reason is not None:
+                decisions.append((col, 'question', detection_reason, 'high'))
                 continue
             
             # ===========================================
             # 3. O'CHIRISH KERAK BO'LGAN USTUNLAR
             # ===========================================
             
-            should_remove = False
-            remove_reason = ""
+            remove_reason = None
             
             # 3.1: Removable metadata keywords
-            for keyword in self.removable_metadata_keywords:
-                if keyword in col_name_lower:
-                    should_remove = True
-                    remove_reason = f"Metadata keyword: {keyword}"
-                    break
+            keyword = self._removable_metadata_matcher.find(col_name_lower)
+            if keyword is not None:
+                remove_reason = f"Metadata keyword: {keyword}"
             
             # 3.2: Matn ustunlari (email, telegram, va h.k.)
-            if not should_remove and col_data.dtype == 'object':
-                non_null = col_data.dropna()
-                if len(non_null) > 0:
-                    sample = str(non_null.iloc[0]).lower()
-                    
-                    # Email, @ belgisi, va h.k.
-                    if '@' in sample or 'email' in sample:
-                        should_remove = True
-                        remove_reason = "Email/telegram ma'lumot"
-                    
-                    # Juda unique qiymatlar (ID, code, va h.k.)
-                    elif len(non_null.unique()) / len(non_null) > 0.95:
-                        if any(id_kw in col_name_lower for id_kw in ['id', 'code', 'key', 'uuid']):
-                            should_remove = True
-                            remove_reason = "ID ustuni (yuqori uniqueness)"
-            
-            if should_remove:
-                columns_to_remove.append(col)
-                metadata['removed_columns'].append({
-                    'name': col_name,
-                    'reason': remove_reason,
-                    'type': 'metadata'
-                })
-                logger.info(f"❌ {col_name} → O'CHIRILDI ({remove_reason})")
-            else:
-                # FALLBACK: Agar hech narsa aniqlanmagan bo'lsa
-                # FAQAT strong numeric evidence bo'lsa savol deb topiladi
-                # Aks holda, o'chiriladi (metadata deb hisoblanadi)
+            if remove_reason is None and p.is_object and p.non_null > 0:
+                sample = str(p.first_value).lower()
                 
-                # QATTIQ binary validation - FAQAT 0 va 1 qabul qilinadi
-                has_strong_numeric_evidence = False
-                try:
-                    # Raqamga aylantirish
-                    numeric_data = pd.to_numeric(col_data, errors='coerce')
-                    non_null_data = numeric_data.dropna()
-                    
-                    if len(non_null_data) > 0:
-                        # FAQAT 0 va 1 qiymatlarini tekshirish
-                        is_binary = np.isin(non_null_data.values, [0, 1, 0.0, 1.0]).all()
-                        
-                        if is_binary:
-                            # Kamida 0 va 1 ikkalasi ham mavjud bo'lishi kerak
-                            unique_vals = non_null_data.unique()
-                            has_zero = any(v in [0, 0.0] for v in unique_vals)
-                            has_one = any(v in [1, 1.0] for v in unique_vals)
-                            
-                            if has_zero and has_one:
-                                has_strong_numeric_evidence = True
-                                logger.info(f"🔍 {col_name} → BINARY VALID: faqat 0 va 1 qiymatlari")
-                            else:
-                                logger.info(f"⚠️ {col_name} → Faqat {unique_vals} qiymatlari (0 va 1 kerak)")
-                        else:
-                            # 0 va 1 dan boshqa qiymatlar bor
-                            invalid_values = non_null_data[~np.isin(non_null_data.values, [0, 1, 0.0, 1.0])]
-                            logger.info(f"❌ {col_name} → 0/1 dan tashqari qiymatlar: {invalid_values.unique()[:5]}")
-                except Exception as e:
-                    logger.warning(f"Binary validation xatolik {col_name}: {e}")
+                # Email, @ belgisi, va h.k.
+                if '@' in sample or 'email' in sample:
+                    remove_reason = "Email/telegram ma'lumot"
                 
-                if has_strong_numeric_evidence:
-                    # Strong evidence bor - savol ustuni
-                    detected_question_columns.append(col)
-                    metadata['detected_question_columns'].append({
-                        'column': col_name,
-                        'reason': 'Strong numeric evidence (binary pattern)',
-                        'confidence': 'medium'
-                    })
-                    logger.info(f"✅ {col_name} → SAVOL (strong numeric evidence)")
+                # Juda unique qiymatlar (ID, code, va h.k.)
+                elif p.n_unique / p.non_null > 0.95:
+                    if self._unique_id_matcher.matches(col_name_lower):
+                        remove_reason = "ID ustuni (yuqori uniqueness)"
+            
+            if remove_reason is not None:
+                decisions.append((col, 'metadata', remove_reason, None))
+                continue
+            
+            # FALLBACK: Agar hech narsa aniqlanmagan bo'lsa
+            # FAQAT strong numeric evidence bo'lsa savol deb topiladi
+            # QATTIQ binary validation - FAQAT 0 va 1 qabul qilinadi (kamida ikkalasi ham bo'lishi kerak)
+            has_strong_numeric_evidence = False
+            if p.numeric_count > 0:
+                if p.binary_count == p.numeric_count:
+                    if p.has_zero and p.has_one:
+                        has_strong_numeric_evidence = True
+                        logger.info(f"🔍 {col_name} → BINARY VALID: faqat 0 va 1 qiymatlari")
+                    else:
+                        logger.info(f"⚠️ {col_name} → Faqat {'0' if p.has_zero else '1'} qiymatlari (0 va 1 kerak)")
                 else:
-                    # Evidence yo'q - metadata deb hisoblash va o'chirish
-                    columns_to_remove.append(col)
-                    metadata['removed_columns'].append({
-                        'name': col_name,
-                        'reason': 'Noma\'lum ustun (no keyword match, no numeric evidence)',
-                        'type': 'unknown_metadata'
-                    })
-                    logger.info(f"❌ {col_name} → O'CHIRILDI (noma'lum ustun)")
-        
-        # O'chirish kerak bo'lgan ustunlarni o'chirish
-        if columns_to_remove:
-            df = df.drop(columns=columns_to_remove)
-            logger.info(f"🗑️ {len(columns_to_remove)} ta metadata ustun o'chirildi")
-        
-        # Metadata'ga saqlash
-        metadata['preserved_participant_columns'] = detected_name_columns
-        
-        logger.info(f"📊 JAMI: {len(detected_name_columns)} ism, "
-                   f"{len(detected_question_columns)} savol, "
-                   f"{len(columns_to_remove)} o'chirildi")
+                    logger.info(f"❌ {col_name} → 0/1 dan tashqari qiymatlar: "
+                                f"{p.numeric_count - p.binary_count} ta")
+            
+            if has_strong_numeric_evidence:
+                decisions.append((col, 'question', 'Strong numeric evidence (binary pattern)', 'medium'))
+            else:
+                # Evidence yo'q - metadata deb hisoblash va o'chirish
+                decisions.append((col, 'unknown_metadata',
+                                  'Noma\'lum ustun (no keyword match, no numeric evidence)', None))
         
-        return df
+        return decisions
     
     def _convert_to_numeric(self, df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
-        """Savol ustunlarini raqamga aylantirish, ism ustunlarini saqlash"""
+        """
+        Savol ustunlarini raqamga aylantirish, ism ustunlarini saqlash
+        
+        Bitta o'tishda: bo'sh qiymatlar 0 ga almashtiriladi, 0/1 tekshiruvi bajariladi
+        (natija metadata['binary_check'] va metadata['invalid_cells'] ga yoziladi) va
+        faqat 0/1 dan iborat ustunlar nullable Int8 turida saqlanadi. 0/1 dan boshqa
+        qiymatli ustunlar float bo'lib qoladi - ular hisobotda ko'rsatiladi.
+        """
         preserved_columns = metadata.get('preserved_participant_columns', [])
+        response_positions = [idx for idx, col in enumerate(df.columns) if col not in preserved_columns]
+        response_columns = [df.columns[idx] for idx in response_positions]
         
-        # Ism ustunlari ma'lumotini saqlash
-        preserved_data = {}
-        for col in preserved_columns:
-            if col in df.columns and df[col].dtype == 'object':
-                preserved_data[col] = df[col].copy()
-                logger.info(f"💾 Saqlash: {col}")
+        metadata['binary_check'] = {'total': 0, 'binary': 0, 'ratio': 0.0}
+        metadata['invalid_cells'] = []
+        metadata['invalid_cell_count'] = 0
         
-        # Barcha ustunlarni raqamga aylantirish
-        for col in df.columns:
-            if col not in preserved_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        if not response_columns:
+            return df
         
-        # Ism ustunlarini qayta tiklash
-        for col, data in preserved_data.items():
-            df[col] = data
-            logger.info(f"♻️ Tiklash: {col}")
+        # Barcha javob ustunlari bitta float matritsaga
+        values = df.iloc[:, response_positions].apply(_coerce_numeric).to_numpy(dtype=float)
         
         # Bo'sh qiymatlarni 0 ga almashtirish (faqat javob ustunlarida)
-        response_columns = [col for col in df.columns if col not in preserved_columns]
-        if response_columns:
-            nan_count = df[response_columns].isna().sum().sum()
-            if nan_count > 0:
-                metadata['warnings'].append(f"{nan_count} ta bo'sh qiymat 0 ga almashtirildi")
-                df[response_columns] = df[response_columns].fillna(0)
-                logger.info(f"🔢 {nan_count} ta bo'sh qiymat 0 ga almashtirildi")
+        nan_mask = np.isnan(values)
+        nan_count = int(nan_mask.sum())
+        if nan_count > 0:
+            values[nan_mask] = 0
+            metadata['warnings'].append(f"{nan_count} ta bo'sh qiymat 0 ga almashtirildi")
+            logger.info(f"🔢 {nan_count} ta bo'sh qiymat 0 ga almashtirildi")
+        
+        # 0/1 tekshiruvi - shu matritsaning o'zida
+        binary_mask = (values == 0) | (values == 1)
+        binary_count = int(binary_mask.sum())
+        metadata['binary_check'] = {
+            'total': int(values.size),
+            'binary': binary_count,
+            'ratio': binary_count / values.size if values.size > 0 else 0
+        }
+        
+        invalid_rows, invalid_cols = np.nonzero(~binary_mask)
+        metadata['invalid_cell_count'] = int(len(invalid_rows))
+        metadata['invalid_cells'] = [
+            {'row': int(row), 'column': str(response_columns[col]), 'value': float(values[row, col])}
+            for row, col in zip(invalid_rows[:self.MAX_REPORTED_INVALID_CELLS],
+                                invalid_cols[:self.MAX_REPORTED_INVALID_CELLS])
+        ]
+        
+        # Toza 0/1 ustunlar Int8, qolganlari float (8 marta kam xotira)
+        binary_columns = binary_mask.all(axis=0)
+        df = df.copy()
+        for idx, position in enumerate(response_positions):
+            if binary_columns[idx]:
+                df.isetitem(position, pd.array(values[:, idx].astype(np.int8), dtype='Int8'))
+            else:
+                df.isetitem(position, values[:, idx])
         
         return df
     
     def _validate_binary_data(self, df: pd.DataFrame, metadata: Dict) -> Tuple[bool, str]:
-        """Binary data (0/1) ekanligini tekshirish"""
+        """Binary data (0/1) ekanligini tekshirish (_convert_to_numeric natijasi asosida)"""
         preserved_columns = metadata.get('preserved_participant_columns', [])
         response_columns = [col for col in df.columns if col not in preserved_columns]
         
         if not response_columns:
             return False, "❌ Xatolik: Javob ustunlari topilmadi"
         
-        response_data = df[response_columns]
-        total_values = response_data.size
-        binary_values = np.isin(response_data.values, [0, 1, 0.0, 1.0]).sum()
-        binary_ratio = binary_values / total_values if total_values > 0 else 0
+        binary_ratio = metadata.get('binary_check', {}).get('ratio', 0)
         
         if binary_ratio < self.min_binary_ratio:
-            # Qaysi ustumlarda muammo borligini aniqlash
+            # Qaysi ustunlarda muammo borligini aniqlash (saqlangan noto'g'ri kataklar bo'yicha)
+            invalid_by_column = {}
+            for cell in metadata.get('invalid_cells', []):
+                invalid_by_column.setdefault(cell['column'], []).append(cell)
+            
             problem_columns = []
-            for col in response_columns:
-                col_data = pd.to_numeric(df[col], errors='coerce').dropna()
-                if len(col_data) > 0:
-                    is_binary = np.isin(col_data.values, [0, 1, 0.0, 1.0]).all()
-                    if not is_binary:
-                        invalid_vals = col_data[~np.isin(col_data.values, [0, 1, 0.0, 1.0])].unique()[:3]
-                        problem_columns.append(f"{col}: {invalid_vals}")
+            for col, cells in invalid_by_column.items():
+                examples = ", ".join(f"{cell['row'] + 1}-qator: {cell['value']:g}" for cell in cells[:3])
+                problem_columns.append(f"{col}: {examples}")
             
             problem_details = "\n   • ".join(problem_columns[:5]) if problem_columns else "Noma'lum"
             
@@ -535,6 +1021,11 @@ class DataCleaner:
         report.append(f"📏 Asl o'lcham: {orig_rows} qator × {orig_cols} ustun")
         report.append(f"📏 Yakuniy: {final_rows} qator × {final_cols} ustun\n")
         
+        if metadata.get('cleaning_profile') == 'cached':
+            report.append("♻️ Oldingi yuklashdagi tozalash profili ishlatildi\n")
+        elif metadata.get('fast_path'):
+            report.append("⚡ Fayl allaqachon toza - faqat tekshiruvdan o'tkazildi\n")
+        
         # Topilgan ustunlar
         name_cols = metadata.get('detected_name_columns', [])
         question_cols = metadata.get('detected_question_columns', [])
@@ -643,6 +1134,41 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
 """
         return explanation
     
+    def infer_schema(self, sample: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Sarlavha va birinchi qatorlar bo'yicha to'liq o'qishda kerak bo'ladigan ustunlarni aniqlash
+
+        Evalbee formatida faqat ism nomzodlari va savol ustunlari kerak: Options/Key
+        juftliklari bo'lsa - ular va Marks (farqlarni tekshirish uchun), aks holda faqat
+        Marks. Standart formatda ustun rollari ma'lumotga bog'liq - barcha ustunlar o'qiladi.
+
+        Args:
+            sample: Sarlavha + bir nechta qator (ustunlar fayldagi tartibda)
+
+        Returns:
+            {'file_format': 'evalbee'/'standard', 'usecols': ustun pozitsiyalari yoki None,
+             'skipped_columns': o'qilmaydigan ustunlar nomlari}
+        """
+        if not self._detect_evalbee_format(sample):
+            return {'file_format': 'standard', 'usecols': None, 'skipped_columns': []}
+
+        answer_columns = self._evalbee_answer_columns(sample)
+        question_columns = {col for pair in answer_columns.values() for col in pair}
+
+        usecols = []
+        skipped = []
+        for position, col in enumerate(sample.columns):
+            col_name = str(col).strip()
+            if (col in question_columns
+                    or EVALBEE_MARKS_RE.match(col_name)
+                    or self._evalbee_name_matcher.matches(col_name.lower())):
+                usecols.append(position)
+            else:
+                skipped.append(col_name)
+
+        logger.info(f"🗂️ Sxema: Evalbee, {len(usecols)} ta ustun o'qiladi, {len(skipped)} tasi o'tkazib yuboriladi")
+        return {'file_format': 'evalbee', 'usecols': usecols, 'skipped_columns': skipped}
+
     def _detect_evalbee_format(self, df: pd.DataFrame) -> bool:
         """
         Evalbee formatini aniqlash
@@ -651,88 +1177,105 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
         - Q X Key  
         - Q X Marks
         """
-        import re
-        
-        # "Q X Marks" pattern'larini qidirish
-        marks_columns = []
-        for col in df.columns:
-            col_name = str(col).strip()
-            # Pattern: Q 1 Marks, Q 2 Marks, va h.k.
-            if re.match(r'^Q\s+\d+\s+Marks$', col_name, re.IGNORECASE):
-                marks_columns.append(col_name)
+        # "Q X Marks" pattern'larini qidirish (Pattern: Q 1 Marks, Q 2 Marks, va h.k.)
+        marks_columns = [col for col in df.columns if EVALBEE_MARKS_RE.match(str(col).strip())]
         
         # Agar kamida 3 ta "Q X Marks" ustuni bo'lsa, bu Evalbee formati
         if len(marks_columns) >= 3:
             logger.info(f"🎯 {len(marks_columns)} ta 'Q X Marks' ustuni topildi")
             return True
         
+        # Marks ustunlarisiz xom javoblar fayli (Q X Options + Q X Key)
+        answer_columns = self._evalbee_answer_columns(df)
+        if answer_columns:
+            logger.info(f"🎯 {len(answer_columns)} ta 'Q X Options' + 'Q X Key' juftligi topildi")
+            return True
+        
         return False
     
-    def _clean_evalbee_format(self, df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
+    def _evalbee_answer_columns(self, df: pd.DataFrame) -> Dict[int, Tuple[Any, Any]]:
+        """
+        Evalbee xom javob ustunlari: {savol_raqami: (Options ustuni, Key ustuni)}
+        
+        Kamida 3 ta savolda ikkala ustun ham bo'lmasa bo'sh lug'at qaytariladi.
+        """
+        options = {}
+        keys = {}
+        for col in df.columns:
+            col_name = str(col).strip()
+            match = EVALBEE_OPTIONS_RE.match(col_name)
+            if match:
+                options.setdefault(int(match.group(1)), col)
+                continue
+            match = EVALBEE_KEY_RE.match(col_name)
+            if match:
+                keys.setdefault(int(match.group(1)), col)
+        
+        pairs = {num: (col, keys[num]) for num, col in options.items() if num in keys}
+        return pairs if len(pairs) >= 3 else {}
+    
+    def _clean_evalbee_format(self, df: pd.DataFrame, metadata: Dict,
+                              rescore_raw_answers: bool = False) -> pd.DataFrame:
         """
         Evalbee formatini tozalash
-        - Faqat "Q X Marks" ustunlarini saqlash
+        - Faqat "Q X Marks" ustunlarini saqlash (rescore_raw_answers yoki Marks yo'q bo'lsa -
+          Options/Key bo'yicha qayta baholash)
         - "Q X Options" va "Q X Key" ustunlarini o'chirish
         - Metadata ustunlarini o'chirish
         """
-        import re
-        
         columns_to_keep = []
         columns_to_remove = []
         detected_name_columns = []
         detected_question_columns = []
         
         # 1. ISM-FAMILIYA USTUNINI TOPISH
-        # "Name" ustunini qidirish - AQLLI TAHLIL
-        # Prioritet: 'name' > 'student' > 'talabgor' > 'ism' > 'exam'
-        # 'exam' oxirgi o'rinda chunki ko'pincha test nomi emas, talabgor ismi kerak
-        name_keywords_priority = [
-            ['name', 'full name', 'fullname'],  # Eng yuqori prioritet
-            ['student', 'student name', 'student_name'],
-            ['talabgor', 'talabgor_ismi'],
-            ['ism', 'familiya', 'fio'],
-            ['exam']  # Eng past prioritet
-        ]
+        # "Name" ustunini qidirish - AQLLI TAHLIL (EVALBEE_NAME_KEYWORD_GROUPS prioriteti bo'yicha)
         
-        # Barcha nomzod ustunlarni topish
-        name_column_candidates = []
+        # Barcha nomzod ustunlarni topish (ustun -> prioritet guruhi)
+        candidate_priority = {}
         for col in df.columns:
-            col_name = str(col).strip()
-            col_name_lower = col_name.lower()
-            
             # Qaysi prioritet guruhiga tegishli ekanligini aniqlash
-            for priority_idx, keywords in enumerate(name_keywords_priority):
-                if any(keyword in col_name_lower for keyword in keywords):
-                    # Ustun ma'lumotlarini tahlil qilish
-                    col_data = df[col].dropna()
-                    if len(col_data) > 0:
-                        # Unique ratio - haqiqiy ismlar unique bo'lishi kerak
-                        unique_ratio = len(col_data.unique()) / len(col_data)
-                        # O'rtacha uzunlik - ismlar uzunroq bo'lishi kerak
-                        avg_length = col_data.astype(str).str.len().mean()
-                        # Bo'sh joy bor - ism va familiya bo'shlikda ajratilgan
-                        has_spaces = col_data.astype(str).str.contains(' ').sum() / len(col_data)
-                        
-                        # Ball hisobla
-                        score = 0
-                        score += unique_ratio * 50  # Unique bo'lsa +50
-                        score += min(avg_length, 30)  # Uzun bo'lsa +30
-                        score += has_spaces * 30  # Bo'sh joy bo'lsa +30
-                        score -= priority_idx * 10  # Past prioritet -10
-                        
-                        name_column_candidates.append({
-                            'col': col,
-                            'col_name': col_name,
-                            'priority': priority_idx,
-                            'unique_ratio': unique_ratio,
-                            'avg_length': avg_length,
-                            'has_spaces': has_spaces,
-                            'score': score
-                        })
-                        logger.info(f"🔍 Nomzod: {col_name} - Score: {score:.1f} "
-                                  f"(unique: {unique_ratio:.1%}, len: {avg_length:.1f}, "
-                                  f"spaces: {has_spaces:.1%})")
-                    break
+            keyword = self._evalbee_name_matcher.find(str(col).strip().lower())
+            if keyword is not None:
+                candidate_priority[col] = self._evalbee_name_group[keyword]
+        
+        # Nomzod ustunlar statistikasi bitta o'tishda hisoblanadi
+        candidate_columns = list(candidate_priority)
+        candidate_stats = self._text_profile(df[candidate_columns])
+        candidate_unique = df[candidate_columns].nunique(dropna=True)
+        candidate_non_null = df[candidate_columns].notna().sum()
+        
+        name_column_candidates = []
+        for col, priority_idx in candidate_priority.items():
+            col_name = str(col).strip()
+            # Ustun ma'lumotlarini tahlil qilish
+            if candidate_non_null[col] > 0:
+                # Unique ratio - haqiqiy ismlar unique bo'lishi kerak
+                unique_ratio = candidate_unique[col] / candidate_non_null[col]
+                # O'rtacha uzunlik - ismlar uzunroq bo'lishi kerak
+                avg_length = candidate_stats.at[col, 'avg_length']
+                # Bo'sh joy bor - ism va familiya bo'shlikda ajratilgan
+                has_spaces = candidate_stats.at[col, 'space_ratio']
+                
+                # Ball hisobla
+                score = 0
+                score += unique_ratio * 50  # Unique bo'lsa +50
+                score += min(avg_length, 30)  # Uzun bo'lsa +30
+                score += has_spaces * 30  # Bo'sh joy bo'lsa +30
+                score -= priority_idx * 10  # Past prioritet -10
+                
+                name_column_candidates.append({
+                    'col': col,
+                    'col_name': col_name,
+                    'priority': priority_idx,
+                    'unique_ratio': unique_ratio,
+                    'avg_length': avg_length,
+                    'has_spaces': has_spaces,
+                    'score': score
+                })
+                logger.info(f"🔍 Nomzod: {col_name} - Score: {score:.1f} "
+                          f"(unique: {unique_ratio:.1%}, len: {avg_length:.1f}, "
+                          f"spaces: {has_spaces:.1%})")
         
         # Eng yuqori ball olgan ustunni tanlash
         if name_column_candidates:
@@ -755,12 +1298,50 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
         else:
             logger.warning("⚠️ Ism ustuni topilmadi!")
         
-        # 2. "Q X MARKS" USTUNLARINI SAQLASH
-        for col in df.columns:
+        # 2. SAVOL USTUNLARI
+        # Evalbee hisoblagan Marks asosiy natija. Options/Key ustunlari distraktorlar tahlili uchun
+        # baholanadi; Marks o'rniga faqat o'qituvchi so'raganda yoki Marks ustunlari bo'lmasa ishlatiladi
+        answer_columns = self._evalbee_answer_columns(df)
+        scored = None
+        if answer_columns:
+            question_names = [f"Q {num} Marks" for num in answer_columns]
+            raw_scored, distractors = score_answers(
+                df[[options_col for options_col, _ in answer_columns.values()]],
+                df[[key_col for _, key_col in answer_columns.values()]],
+                question_names=question_names
+            )
+            metadata['distractor_frequencies'] = distractors
+            
+            marks_by_name = {str(col).strip().lower(): col for col in df.columns if EVALBEE_MARKS_RE.match(str(col).strip())}
+            compared = [(marks_by_name[name.lower()], name) for name in question_names if name.lower() in marks_by_name]
+            
+            if rescore_raw_answers or not marks_by_name:
+                scored = raw_scored
+                metadata['scoring'] = 'raw_answers'
+                for col_name in question_names:
+                    detected_question_columns.append(col_name)
+                    metadata['detected_question_columns'].append({
+                        'column': col_name,
+                        'reason': 'Evalbee Options/Key (xom javob kalit bilan baholandi)',
+                        'confidence': 'high'
+                    })
+                logger.info(f"✅ {len(question_names)} ta savol xom javoblardan baholandi (Evalbee Options/Key)")
+            
+            # Marks va kalit bo'yicha baholash farqlarini qayd etish
+            if compared:
+                marks = df[[col for col, _ in compared]].apply(_coerce_numeric).to_numpy(dtype=float)
+                mismatches = int((marks != raw_scored[[name for _, name in compared]].to_numpy(dtype=float)).sum())
+                if mismatches:
+                    kept = "kalit bo'yicha baholandi" if scored is not None else "Marks saqlandi"
+                    metadata['warnings'].append(
+                        f"{mismatches} ta katakda Marks qiymati kalit bo'yicha baholashdan farq qiladi ({kept})")
+                    logger.info(f"⚠️ Marks va kalit bo'yicha baholash {mismatches} ta katakda farq qiladi")
+        
+        for col in df.columns if scored is None else []:
             col_name = str(col).strip()
             
             # Pattern: Q 1 Marks, Q 2 Marks, va h.k.
-            if re.match(r'^Q\s+\d+\s+Marks$', col_name, re.IGNORECASE):
+            if EVALBEE_MARKS_RE.match(col_name):
                 columns_to_keep.append(col)
                 detected_question_columns.append(col)
                 metadata['detected_question_columns'].append({
@@ -771,16 +1352,21 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
                 logger.info(f"✅ {col_name} → SAVOL (Evalbee Marks)")
         
         # 3. QOLGAN BARCHA USTUNLARNI O'CHIRISH
+        keep_set = set(columns_to_keep)
         for col in df.columns:
-            if col not in columns_to_keep:
+            if col not in keep_set:
                 columns_to_remove.append(col)
                 col_name = str(col).strip()
                 
                 # Pattern tekshirish
-                if re.match(r'^Q\s+\d+\s+Options$', col_name, re.IGNORECASE):
-                    reason = 'Evalbee Options column (kerak emas)'
-                elif re.match(r'^Q\s+\d+\s+Key$', col_name, re.IGNORECASE):
-                    reason = 'Evalbee Key column (kerak emas)'
+                if EVALBEE_OPTIONS_RE.match(col_name):
+                    reason = ('Evalbee Options column (kalit bilan baholandi)' if scored is not None
+                              else 'Evalbee Options column (kerak emas)')
+                elif EVALBEE_KEY_RE.match(col_name):
+                    reason = ('Evalbee Key column (kalit bilan baholandi)' if scored is not None
+                              else 'Evalbee Key column (kerak emas)')
+                elif scored is not None and EVALBEE_MARKS_RE.match(col_name):
+                    reason = 'Evalbee Marks column (xom javoblardan qayta hisoblandi)'
                 else:
                     reason = 'Metadata ustun (kerak emas)'
                 
@@ -793,6 +1379,8 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
         
         # 4. FAQAT KERAKLI USTUNLARNI SAQLASH
         df = df[columns_to_keep]
+        if scored is not None:
+            df = pd.concat([df, scored], axis=1)
         
         logger.info(f"🗑️ {len(columns_to_remove)} ta Evalbee metadata ustuni o'chirildi")
         logger.info(f"📊 JAMI: {len(detected_name_columns)} ism, {len(detected_question_columns)} savol")
@@ -802,38 +1390,35 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
         
         return df
     
-    def _analyze_name_candidates(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    def _analyze_name_candidates(self, df: pd.DataFrame, profile: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
         """
         Har bir ustunni tahlil qilib, ism-familiya ustuni bo'lish ehtimolini baholaydi
         Returns: {column_name: {score: int, reasons: [], confidence: str}}
         """
-        import re
+        if profile is None:
+            profile = self._profile_columns(df)
         
         candidates = {}
         
-        for col_idx, col in enumerate(df.columns):
-            col_name = str(col).strip()
-            col_name_lower = col_name.lower()
-            col_data = df[col]
+        for col_idx, (col, p) in enumerate(zip(profile.index, profile.itertuples(index=False))):
+            col_name = p.name
+            col_name_lower = p.name_lower
             
             score = 0
             reasons = []
             
             # 1. USTUN NOMI TAHLILI (+30 ball)
-            name_keyword_found = False
-            for keyword in self.participant_name_keywords:
-                if keyword in col_name_lower:
-                    score += 30
-                    reasons.append(f"Ustun nomida '{keyword}' topildi (+30)")
-                    name_keyword_found = True
-                    break
+            keyword = self._participant_name_matcher.find(col_name_lower)
+            if keyword is not None:
+                score += 30
+                reasons.append(f"Ustun nomida '{keyword}' topildi (+30)")
             
             # 2. MA'LUMOT TURI TAHLILI (+20 ball)
             # String yoki object turi - ism-familiya bo'lishi mumkin
-            if col_data.dtype == 'object' or col_data.dtype == 'string':
+            if p.is_text_dtype:
                 score += 20
                 reasons.append("String ma'lumot turi (+20)")
-            elif pd.api.types.is_string_dtype(col_data):
+            elif p.is_string_dtype:
                 score += 20
                 reasons.append("Matn ma'lumotlari (+20)")
             else:
@@ -843,9 +1428,8 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
             
             # 3. UNIQUE QIYMATLAR TAHLILI (+20 ball)
             # Ism-familiyalar odatda unique bo'ladi
-            non_null_data = col_data.dropna()
-            if len(non_null_data) > 0:
-                unique_ratio = len(non_null_data.unique()) / len(non_null_data)
+            if p.non_null > 0:
+                unique_ratio = p.n_unique / p.non_null
                 if unique_ratio >= 0.8:  # 80%+ unique
                     score += 20
                     reasons.append(f"Yuqori unique ratio: {unique_ratio:.1%} (+20)")
@@ -853,58 +1437,46 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
                     score += 10
                     reasons.append(f"O'rtacha unique ratio: {unique_ratio:.1%} (+10)")
             
-            # 4. UZUNLIK TAHLILI (+15 ball)
-            # Ism-familiyalar odatda 5-50 belgi orasida
-            if col_data.dtype == 'object':
-                str_data = col_data.dropna().astype(str)
-                if len(str_data) > 0:
-                    avg_length = str_data.str.len().mean()
-                    if 5 <= avg_length <= 50:
-                        score += 15
-                        reasons.append(f"O'rtacha uzunlik mos: {avg_length:.1f} belgi (+15)")
-                    elif avg_length < 5:
-                        score -= 10
-                        reasons.append(f"Juda qisqa: {avg_length:.1f} belgi (-10)")
-                    elif avg_length > 100:
-                        score -= 10
-                        reasons.append(f"Juda uzun: {avg_length:.1f} belgi (-10)")
-            
-            # 5. FAQAT RAQAM EMAS (+15 ball)
-            # Ism-familiya faqat raqamlardan iborat bo'lmasligi kerak
-            if col_data.dtype == 'object':
-                str_data = col_data.dropna().astype(str)
-                if len(str_data) > 0:
-                    # Faqat raqamlarni tekshirish
-                    numeric_only = str_data.str.match(r'^\d+\.?\d*$').sum()
-                    numeric_ratio = numeric_only / len(str_data)
-                    if numeric_ratio < 0.1:  # 90%+ raqam emas
-                        score += 15
-                        reasons.append(f"Matn ma'lumotlari (raqam emas) (+15)")
-                    else:
-                        score -= 15
-                        reasons.append(f"Ko'p raqamlar: {numeric_ratio:.1%} (-15)")
+            if p.is_object and p.non_null > 0:
+                # 4. UZUNLIK TAHLILI (+15 ball)
+                # Ism-familiyalar odatda 5-50 belgi orasida
+                avg_length = p.avg_length
+                if 5 <= avg_length <= 50:
+                    score += 15
+                    reasons.append(f"O'rtacha uzunlik mos: {avg_length:.1f} belgi (+15)")
+                elif avg_length < 5:
+                    score -= 10
+                    reasons.append(f"Juda qisqa: {avg_length:.1f} belgi (-10)")
+                elif avg_length > 100:
+                    score -= 10
+                    reasons.append(f"Juda uzun: {avg_length:.1f} belgi (-10)")
+                
+                # 5. FAQAT RAQAM EMAS (+15 ball)
+                # Ism-familiya faqat raqamlardan iborat bo'lmasligi kerak
+                numeric_ratio = p.numeric_text_ratio
+                if numeric_ratio < 0.1:  # 90%+ raqam emas
+                    score += 15
+                    reasons.append("Matn ma'lumotlari (raqam emas) (+15)")
+                else:
+                    score -= 15
+                    reasons.append(f"Ko'p raqamlar: {numeric_ratio:.1%} (-15)")
             
             # 6. BINARY EMAS (+10 ball)
             # 0/1 qiymatlar ism-familiya emas
-            try:
-                numeric_data = pd.to_numeric(col_data, errors='coerce').dropna()
-                if len(numeric_data) > 0:
-                    binary_values = np.isin(numeric_data.values, [0, 1, 0.0, 1.0]).sum()
-                    binary_ratio = binary_values / len(numeric_data)
-                    if binary_ratio > 0.8:  # 80%+ binary
-                        score -= 20
-                        reasons.append(f"Binary ma'lumotlar: {binary_ratio:.1%} (-20)")
-                    elif binary_ratio < 0.1:
-                        score += 10
-                        reasons.append(f"Binary emas (+10)")
-            except:
-                pass
+            if p.numeric_count > 0:
+                binary_ratio = p.binary_count / p.numeric_count
+                if binary_ratio > 0.8:  # 80%+ binary
+                    score -= 20
+                    reasons.append(f"Binary ma'lumotlar: {binary_ratio:.1%} (-20)")
+                elif binary_ratio < 0.1:
+                    score += 10
+                    reasons.append("Binary emas (+10)")
             
             # 7. BIRINCHI USTUN BONUSI (+10 ball)
             if col_idx == 0:
                 # Agar ID yoki tartib raqam bo'lmasa
-                is_id = any(kw in col_name_lower for kw in ['id', 'code', 'raqam', 'uuid'])
-                is_row_number = any(kw in col_name_lower for kw in ['t/r', '№', 'n', '#', 'row', 'index'])
+                is_id = self._first_column_id_matcher.matches(col_name_lower)
+                is_row_number = self._row_number_matcher.matches(col_name_lower)
                 
                 if not is_id and not is_row_number:
                     score += 10
@@ -915,13 +1487,14 @@ Faylingizda faqat talabgor ismlari va javoblar (0/1) bo'lishi kerak. Qolgan barc
             
             # 8. BO'SH QIYMATLAR TAHLILI (+10 ball)
             # Ism-familiya ustunida kam bo'sh qiymat bo'lishi kerak
-            non_null_ratio = col_data.notna().sum() / len(col_data)
-            if non_null_ratio >= 0.9:  # 90%+ to'ldirilgan
-                score += 10
-                reasons.append(f"Kam bo'sh qiymat: {non_null_ratio:.1%} (+10)")
-            elif non_null_ratio < 0.5:
-                score -= 10
-                reasons.append(f"Ko'p bo'sh qiymat: {non_null_ratio:.1%} (-10)")
+            if p.n_rows > 0:
+                non_null_ratio = p.non_null / p.n_rows
+                if non_null_ratio >= 0.9:  # 90%+ to'ldirilgan
+                    score += 10
+                    reasons.append(f"Kam bo'sh qiymat: {non_null_ratio:.1%} (+10)")
+                elif non_null_ratio < 0.5:
+                    score -= 10
+                    reasons.append(f"Ko'p bo'sh qiymat: {non_null_ratio:.1%} (-10)")
             
             # Confidence level
             if score >= 60:
@@ -0,0 +1,147 @@
+"""
+Ko'p tanlovli testlar uchun distraktorlar tahlili
+
+Har bir savol variantlari uchun tanlanish chastotasi, point-biserial korrelyatsiya
+va qobiliyat guruhlari bo'yicha tanlanish egri chiziqlari hisoblanadi. Barcha
+hisoblar (savol, variant) juftliklari bo'yicha bitta np.bincount guruhlashida bajariladi.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bot.utils.answer_parser import generate_option_labels
+
+logger = logging.getLogger(__name__)
+
+# Qobiliyat bo'yicha guruhlar soni (past / o'rta / yuqori)
+DEFAULT_ABILITY_GROUPS = 3
+
+# Bundan kam tanlangan distraktor "ishlamaydigan" hisoblanadi
+MIN_DISTRACTOR_PROPORTION = 0.05
+
+BLANK_LABEL = "Bo'sh"
+
+
+def _ability_groups(criterion: np.ndarray, n_groups: int) -> np.ndarray:
+    """Mezon bo'yicha teng hajmli guruhlar (0 - eng past)"""
+    ranks = np.argsort(np.argsort(criterion, kind='stable'), kind='stable')
+    return (ranks * n_groups // len(criterion)).astype(np.int64)
+
+
+def analyze_distractors(answers: Any, answer_key: Sequence[int],
+                        item_names: Optional[List[str]] = None,
+                        abilities: Optional[Any] = None,
+                        n_options: Optional[int] = None,
+                        n_groups: int = DEFAULT_ABILITY_GROUPS) -> Dict[str, Any]:
+    """
+    Distraktorlar tahlili
+
+    Args:
+        answers: Talabgorlar × savollar, tanlangan variant indeksi (-1 - javob berilmagan)
+        answer_key: Har bir savol uchun to'g'ri variant indeksi
+        item_names: Savollar nomlari (default: Savol_1, Savol_2, ...)
+        abilities: Talabgorlar qobiliyati (default: to'g'ri javoblar soni)
+        n_options: Variantlar soni (default: javoblar va kalitdagi eng katta indeks + 1)
+        n_groups: Qobiliyat guruhlari soni
+
+    Returns:
+        {'option_labels', 'n_groups', 'criterion', 'items': [{'item', 'key', 'key_label',
+         'blank', 'options': [{'label', 'count', 'proportion', 'point_biserial', 'is_key',
+         'group_proportions'}], 'flags'}]}
+    """
+    answers = np.asarray(answers, dtype=np.int64)
+    if answers.ndim != 2 or answers.size == 0:
+        raise ValueError("Javoblar matritsasi bo'sh yoki noto'g'ri o'lchamda")
+
+    n_persons, n_items = answers.shape
+    key = np.asarray(answer_key, dtype=np.int64)
+    if len(key) != n_items:
+        raise ValueError(f"Kalitda {len(key)} ta javob bor, matritsada esa {n_items} ta savol")
+
+    if n_options is None:
+        n_options = int(max(answers.max(), key.max())) + 1
+    n_options = max(int(n_options), 2)
+    item_names = item_names or [f"Savol_{i + 1}" for i in range(n_items)]
+
+    # Kod 0 - bo'sh javob, 1..n_options - variantlar; diapazondan tashqari qiymatlar bo'sh hisoblanadi
+    codes = answers + 1
+    codes[(codes < 0) | (codes > n_options)] = 0
+    n_codes = n_options + 1
+
+    correct = codes == (key + 1)[np.newaxis, :]
+    criterion_name = 'total_score'
+    criterion = correct.sum(axis=1).astype(float)
+    if abilities is not None:
+        ability_values = np.asarray(abilities, dtype=float)
+        if len(ability_values) == n_persons and np.isfinite(ability_values).any():
+            criterion = np.where(np.isfinite(ability_values), ability_values, np.nanmean(ability_values))
+            criterion_name = 'ability'
+
+    groups = _ability_groups(criterion, n_groups)
+    group_sizes = np.bincount(groups, minlength=n_groups).astype(float)
+
+    # (savol, kod) juftliklari bo'yicha bitta guruhlash
+    cells = (np.arange(n_items) * n_codes)[np.newaxis, :] + codes
+    flat = cells.ravel()
+    size = n_items * n_codes
+    counts = np.bincount(flat, minlength=size).reshape(n_items, n_codes)
+    sums = np.bincount(flat, weights=np.repeat(criterion, n_items), minlength=size).reshape(n_items, n_codes)
+
+    grouped_flat = (groups[:, np.newaxis] * size + cells).ravel()
+    group_counts = np.bincount(grouped_flat, minlength=n_groups * size).reshape(n_groups, n_items, n_codes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        curves = group_counts / group_sizes[:, np.newaxis, np.newaxis]
+
+        # Point-biserial: r = (M_tanlaganlar - M) / S * sqrt(p / (1 - p))
+        proportion = counts / n_persons
+        mean_all = criterion.mean()
+        sd_all = criterion.std()
+        chosen_mean = sums / counts
+        point_biserial = (chosen_mean - mean_all) / sd_all * np.sqrt(proportion / (1 - proportion))
+    point_biserial[~np.isfinite(point_biserial)] = np.nan
+
+    labels = generate_option_labels(n_options)
+    items = []
+    for item_idx, name in enumerate(item_names):
+        key_idx = int(key[item_idx])
+        options = []
+        flags = []
+        for option_idx, label in enumerate(labels):
+            code = option_idx + 1
+            r_pb = point_biserial[item_idx, code]
+            option = {
+                'label': label,
+                'count': int(counts[item_idx, code]),
+                'proportion': float(proportion[item_idx, code]),
+                'point_biserial': None if np.isnan(r_pb) else float(r_pb),
+                'is_key': option_idx == key_idx,
+                'group_proportions': [float(value) if np.isfinite(value) else 0.0
+                                      for value in curves[:, item_idx, code]]
+            }
+            options.append(option)
+
+            if option['is_key']:
+                if option['point_biserial'] is not None and option['point_biserial'] < 0:
+                    flags.append(f"{label} (kalit) salbiy korrelyatsiya")
+            elif option['proportion'] < MIN_DISTRACTOR_PROPORTION:
+                flags.append(f"{label} deyarli tanlanmagan")
+            elif option['point_biserial'] is not None and option['point_biserial'] > 0:
+                flags.append(f"{label} kuchli talabgorlarni chalg'itmoqda")
+
+        items.append({
+            'item': str(name),
+            'key': key_idx,
+            'key_label': labels[key_idx] if 0 <= key_idx < len(labels) else None,
+            'blank': int(counts[item_idx, 0]),
+            'options': options,
+            'flags': flags
+        })
+
+    logger.info(f"🎯 Distraktorlar tahlili: {n_items} savol, {n_options} variant, {n_persons} talabgor")
+    return {
+        'option_labels': labels,
+        'n_groups': n_groups,
+        'criterion': criterion_name,
+        'items': items
+    }
@@ -0,0 +1,59 @@
+"""
+Ko'p kalit so'zni bitta o'tishda qidirish uchun utility
+"""
+import re
+from typing import Iterable, List, Optional
+
+
+class KeywordMatcher:
+    """
+    Kalit so'zlar ro'yxati uchun oldindan kompilyatsiya qilingan qidiruvchi
+
+    Barcha kalit so'zlar bitta alternation regex'ga yig'iladi. Lookahead ichida
+    qidirilgani uchun bir-birini qoplaydigan mosliklar ham topiladi va
+    ro'yxatda birinchi turgan kalit so'z qaytariladi - bu
+    `for keyword in keywords: if keyword in text` sikli bilan bir xil natija.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(keywords)
+        self._order = {}
+        for idx, keyword in enumerate(self.keywords):
+            self._order.setdefault(keyword, idx)
+
+        self._pattern = None
+        if self.keywords:
+            alternation = '|'.join(re.escape(keyword) for keyword in self.keywords)
+            self._pattern = re.compile(f'(?=({alternation}))')
+
+    def find(self, text: str) -> Optional[str]:
+        """
+        Matnda uchragan, ro'yxatda eng birinchi turgan kalit so'zni qaytarish
+
+        Args:
+            text: Tekshiriladigan matn (odatda kichik harflarda)
+
+        Returns:
+            Topilgan kalit so'z yoki None
+        """
+        if self._pattern is None:
+            return None
+
+        best = None
+        best_idx = len(self.keywords)
+        for match in self._pattern.finditer(text):
+            idx = self._order[match.group(1)]
+            if idx < best_idx:
+                best, best_idx = match.group(1), idx
+                if idx == 0:
+                    break
+        return best
+
+    def index(self, text: str) -> Optional[int]:
+        """Topilgan kalit so'zning ro'yxatdagi indeksi (yoki None)"""
+        keyword = self.find(text)
+        return None if keyword is None else self._order[keyword]
+
+    def matches(self, text: str) -> bool:
+        """Matnda kamida bitta kalit so'z bormi"""
+        return self._pattern is not None and self._pattern.search(text) is not None
@@ -1,154 +1,210 @@
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.graphics.shapes import Drawing
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import os
+import shutil
+import time
+import uuid
 from datetime import datetime
+from itertools import islice
 import numpy as np
-import matplotlib.pyplot as plt
 import logging
 
+from bot.utils import report_charts, report_styles
+from bot.utils.certificates import CertificateTemplate, render_certificates
+from bot.utils.distractor_analysis import BLANK_LABEL
+from bot.utils.subject_sections import format_question_list
+
 logger = logging.getLogger(__name__)
 
-def format_question_list(questions: list) -> str:
-    """
-    Format a list of question numbers into a readable string
+# Har bir hisobot ishi (job) alohida papkada: output_dir/jobs/<job_id>
+JOBS_SUBDIR = "jobs"
 
-    Args:
-        questions: List of question numbers
+# Shu muddatdan eski (tugallanmay qolgan) ish papkalari o'chiriladi
+JOB_DIR_MAX_AGE_SECONDS = 6 * 3600
+
+
+def cleanup_stale_job_dirs(output_dir: str = "data/results", max_age_seconds: float = JOB_DIR_MAX_AGE_SECONDS) -> int:
+    """
+    Xatolik yoki tugallanmagan jarayonlardan qolgan eski ish papkalarini o'chirish
 
     Returns:
-        Formatted string
+        O'chirilgan papkalar soni
     """
-    if not questions:
-        return "Yo'q"
-
-    # Group consecutive numbers into ranges
-    questions = sorted(questions)
-    ranges = []
-    start = questions[0]
-    end = questions[0]
-
-    for i in range(1, len(questions)):
-        if questions[i] == end + 1:
-            end = questions[i]
-        else:
-            if start == end:
-                ranges.append(str(start))
-            else:
-                ranges.append(f"{start}-{end}")
-            start = questions[i]
-            end = questions[i]
+    jobs_dir = os.path.join(output_dir, JOBS_SUBDIR)
+    if not os.path.isdir(jobs_dir):
+        return 0
 
-    # Add the last range
-    if start == end:
-        ranges.append(str(start))
-    else:
-        ranges.append(f"{start}-{end}")
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for entry in os.scandir(jobs_dir):
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Eski ish papkasini o'chirib bo'lmadi {entry.path}: {e}")
 
-    return ", ".join(ranges)
+    if removed:
+        logger.info(f"🧹 {removed} ta eski hisobot papkasi o'chirildi")
+    return removed
 
 
-class PDFReportGenerator:
-    """Generates PDF reports for Rasch model analysis results"""
+def calculate_section_scores(results: Dict[str, Any], section_questions: Dict[str, List[int]]) -> Dict[str, List[Dict]]:
+    """
+    Calculate T-scores for each section based on question numbers
+    Section T-scores are normalized so their sum equals the overall T-score
+    (PDF hisobotlari va XLSX/CSV eksporti shu natijadan foydalanadi)
 
-    def __init__(self, output_dir: str = "data/results"):
-        self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
+    Args:
+        results: Analysis results dictionary
+        section_questions: Dict mapping section names to question numbers (1-indexed)
 
-    def _calculate_section_scores(self, results: Dict[str, Any], section_questions: Dict[str, List[int]]) -> Dict[str, List[Dict]]:
-        """
-        Calculate T-scores for each section based on question numbers
-        Section T-scores are normalized so their sum equals the overall T-score
+    Returns:
+        Dict mapping section names to list of person scores
+    """
+    if not section_questions:
+        return {}
+
+    # Get the original response data from results
+    person_stats = results.get('person_statistics', {})
+    individual_data = person_stats.get('individual', [])
+
+    if not individual_data:
+        return {}
+
+    n_persons = len(individual_data)
+    n_items = results.get('n_items', 0)
+
+    # Get response matrix
+    response_matrix = results.get('response_matrix')
+    if response_matrix is None:
+        return {}
+
+    # Bo'limlar × savollar indikator matritsasi (takrorlangan savol raqami ikki marta sanaladi)
+    section_names = list(section_questions.keys())
+    all_section_data = {section_name: [] for section_name in section_names}
+    valid_sections = []
+    indicator_columns = []
+    for section_name, question_nums in section_questions.items():
+        # Convert 1-indexed to 0-indexed
+        question_indices = [q - 1 for q in question_nums or [] if 0 < q <= n_items]
+        if question_indices:
+            valid_sections.append(section_name)
+            indicator_columns.append(np.bincount(question_indices, minlength=n_items))
+
+    if not valid_sections:
+        return all_section_data
 
-        Args:
-            results: Analysis results dictionary
-            section_questions: Dict mapping section names to question numbers (1-indexed)
+    # Xom ballar bitta ko'paytirishda: (talabgorlar × savollar) @ (savollar × bo'limlar)
+    responses = np.nan_to_num(np.asarray(response_matrix, dtype=float)[:n_persons, :n_items])
+    indicator = np.column_stack(indicator_columns).astype(float)
+    raw_scores = (responses @ indicator).astype(int)
+    max_scores = indicator.sum(axis=0).astype(int)
+
+    # Umumiy T-Score bo'limlarga xom ball ulushiga qarab taqsimlanadi;
+    # barcha bo'lim ballari 0 bo'lsa - teng taqsimlanadi
+    overall_t_scores = np.array([person['t_score'] for person in individual_data], dtype=float)[:, np.newaxis]
+    sum_raw = raw_scores.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        proportional = overall_t_scores * (raw_scores / sum_raw)
+    t_scores = np.where(sum_raw > 0, proportional, overall_t_scores / len(valid_sections))
+
+    for col, section_name in enumerate(valid_sections):
+        max_score = int(max_scores[col])
+        all_section_data[section_name] = [
+            {'person_id': person_idx + 1, 'raw_score': raw_score, 'max_score': max_score, 't_score': t_score}
+            for person_idx, (raw_score, t_score) in enumerate(zip(raw_scores[:, col].tolist(),
+                                                                  t_scores[:, col].tolist()))
+        ]
 
-        Returns:
-            Dict mapping section names to list of person scores
-        """
-        if not section_questions:
-            return {}
+    return all_section_data
 
-        # Get the original response data from results
-        person_stats = results.get('person_statistics', {})
-        individual_data = person_stats.get('individual', [])
 
-        if not individual_data:
-            return {}
+class PDFReportGenerator:
+    """
+    Generates PDF reports for Rasch model analysis results
 
-        n_persons = len(individual_data)
-        n_items = results.get('n_items', 0)
+    Har bir obyekt o'z ish papkasiga (output_dir/jobs/<job_id>) yozadi - bir vaqtda
+    ishlayotgan o'qituvchilarning PDF va grafik fayllari bir-birini bosib ketmaydi.
+    Hisobotlar yuborilgach cleanup() chaqiriladi (yoki `with` bloki ishlatiladi).
+    """
 
-        # Get response matrix
-        response_matrix = results.get('response_matrix')
-        if response_matrix is None:
-            return {}
+    def __init__(self, output_dir: str = "data/results", job_id: Optional[str] = None):
+        """
+        Args:
+            output_dir: Barcha ish papkalari uchun asosiy papka
+            job_id: Mavjud ishni davom ettirish uchun (masalan, bo'limlar kiritilgandan keyin);
+                berilmasa yangi noyob ish yaratiladi
+        """
+        self.base_dir = output_dir
+        self.job_id = job_id or uuid.uuid4().hex
+        self.output_dir = os.path.join(output_dir, JOBS_SUBDIR, self.job_id)
+        if job_id is None:
+            cleanup_stale_job_dirs(output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
 
-        # First pass: collect all section raw scores for each person
-        section_names = list(section_questions.keys())
-        all_section_data = {section_name: [] for section_name in section_names}
+    def __enter__(self) -> 'PDFReportGenerator':
+        return self
 
-        for section_name, question_nums in section_questions.items():
-            if not question_nums:
-                continue
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.cleanup()
 
-            # Convert 1-indexed to 0-indexed
-            question_indices = [q - 1 for q in question_nums if 0 < q <= n_items]
+    def cleanup(self) -> None:
+        """Ish papkasini (PDF va grafiklar bilan) o'chirish"""
+        shutil.rmtree(self.output_dir, ignore_errors=True)
 
-            if not question_indices:
-                continue
+    def _build_distractor_table(self, distractors: Dict[str, Any]) -> Table:
+        """
+        Distraktorlar tahlilining ixcham jadvali (savol × variant)
 
-            # Calculate raw scores for this section for all persons
-            for person_idx in range(n_persons):
-                section_responses = response_matrix[person_idx, question_indices]
-                section_raw_score = int(np.sum(section_responses))
-
-                all_section_data[section_name].append({
-                    'person_id': person_idx + 1,
-                    'raw_score': section_raw_score,
-                    'max_score': len(question_indices),
-                    't_score': 0.0  # Will be calculated in second pass
-                })
-
-        # Second pass: normalize T-scores so they sum to overall T-score
-        for person_idx in range(n_persons):
-            overall_t_score = individual_data[person_idx]['t_score']
-
-            # Collect raw scores from all VALID sections for this person
-            valid_sections = []
-            section_raw_scores = []
-            for section_name in section_names:
-                if section_name in all_section_data and person_idx < len(all_section_data[section_name]):
-                    valid_sections.append(section_name)
-                    section_raw_scores.append(all_section_data[section_name][person_idx]['raw_score'])
-
-            # Calculate sum of raw scores
-            sum_section_raw = sum(section_raw_scores)
-
-            # Normalize: distribute overall T-score proportionally
-            if sum_section_raw > 0:
-                # Proportional distribution
-                for i, section_name in enumerate(valid_sections):
-                    section_t = overall_t_score * (section_raw_scores[i] / sum_section_raw)
-                    all_section_data[section_name][person_idx]['t_score'] = float(section_t)
-            else:
-                # All section scores are 0, distribute equally among VALID sections only
-                n_valid_sections = len(valid_sections)
-                equal_t = overall_t_score / n_valid_sections if n_valid_sections > 0 else 0.0
-                for section_name in valid_sections:
-                    all_section_data[section_name][person_idx]['t_score'] = float(equal_t)
+        Args:
+            distractors: distractor_analysis.analyze_distractors natijasi
 
-        return all_section_data
+        Returns:
+            ReportLab Table
+        """
+        labels = distractors['option_labels']
+        table_data = [['Item', 'Key'] + labels + [BLANK_LABEL]]
+        key_cells = []
+
+        for row_idx, item in enumerate(distractors['items'], start=1):
+            row = [item['item'], item['key_label'] or '-']
+            for col_idx, option in enumerate(item['options'], start=2):
+                r_pb = option['point_biserial']
+                r_text = f"{r_pb:+.2f}" if r_pb is not None else "-"
+                row.append(f"{option['proportion'] * 100:.0f}% ({r_text})")
+                if option['is_key']:
+                    key_cells.append((col_idx, row_idx))
+            row.append(str(item['blank']))
+            table_data.append(row)
+
+        option_width = min(1.0 * inch, 4.2 * inch / max(len(labels), 1))
+        table = Table(table_data, colWidths=[1.1*inch, 0.5*inch] + [option_width] * len(labels) + [0.6*inch],
+                      repeatRows=1)
+        style = [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8E44AD')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), report_styles.fonts().regular),
+            ('FONTNAME', (0, 0), (-1, 0), report_styles.fonts().bold),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
+        ]
+        for cell in key_cells:
+            style.append(('BACKGROUND', cell, cell, colors.HexColor('#D5F5E3')))
+        table.setStyle(TableStyle(style))
+        return table
 
-    def _create_item_person_map(self, results: Dict[str, Any]) -> str:
+    def _create_item_person_map(self, results: Dict[str, Any], width: float = 6 * inch,
+                                height: float = 5 * inch) -> Drawing:
         """
         Professional Wright Map (Item-Person Map) - Klassik format
-        Chap: Persons (histogram), O'ng: Items (individual markers)
+        Chap: Persons (X qatorlari), O'ng: Items (individual markers)
         """
         person_ability = results.get('person_ability', [])
         item_difficulty = results.get('item_difficulty', [])
@@ -168,127 +224,11 @@ class PDFReportGenerator:
         if len(valid_person_ability) == 0 or len(valid_item_difficulty) == 0:
             raise ValueError("No valid data points for Wright Map.")
 
-        # Calculate scale range
-        all_measures = np.concatenate([valid_person_ability, valid_item_difficulty])
-        min_measure = float(np.floor(np.min(all_measures) - 0.5))
-        max_measure = float(np.ceil(np.max(all_measures) + 0.5))
-
-        # Create figure with two subplots
-        fig, (ax_persons, ax_items) = plt.subplots(1, 2, figsize=(14, 10), 
-                                                     gridspec_kw={'width_ratios': [1.2, 1]})
-        
-        # ============== LEFT: PERSONS (Histogram) ==============
-        # Create histogram bins
-        bin_width = 0.3
-        bins = np.arange(min_measure, max_measure + bin_width, bin_width)
-        
-        # Plot horizontal histogram
-        counts, bin_edges = np.histogram(valid_person_ability, bins=bins)
-        bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
-        
-        # Draw histogram bars horizontally
-        for i, (center, count) in enumerate(zip(bin_centers, counts)):
-            if count > 0:
-                # Draw 'X' marks for each person in this bin
-                for j in range(int(count)):
-                    x_pos = -0.1 - (j * 0.15)  # Stack horizontally
-                    ax_persons.text(x_pos, center, 'X', 
-                                  fontsize=12, ha='center', va='center',
-                                  color='#2E86AB', fontweight='bold')
-        
-        # Person axis formatting
-        ax_persons.set_ylim(min_measure, max_measure)
-        ax_persons.set_xlim(-2, 0.5)
-        ax_persons.set_yticks(np.arange(np.ceil(min_measure), np.floor(max_measure) + 1, 0.5))
-        ax_persons.set_ylabel('Logits (Qobiliyat / Qiyinchilik)', fontsize=12, fontweight='bold')
-        ax_persons.set_xlabel('')
-        ax_persons.set_xticks([])
-        ax_persons.set_title('TALABGORLAR', fontsize=14, fontweight='bold', pad=15)
-        ax_persons.grid(True, axis='y', linestyle='--', alpha=0.3)
-        ax_persons.axhline(y=0, color='black', linestyle='-', linewidth=1.5, alpha=0.7)
-        ax_persons.invert_xaxis()
-        
-        # Add mean line for persons
-        mean_ability = np.mean(valid_person_ability)
-        ax_persons.axhline(y=mean_ability, color='#A23B72', linestyle='--', 
-                          linewidth=2, alpha=0.7, label=f'O\'rtacha: {mean_ability:.2f}')
-        ax_persons.legend(loc='lower left', fontsize=9)
-        
-        # ============== RIGHT: ITEMS ==============
-        # Sort items by difficulty
-        sorted_indices = np.argsort(valid_item_difficulty)
-        sorted_difficulty = valid_item_difficulty[sorted_indices]
-        sorted_names = valid_item_names[sorted_indices]
-        
-        # Plot items with smart label placement
-        plotted_items = []
-        for i, (diff, name) in enumerate(zip(sorted_difficulty, sorted_names)):
-            # Calculate horizontal offset to avoid overlap
-            x_offset = 0
-            for prev_diff, prev_offset in plotted_items:
-                if abs(diff - prev_diff) < 0.12:
-                    x_offset = prev_offset + 0.15
-                    if x_offset > 0.6:
-                        x_offset = 0
-            
-            plotted_items.append((diff, x_offset))
-            
-            # Draw item marker
-            x_pos = 0.1 + x_offset
-            ax_items.scatter(x_pos, diff, marker='s', s=120, 
-                           color='#E63946', alpha=0.8, edgecolors='darkred', linewidths=1.5)
-            
-            # Add item label
-            ax_items.text(x_pos + 0.12, diff, name, 
-                         fontsize=9, va='center', ha='left', fontweight='bold')
-        
-        # Items axis formatting
-        ax_items.set_ylim(min_measure, max_measure)
-        ax_items.set_xlim(-0.2, 2.5)
-        ax_items.set_yticks(np.arange(np.ceil(min_measure), np.floor(max_measure) + 1, 0.5))
-        ax_items.set_yticklabels([])
-        ax_items.set_xlabel('')
-        ax_items.set_xticks([])
-        ax_items.set_title('SAVOLLAR', fontsize=14, fontweight='bold', pad=15)
-        ax_items.grid(True, axis='y', linestyle='--', alpha=0.3)
-        ax_items.axhline(y=0, color='black', linestyle='-', linewidth=1.5, alpha=0.7)
-        
-        # Add mean line for items
-        mean_difficulty = np.mean(valid_item_difficulty)
-        ax_items.axhline(y=mean_difficulty, color='#F77F00', linestyle='--', 
-                        linewidth=2, alpha=0.7, label=f'O\'rtacha: {mean_difficulty:.2f}')
-        ax_items.legend(loc='lower right', fontsize=9)
-        
-        # Main title
-        fig.suptitle('Wright Map (Item-Person Map)', 
-                    fontsize=16, fontweight='bold', y=0.98)
-        
-        # Add statistics text
-        stats_text = (
-            f"Talabgorlar: {len(valid_person_ability)} | "
-            f"Savollar: {len(valid_item_difficulty)}\n"
-            f"Qobiliyat: {np.min(valid_person_ability):.2f} - {np.max(valid_person_ability):.2f} | "
-            f"Qiyinchilik: {np.min(valid_item_difficulty):.2f} - {np.max(valid_item_difficulty):.2f}"
-        )
-        fig.text(0.5, 0.02, stats_text, ha='center', fontsize=10, 
-                style='italic', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
-        
-        plt.tight_layout(rect=[0, 0.04, 1, 0.96])
-        
-        try:
-            os.makedirs(self.output_dir, exist_ok=True)
-            chart_filename = os.path.join(self.output_dir, "wright_map.png")
-            plt.savefig(chart_filename, bbox_inches='tight', dpi=300, facecolor='white')
-            plt.close()
-            logger.info(f"✅ Wright Map yaratildi: {chart_filename}")
-            return chart_filename
-        except Exception as e:
-            logger.error(f"Error saving Wright map: {e}")
-            plt.close()
-            return None
+        return report_charts.wright_map(valid_person_ability, valid_item_difficulty, valid_item_names,
+                                        width=width, height=height)
 
-    def _create_t_score_distribution(self, results: Dict[str, Any]) -> str:
-        """Creates and saves the T-score distribution histogram as an image."""
+    def _create_t_score_distribution(self, results: Dict[str, Any]) -> Drawing:
+        """Creates the T-score distribution histogram as a vector drawing."""
         person_stats = results.get('person_statistics', {})
         individual_data = person_stats.get('individual', [])
 
@@ -300,26 +240,10 @@ class PDFReportGenerator:
         if not t_scores:
             raise ValueError("No valid T-scores found for distribution.")
 
-        plt.figure(figsize=(6, 3.6))
-        plt.hist(t_scores, bins=10, color='skyblue', edgecolor='black')
-        plt.title("T-Score Distribution")
-        plt.xlabel("T-Score")
-        plt.ylabel("Frequency")
-        plt.grid(True, linestyle='--', alpha=0.6)
-
-        try:
-            os.makedirs(self.output_dir, exist_ok=True)
-            chart_filename = os.path.join(self.output_dir, "t_score_distribution.png")
-            plt.savefig(chart_filename, bbox_inches='tight', dpi=150)
-            plt.close()
-            return chart_filename
-        except Exception as e:
-            logger.error(f"Error saving T-score distribution: {e}")
-            plt.close()
-            return None
+        return report_charts.t_score_histogram(t_scores)
 
-    def _create_grade_distribution(self, results: Dict[str, Any]) -> str:
-        """Creates and saves the grade distribution bar chart as an image."""
+    def _create_grade_distribution(self, results: Dict[str, Any]) -> Drawing:
+        """Creates the grade distribution bar chart as a vector drawing."""
         person_stats = results.get('person_statistics', {})
         individual_data = person_stats.get('individual', [])
 
@@ -349,43 +273,7 @@ class PDFReportGenerator:
             else:
                 grade_counts['NC'] += 1
 
-        grades = list(grade_counts.keys())
-        counts = list(grade_counts.values())
-        
-        # Define colors for each grade
-        colors_map = {
-            'A+': '#2ECC71', 'A': '#3498DB', 'B+': '#9B59B6',
-            'B': '#F39C12', 'C+': '#E67E22', 'C': '#E74C3C', 'NC': '#95A5A6'
-        }
-        bar_colors = [colors_map[g] for g in grades]
-
-        plt.figure(figsize=(7, 4))
-        bars = plt.bar(grades, counts, color=bar_colors, edgecolor='black', alpha=0.8)
-        
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                plt.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{int(height)}',
-                        ha='center', va='bottom', fontsize=10, fontweight='bold')
-        
-        plt.title("Darajalar Taqsimoti", fontsize=14, fontweight='bold')
-        plt.xlabel("Daraja", fontsize=11)
-        plt.ylabel("Talabgorlar Soni", fontsize=11)
-        plt.grid(True, linestyle='--', alpha=0.3, axis='y')
-        plt.tight_layout()
-
-        try:
-            os.makedirs(self.output_dir, exist_ok=True)
-            chart_filename = os.path.join(self.output_dir, "grade_distribution.png")
-            plt.savefig(chart_filename, bbox_inches='tight', dpi=150)
-            plt.close()
-            return chart_filename
-        except Exception as e:
-            logger.error(f"Error saving grade distribution: {e}")
-            plt.close()
-            return None
+        return report_charts.grade_distribution_chart(grade_counts)
 
     def generate_report(self, results: Dict[str, Any], filename: Optional[str] = None) -> str:
         """
@@ -420,24 +308,9 @@ class PDFReportGenerator:
 
         story = []
 
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#34495E'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
+        styles = report_styles.stylesheet()
+        title_style = styles['CustomTitle']
+        heading_style = styles['CustomHeading']
 
         story.append(Paragraph("Rasch Model Analysis Report", title_style))
         story.append(Spacer(1, 0.2 * inch))
@@ -452,15 +325,7 @@ class PDFReportGenerator:
             ["Reliability:", f"{results['reliability']:.3f}"]
         ]
         sample_table = Table(sample_data, colWidths=[3*inch, 2*inch])
-        sample_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ECF0F1')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-        ]))
+        sample_table.setStyle(report_styles.info_table_style())
         story.append(sample_table)
         story.append(Spacer(1, 0.3 * inch))
 
@@ -477,21 +342,27 @@ class PDFReportGenerator:
             ])
 
         item_table = Table(item_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-        item_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-        ]))
+        item_table.setStyle(report_styles.header_table_style('#3498DB'))
         story.append(item_table)
         story.append(Spacer(1, 0.3 * inch))
 
+        # Distraktorlar tahlili (faqat variantlar saqlangan testlar uchun)
+        distractors = results.get('distractor_analysis')
+        if distractors and distractors.get('items'):
+            story.append(Paragraph("Distraktorlar Tahlili", heading_style))
+            story.append(Paragraph(
+                "Har bir katakda: variantni tanlaganlar ulushi va point-biserial korrelyatsiya. "
+                "Kalit variant yashil rangda.",
+                styles['Normal']
+            ))
+            story.append(Spacer(1, 0.1 * inch))
+            story.append(self._build_distractor_table(distractors))
+
+            flagged = [item for item in distractors['items'] if item['flags']]
+            for item in flagged[:10]:
+                story.append(Paragraph(f"<b>{item['item']}</b>: {'; '.join(item['flags'])}", styles['Normal']))
+            story.append(Spacer(1, 0.3 * inch))
+
         story.append(Paragraph("Person Ability Distribution", heading_style))
 
         abilities = results['person_ability']
@@ -507,33 +378,28 @@ class PDFReportGenerator:
             ]
 
             ability_table = Table(ability_stats, colWidths=[2.5*inch, 1.5*inch])
-            ability_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ECC71')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ]))
+            ability_table.setStyle(report_styles.header_table_style('#2ECC71', 'LEFT', body_size=10, striped=False))
             story.append(ability_table)
         else:
             story.append(Paragraph("No valid person abilities calculated.", styles['Normal']))
 
         story.append(Spacer(1, 0.3 * inch))
 
+        # Wright Map (talabgorlar va savollar bitta shkalada)
+        story.append(Paragraph("Wright Map", heading_style))
+        try:
+            story.append(self._create_item_person_map(results))
+            story.append(Spacer(1, 0.2 * inch))
+        except Exception as e:
+            logger.error(f"Error creating Wright map: {e}")
+            story.append(Paragraph("Wright Map grafigini yaratishda xatolik yuz berdi.", styles['Normal']))
+            story.append(Spacer(1, 0.2 * inch))
+
         # Add Grade Distribution Chart
         story.append(Paragraph("Darajalar Taqsimoti", heading_style))
-        chart_files_to_cleanup = []
         try:
-            grade_chart_path = self._create_grade_distribution(results)
-            if grade_chart_path and os.path.exists(grade_chart_path):
-                img = Image(grade_chart_path, width=6*inch, height=3.5*inch)
-                story.append(img)
-                story.append(Spacer(1, 0.2 * inch))
-                chart_files_to_cleanup.append(grade_chart_path)
+            story.append(self._create_grade_distribution(results))
+            story.append(Spacer(1, 0.2 * inch))
         except Exception as e:
             logger.error(f"Error creating grade distribution: {e}")
             story.append(Paragraph("Darajalar taqsimoti grafigini yaratishda xatolik yuz berdi.", styles['Normal']))
@@ -541,30 +407,175 @@ class PDFReportGenerator:
 
         story.append(Spacer(1, 0.4 * inch))
 
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        footer_style = styles['Footer']
         story.append(Paragraph(
             "Report generated using Rasch Model Analysis (MML Estimation)",
             footer_style
         ))
 
         doc.build(story)
-        
-        # Clean up temporary chart files after PDF is built
-        for chart_file in chart_files_to_cleanup:
-            try:
-                if os.path.exists(chart_file):
-                    os.unlink(chart_file)
-            except Exception as e:
-                logger.warning(f"Failed to cleanup chart file {chart_file}: {e}")
 
         return filepath
 
+    def _person_table_page_rows(self, doc: SimpleDocTemplate, heading: Paragraph, header: List[str],
+                                sample_row: List[str], col_widths: List[float],
+                                style: TableStyle) -> Tuple[int, int]:
+        """
+        Bitta sahifaga sig'adigan jadval qatorlari soni (sarlavha qatori bilan)
+
+        Returns:
+            (sahifa boshidagi heading bilan birinchi sahifa, keyingi sahifalar)
+        """
+        frame_height = doc.height - 12  # Frame ichki chegaralari (6pt + 6pt)
+        header_height = Table([header], colWidths=col_widths, style=style).wrap(doc.width, frame_height)[1]
+        row_height = Table([header, sample_row], colWidths=col_widths, style=style).wrap(
+            doc.width, frame_height)[1] - header_height
+        heading_height = heading.wrap(doc.width, frame_height)[1] + heading.style.spaceAfter
+
+        # Bitta qator zaxira - yaxlitlash farqlari blokni keyingi sahifaga toshirmasin
+        page_rows = max(1, int((frame_height - header_height) // row_height) - 1)
+        first_page_rows = max(1, int((frame_height - heading_height - header_height) // row_height) - 1)
+        return first_page_rows, page_rows
+
+    @staticmethod
+    def _section_lookup(section_scores: Dict[str, List[Dict]],
+                        section_names: List[str]) -> Dict[str, Dict[Any, Dict]]:
+        """Bo'lim natijalari: {bo'lim: {person_id: natija}} - har bir talabgor uchun qidiruv O(1)"""
+        return {
+            name: {p['person_id']: p for p in section_scores[name]}
+            for name in section_names
+        }
+
+    def _append_paged_table(self, story: List, doc: SimpleDocTemplate, heading: Paragraph, heading_index: int,
+                            header: List[str], rows: Iterator[List[str]], n_rows: int,
+                            col_widths: List[float], style: TableStyle):
+        """
+        Jadvalni sahifa hajmidagi bloklarda qo'shish
+
+        Har bir blok o'z sarlavhasi bilan bitta sahifani to'ldiradi. Katta jadvalni
+        sahifama-sahifa bo'lish (split) har safar qolgan barcha qatorlarni qayta o'lchaydi -
+        bloklar bilan vaqt qatorlar soniga chiziqli.
+        """
+        first_chunk = list(islice(rows, 1))
+        if not first_chunk:
+            return
+        first_page_rows, page_rows = self._person_table_page_rows(
+            doc, heading, header, first_chunk[0], col_widths, style
+        )
+        if n_rows > page_rows:
+            # Bir sahifadan katta jadval yangi sahifadan boshlanadi - bloklar sahifalarga mos tushadi
+            story.insert(heading_index, PageBreak())
+            chunk_size = first_page_rows
+        else:
+            chunk_size = page_rows
+
+        chunk = first_chunk + list(islice(rows, chunk_size - 1))
+        while chunk:
+            table = Table([header] + chunk, colWidths=col_widths, repeatRows=1)
+            table.setStyle(style)
+            story.append(table)
+            chunk = list(islice(rows, page_rows))
+
+    def _section_result_rows(self, individual_data_sorted: List[Dict[str, Any]],
+                             section_scores: Dict[str, List[Dict]],
+                             section_names: List[str]) -> Iterator[List[str]]:
+        """Bo'limlar jadvali qatorlari (dangasa - bloklab o'qiladi)"""
+        section_lookup = self._section_lookup(section_scores, section_names)
+
+        for rank, person in enumerate(individual_data_sorted, start=1):
+            row = [
+                str(rank),
+                f"Talabgor {person['person_id']}",
+                f"{person['t_score']:.1f}" if not np.isnan(person['t_score']) else "N/A"
+            ]
+
+            # Add section T-scores for this person
+            for section_name in section_names:
+                person_section = section_lookup[section_name].get(person['person_id'])
+                if person_section:
+                    row.append(f"{person_section['t_score']:.1f}")
+                else:
+                    row.append("N/A")
+
+            yield row
+
+    def _person_result_rows(self, individual_data_sorted: List[Dict[str, Any]],
+                            section_scores: Dict[str, List[Dict]],
+                            section_names: List[str]) -> Iterator[List[str]]:
+        """
+        Talabgorlar jadvali qatorlari (dangasa - bloklab o'qiladi)
+
+        Bo'lim natijalari person_id bo'yicha lug'atga bir marta joylanadi.
+        """
+        section_lookup = self._section_lookup(section_scores, section_names)
+
+        # Add data for each person with rank
+        for rank, person in enumerate(individual_data_sorted, start=1):
+            # Calculate percentage from T-Score
+            t_score = person['t_score']
+            if not np.isnan(t_score):
+                percentage = (t_score / 65) * 100
+                # Cap percentage: below 70% = 0%, above 100% = 100%
+                if percentage > 100:
+                    percentage = 100.0
+                elif percentage < 70:
+                    percentage = 0.0
+                percentage_str = f"{percentage:.1f}%"
+
+                # Determine grade based on T-Score (UZBMB standards)
+                if t_score >= 70:
+                    grade = "A+"
+                elif t_score >= 65:
+                    grade = "A"
+                elif t_score >= 60:
+                    grade = "B+"
+                elif t_score >= 55:
+                    grade = "B"
+                elif t_score >= 50:
+                    grade = "C+"
+                elif t_score >= 46:
+                    grade = "C"
+                else:
+                    grade = "NC"
+            else:
+                percentage_str = "N/A"
+                grade = "N/A"
+
+            # Use actual person name if available, otherwise use person_id
+            person_display = person.get('person_name') or f"Talabgor {person['person_id']}"
+
+            if section_scores:
+                # Row with section T-scores
+                row = [
+                    str(rank),
+                    person_display,
+                    str(person['raw_score']),
+                    f"{person['t_score']:.1f}" if not np.isnan(person['t_score']) else "N/A"
+                ]
+
+                # Add section T-scores for this person
+                for section_name in section_names:
+                    person_section = section_lookup[section_name].get(person['person_id'])
+                    if person_section:
+                        row.append(f"{person_section['t_score']:.1f}")
+                    else:
+                        row.append("N/A")
+
+                row.extend([percentage_str, grade])
+            else:
+                # Original row format
+                row = [
+                    str(rank),
+                    person_display,
+                    str(person['raw_score']),
+                    f"{person['ability']:.3f}" if not np.isnan(person['ability']) else "N/A",
+                    f"{person['t_score']:.1f}" if not np.isnan(person['t_score']) else "N/A",
+                    percentage_str,
+                    grade
+                ]
+
+            yield row
+
     def generate_person_results_report(self, results: Dict[str, Any], filename: Optional[str] = None, section_questions: Optional[Dict[str, list]] = None) -> str:
         """
         Generate separate PDF report for individual person results only
@@ -599,24 +610,9 @@ class PDFReportGenerator:
 
         story = []
 
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#34495E'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
+        styles = report_styles.stylesheet()
+        title_style = styles['CustomTitle']
+        heading_style = styles['CustomHeading']
 
         story.append(Paragraph("Talabgorlar Natijalari", title_style))
         story.append(Spacer(1, 0.2 * inch))
@@ -631,15 +627,7 @@ class PDFReportGenerator:
             ["Savollar soni:", str(results['n_items'])]
         ]
         info_table = Table(info_data, colWidths=[3*inch, 2*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ECF0F1')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-        ]))
+        info_table.setStyle(report_styles.info_table_style())
         story.append(info_table)
         story.append(Spacer(1, 0.4 * inch))
 
@@ -647,20 +635,15 @@ class PDFReportGenerator:
         section_scores = {}
         section_names: List[str] = []
         if section_questions:
-            section_scores = self._calculate_section_scores(results, section_questions)
+            section_scores = calculate_section_scores(results, section_questions)
             if section_scores:
                 section_names = list(section_scores.keys())
 
         # Add T-Score distribution chart
         story.append(Paragraph("T-Score Taqsimoti", heading_style))
-        chart_files_to_cleanup = []
         try:
-            chart_path = self._create_t_score_distribution(results)
-            if chart_path and os.path.exists(chart_path):
-                img = Image(chart_path, width=6*inch, height=3.6*inch)
-                story.append(img)
-                story.append(Spacer(1, 0.2 * inch))
-                chart_files_to_cleanup.append(chart_path)
+            story.append(self._create_t_score_distribution(results))
+            story.append(Spacer(1, 0.2 * inch))
         except Exception as e:
             logger.error(f"Error creating T-score chart: {e}")
             story.append(Paragraph("T-Score grafigini yaratishda xatolik yuz berdi.", styles['Normal']))
@@ -670,9 +653,11 @@ class PDFReportGenerator:
 
         # Individual person statistics table
         if section_scores:
-            story.append(Paragraph("Talabgorlar Natijalari - Bo'limlar bo'yicha (T-Score bo'yicha tartiblangan)", heading_style))
+            table_heading = Paragraph("Talabgorlar Natijalari - Bo'limlar bo'yicha (T-Score bo'yicha tartiblangan)", heading_style)
         else:
-            story.append(Paragraph("Talabgorlar Natijalari (T-Score bo'yicha tartiblangan)", heading_style))
+            table_heading = Paragraph("Talabgorlar Natijalari (T-Score bo'yicha tartiblangan)", heading_style)
+        heading_index = len(story)
+        story.append(table_heading)
 
         person_stats = results.get('person_statistics', {})
         individual_data = person_stats.get('individual', [])
@@ -707,91 +692,13 @@ class PDFReportGenerator:
                 person_table_data = [['Rank', 'Talabgor', 'Raw Score', 'Ability (θ)', 'T-Score', 'Foiz', 'Daraja']]
                 col_widths = [0.6*inch, 1.1*inch, 0.9*inch, 0.9*inch, 0.9*inch, 0.8*inch, 0.7*inch]
 
-            # Add data for each person with rank
-            for rank, person in enumerate(individual_data_sorted, start=1):
-                # Calculate percentage from T-Score
-                t_score = person['t_score']
-                if not np.isnan(t_score):
-                    percentage = (t_score / 65) * 100
-                    # Cap percentage: below 70% = 0%, above 100% = 100%
-                    if percentage > 100:
-                        percentage = 100.0
-                    elif percentage < 70:
-                        percentage = 0.0
-                    percentage_str = f"{percentage:.1f}%"
-
-                    # Determine grade based on T-Score (UZBMB standards)
-                    if t_score >= 70:
-                        grade = "A+"
-                    elif t_score >= 65:
-                        grade = "A"
-                    elif t_score >= 60:
-                        grade = "B+"
-                    elif t_score >= 55:
-                        grade = "B"
-                    elif t_score >= 50:
-                        grade = "C+"
-                    elif t_score >= 46:
-                        grade = "C"
-                    else:
-                        grade = "NC"
-                else:
-                    percentage_str = "N/A"
-                    grade = "N/A"
-
-                if section_scores:
-                    # Row with section T-scores
-                    # Use actual person name if available, otherwise use person_id
-                    person_display = person.get('person_name') or f"Talabgor {person['person_id']}"
-                    row = [
-                        str(rank),
-                        person_display,
-                        str(person['raw_score']),
-                        f"{person['t_score']:.1f}" if not np.isnan(person['t_score']) else "N/A"
-                    ]
-
-                    # Add section T-scores for this person
-                    person_id = person['person_id']
-                    for section_name in section_names:
-                        section_data = section_scores[section_name]
-                        # Find this person's data in the section
-                        person_section = next((p for p in section_data if p['person_id'] == person_id), None)
-                        if person_section:
-                            row.append(f"{person_section['t_score']:.1f}")
-                        else:
-                            row.append("N/A")
-
-                    row.extend([percentage_str, grade])
-                else:
-                    # Original row format
-                    # Use actual person name if available, otherwise use person_id
-                    person_display = person.get('person_name') or f"Talabgor {person['person_id']}"
-                    row = [
-                        str(rank),
-                        person_display,
-                        str(person['raw_score']),
-                        f"{person['ability']:.3f}" if not np.isnan(person['ability']) else "N/A",
-                        f"{person['t_score']:.1f}" if not np.isnan(person['t_score']) else "N/A",
-                        percentage_str,
-                        grade
-                    ]
-
-                person_table_data.append(row)
-
-            person_table = Table(person_table_data, colWidths=col_widths)
-            person_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E74C3C')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-            ]))
-            story.append(person_table)
+            # Jadval sahifa hajmidagi bloklarda quriladi
+            self._append_paged_table(
+                story, doc, table_heading, heading_index, person_table_data[0],
+                self._person_result_rows(individual_data_sorted, section_scores, section_names),
+                len(individual_data_sorted), col_widths,
+                report_styles.header_table_style('#E74C3C', header_size=8, body_size=7)
+            )
 
             # Add legend/explanation
             story.append(Spacer(1, 0.2 * inch))
@@ -821,27 +728,13 @@ class PDFReportGenerator:
 
         story.append(Spacer(1, 0.4 * inch))
 
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        footer_style = styles['Footer']
         story.append(Paragraph(
             "Rasch Model Tahlili - Talabgorlar Natijalari",
             footer_style
         ))
 
         doc.build(story)
-        
-        # Clean up temporary chart files after PDF is built
-        for chart_file in chart_files_to_cleanup:
-            try:
-                if os.path.exists(chart_file):
-                    os.unlink(chart_file)
-            except Exception as e:
-                logger.warning(f"Failed to cleanup chart file {chart_file}: {e}")
 
         return filepath
 
@@ -879,24 +772,9 @@ class PDFReportGenerator:
 
         story = []
 
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#34495E'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
+        styles = report_styles.stylesheet()
+        title_style = styles['CustomTitle']
+        heading_style = styles['CustomHeading']
 
         story.append(Paragraph("Bo'limlar bo'yicha natijalar", title_style))
         story.append(Spacer(1, 0.2 * inch))
@@ -911,27 +789,21 @@ class PDFReportGenerator:
             ["Savollar soni:", str(results['n_items'])]
         ]
         info_table = Table(info_data, colWidths=[3*inch, 2*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ECF0F1')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-        ]))
+        info_table.setStyle(report_styles.info_table_style())
         story.append(info_table)
         story.append(Spacer(1, 0.4 * inch))
 
         # Calculate section scores
         section_scores = {}
         if section_questions:
-            section_scores = self._calculate_section_scores(results, section_questions)
+            section_scores = calculate_section_scores(results, section_questions)
 
         if not section_scores:
             story.append(Paragraph("Bo'limlar ma'lumotlari topilmadi.", styles['Normal']))
         else:
-            story.append(Paragraph("Bo'limlar bo'yicha natijalar (T-Score bo'yicha tartiblangan)", heading_style))
+            table_heading = Paragraph("Bo'limlar bo'yicha natijalar (T-Score bo'yicha tartiblangan)", heading_style)
+            heading_index = len(story)
+            story.append(table_heading)
 
             person_stats = results.get('person_statistics', {})
             individual_data = person_stats.get('individual', [])
@@ -952,49 +824,19 @@ class PDFReportGenerator:
                     short_name = section_name[:20] + '...' if len(section_name) > 20 else section_name
                     header.append(f"{short_name}\n(T-Score)")
 
-                person_table_data = [header]
-
                 # Calculate column widths dynamically
                 n_sections = len(section_names)
                 base_width = 6.5 * inch  # Total available width
                 section_col_width = min(1.2*inch, (base_width - 2.5*inch) / n_sections)
                 col_widths = [0.5*inch, 1.0*inch, 1.0*inch] + [section_col_width] * n_sections
 
-                # Add data for each person
-                for rank, person in enumerate(individual_data_sorted, start=1):
-                    row = [
-                        str(rank),
-                        f"Talabgor {person['person_id']}",
-                        f"{person['t_score']:.1f}" if not np.isnan(person['t_score']) else "N/A"
-                    ]
-
-                    # Add section T-scores for this person
-                    person_id = person['person_id']
-                    for section_name in section_names:
-                        section_data = section_scores[section_name]
-                        # Find this person's data in the section
-                        person_section = next((p for p in section_data if p['person_id'] == person_id), None)
-                        if person_section:
-                            row.append(f"{person_section['t_score']:.1f}")
-                        else:
-                            row.append("N/A")
-
-                    person_table_data.append(row)
-
-                person_table = Table(person_table_data, colWidths=col_widths)
-                person_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('FONTSIZE', (0, 1), (-1, -1), 7),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-                ]))
-                story.append(person_table)
+                # Talabgorlar jadvali bilan bir xil: person_id lug'ati va sahifa hajmidagi bloklar
+                self._append_paged_table(
+                    story, doc, table_heading, heading_index, header,
+                    self._section_result_rows(individual_data_sorted, section_scores, section_names),
+                    len(individual_data_sorted), col_widths,
+                    report_styles.header_table_style('#3498DB', header_size=8, body_size=7)
+                )
 
                 # Add section information summary
                 story.append(Spacer(1, 0.3 * inch))
@@ -1012,18 +854,7 @@ class PDFReportGenerator:
                             ])
 
                 section_info_table = Table(section_info_data, colWidths=[2.5*inch, 2.5*inch, 1.0*inch])
-                section_info_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ECC71')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-                ]))
+                section_info_table.setStyle(report_styles.header_table_style('#2ECC71', 'LEFT', header_size=9, body_size=8))
                 story.append(section_info_table)
 
                 # Add legend/explanation
@@ -1041,13 +872,7 @@ class PDFReportGenerator:
 
         story.append(Spacer(1, 0.4 * inch))
 
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        footer_style = styles['Footer']
         story.append(Paragraph(
             "Rasch Model Tahlili - Bo'limlar bo'yicha natijalar",
             footer_style
@@ -1089,168 +914,35 @@ class PDFReportGenerator:
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"certificate_{timestamp}"
-        
-        filepath = os.path.join(self.output_dir, f"{filename}.pdf")
-        
-        # Create document
-        doc = SimpleDocTemplate(filepath, pagesize=A4)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles for certificate
-        title_style = ParagraphStyle(
-            'CertTitle',
-            parent=styles['Heading1'],
-            fontSize=28,
-            textColor=colors.HexColor('#2C3E50'),
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CertSubtitle',
-            parent=styles['Normal'],
-            fontSize=16,
-            textColor=colors.HexColor('#34495E'),
-            alignment=TA_CENTER,
-            spaceAfter=30
-        )
-        
-        name_style = ParagraphStyle(
-            'StudentName',
-            parent=styles['Heading2'],
-            fontSize=22,
-            textColor=colors.HexColor('#2980B9'),
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            fontName='Helvetica-Bold'
-        )
-        
-        info_style = ParagraphStyle(
-            'InfoStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#2C3E50'),
-            alignment=TA_CENTER,
-            spaceAfter=10
-        )
-        
-        # Determine grade based on percentage
-        if percentage >= 90:
-            grade = "A (A'lo)"
-            grade_color = colors.HexColor('#27AE60')
-        elif percentage >= 80:
-            grade = "B (Yaxshi)"
-            grade_color = colors.HexColor('#2ECC71')
-        elif percentage >= 70:
-            grade = "C (Qoniqarli)"
-            grade_color = colors.HexColor('#F39C12')
-        elif percentage >= 60:
-            grade = "D (O'rtacha)"
-            grade_color = colors.HexColor('#E67E22')
-        else:
-            grade = "F (Qoniqarsiz)"
-            grade_color = colors.HexColor('#E74C3C')
-        
-        # Ability level based on theta
-        if theta >= 2.0:
-            ability = "Juda yuqori"
-        elif theta >= 1.0:
-            ability = "Yuqori"
-        elif theta >= 0:
-            ability = "O'rtacha"
-        elif theta >= -1.0:
-            ability = "O'rtachadan past"
-        else:
-            ability = "Past"
-        
-        # Add spacing from top
-        story.append(Spacer(1, 1.0 * inch))
-        
-        # Certificate title
-        story.append(Paragraph("🎓 SERTIFIKAT 🎓", title_style))
-        story.append(Paragraph("TEST NATIJALARI", subtitle_style))
-        
-        # Student name
-        story.append(Paragraph(f"<b>{student_name}</b>", name_style))
-        
-        story.append(Spacer(1, 0.3 * inch))
-        
-        # Test info
-        story.append(Paragraph(f"<b>Test:</b> {test_name}", info_style))
-        story.append(Paragraph(f"<b>Fan:</b> {subject}", info_style))
-        
-        story.append(Spacer(1, 0.4 * inch))
-        
-        # Results table
-        results_data = [
-            ['Ko\'rsatkich', 'Qiymat'],
-            ['To\'g\'ri javoblar', f'{score}/{max_score}'],
-            ['Natija (foiz)', f'{percentage:.1f}%'],
-            ['Daraja', grade],
-            ['Qobiliyat darajasi', ability],
-            ['T-Score', f'{t_score:.1f}'],
-            ['Theta (θ)', f'{theta:.2f}']
-        ]
-        
-        results_table = Table(results_data, colWidths=[3*inch, 2*inch])
-        results_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495E')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
-            ('BACKGROUND', (1, 3), (1, 3), grade_color),
-            ('TEXTCOLOR', (1, 3), (1, 3), colors.white),
-            ('FONTNAME', (1, 3), (1, 3), 'Helvetica-Bold'),
-        ]))
-        
-        story.append(results_table)
-        
-        story.append(Spacer(1, 0.5 * inch))
-        
-        # Explanation
-        explanation_style = ParagraphStyle(
-            'Explanation',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#7F8C8D'),
-            alignment=TA_CENTER,
-            leftIndent=50,
-            rightIndent=50
-        )
-        
-        story.append(Paragraph(
-            "<b>Tushuntirish:</b><br/>"
-            "• <b>T-Score:</b> Standartlashtirilgan ball (o'rtacha=50, standart og'ish=10)<br/>"
-            "• <b>Theta (θ):</b> Rasch modeli bo'yicha qobiliyat darajasi<br/>"
-            "• Yuqori theta qiymati yuqori qobiliyatni bildiradi",
-            explanation_style
-        ))
-        
-        story.append(Spacer(1, 0.8 * inch))
-        
-        # Footer with date
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#95A5A6'),
-            alignment=TA_CENTER
+
+        filepath = CertificateTemplate(test_name, subject).render(
+            os.path.join(self.output_dir, f"{filename}.pdf"),
+            {
+                'student_name': student_name,
+                'score': score,
+                'max_score': max_score,
+                'percentage': percentage,
+                'theta': theta,
+                't_score': t_score
+            }
         )
-        
-        current_date = datetime.now().strftime('%d.%m.%Y')
-        story.append(Paragraph(f"Sana: {current_date}", footer_style))
-        
-        # Build PDF
-        doc.build(story)
-        
+
         logger.info(f"Sertifikat yaratildi: {filepath}")
-        return filepath
\ No newline at end of file
+        return filepath
+
+    def generate_certificates(self, test_name: str, subject: str, students: List[Dict[str, Any]],
+                              processes: Optional[int] = None) -> List[str]:
+        """
+        Bitta test bo'yicha ko'p talabgorga sertifikat (shablon bir marta tayyorlanadi)
+
+        Args:
+            test_name: Test nomi
+            subject: Fan nomi
+            students: Har biri {'student_name', 'score', 'max_score', 'percentage', 'theta',
+                't_score', 'filename'} (filename - kengaytmasiz)
+            processes: Katta guruhlar uchun jarayonlar soni (ixtiyoriy)
+
+        Returns:
+            PDF fayl yo'llari (students tartibida)
+        """
+        return render_certificates(test_name, subject, students, self.output_dir, processes=processes)
@@ -0,0 +1,93 @@
+"""
+Og'ir ishlar uchun umumiy, uzoq yashaydigan jarayonlar havzasi
+
+Bot jarayonida asyncio sikli, executor oqimlari va Telegram mijozi oqimlari
+ishlaydi. Bunday jarayondan fork qilingan bola jarayon boshqa oqim ushlab turgan
+qulfni (masalan, logging) meros olib qotib qolishi mumkin. Shuning uchun havza
+'forkserver' (bo'lmasa 'spawn') usulida bir marta ochiladi va hisobotlar,
+varaqlar va sertifikatlar uchun qayta ishlatiladi: worker modullari forkserver
+ichida bir marta import qilinadi, har bir chaqiruvda yangi havza ochilmaydi.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Havzadagi jarayonlar soni (barcha o'qituvchilar uchun umumiy)
+POOL_WORKERS = min(4, os.cpu_count() or 1)
+
+# forkserver oldindan import qiladigan worker modullari - bola jarayonlar tayyor holda fork qilinadi
+PRELOAD_MODULES = [
+    'bot.utils.report_orchestrator',
+    'bot.utils.workbook_processor',
+    'bot.utils.certificates',
+]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _context() -> multiprocessing.context.BaseContext:
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Umumiy jarayonlar havzasini olish (birinchi chaqiruvda ochiladi)
+
+    Ish yuborish uchun submit_to_pool ishlatiladi - u buzilgan havzani almashtiradi.
+
+    Raises:
+        OSError/RuntimeError: Jarayon ochib bo'lmasa (cheklangan muhit) - chaqiruvchi
+            ketma-ket ishlashga o'tadi
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            context = _context()
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=context)
+            logger.info(f"⚙️ Jarayonlar havzasi ochildi: {POOL_WORKERS} ta jarayon ({context.get_start_method()})")
+        return _pool
+
+
+def submit_to_pool(fn: Callable[..., Any], *args: Any) -> Future:
+    """
+    Umumiy havzaga ish yuborish
+
+    Oldingi worker jarayoni kutilmaganda to'xtagan bo'lsa, havza buzilgan va submit
+    BrokenProcessPool ko'taradi - havza yangisiga almashtiriladi va ish qayta yuboriladi.
+    """
+    pool = get_process_pool()
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        logger.warning("Jarayonlar havzasi buzilgan - yangisi ochiladi")
+        _discard_pool(pool)
+        return get_process_pool().submit(fn, *args)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Buzilgan havzani umumiy havza sifatida olib tashlash (boshqa oqim allaqachon almashtirgan bo'lishi mumkin)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """Havzani yopish (bot to'xtaganda yoki testlarda)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
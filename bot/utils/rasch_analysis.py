@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from girth import rasch_mml
+from girth import INVALID_RESPONSE, rasch_mml
 from typing import Dict, Any
 
 
@@ -24,7 +24,11 @@ class RaschAnalyzer:
         Returns:
             Dictionary containing analysis results
         """
-        response_matrix = data.values
+        # Nullable (Int8) ustunlar ham oddiy matritsaga, bo'sh qiymatlar NaN
+        response_matrix = data.to_numpy(dtype=float, na_value=np.nan)
+        if not np.isnan(response_matrix).any():
+            # girth butun sonli javoblarni kutadi
+            response_matrix = response_matrix.astype(int)
         
         # Validate data before analysis
         if response_matrix.size == 0:
@@ -45,8 +49,12 @@ class RaschAnalyzer:
             raise ValueError("Ma'lumotlar faqat 0 va 1 qiymatlarini o'z ichiga olishi kerak. File Analyzer orqali faylni tozalang.")
         
         # girth expects data as (items x persons), so we transpose
+        # Bo'sh javoblar girth uchun INVALID_RESPONSE bilan belgilanadi (NaN indeks sifatida ishlamaydi)
+        girth_matrix = response_matrix
+        if girth_matrix.dtype.kind == 'f':
+            girth_matrix = np.where(np.isnan(girth_matrix), INVALID_RESPONSE, girth_matrix).astype(int)
         try:
-            rasch_result = rasch_mml(response_matrix.T)
+            rasch_result = rasch_mml(girth_matrix.T)
         except Exception as e:
             raise RuntimeError(f"Rasch tahlili amalga oshirilmadi. Sabab: {str(e)}. Iltimos, ma'lumotlaringizni tekshiring.")
         
@@ -140,7 +148,7 @@ class RaschAnalyzer:
     def _estimate_reliability(self, responses: np.ndarray, 
                              difficulty: np.ndarray) -> float:
         """Estimate person separation reliability (similar to Cronbach's alpha)"""
-        person_scores = np.sum(responses, axis=1)
+        person_scores = np.nansum(responses, axis=1)
         observed_variance = np.var(person_scores)
         
         if observed_variance == 0:
@@ -164,8 +172,8 @@ class RaschAnalyzer:
         """Calculate detailed statistics for each person"""
         n_persons = responses.shape[0]
         
-        # Calculate raw scores
-        raw_scores = np.sum(responses, axis=1)
+        # Calculate raw scores (bo'sh javoblar hisobga olinmaydi)
+        raw_scores = np.nansum(responses, axis=1)
         
         # Calculate standard scores (z-scores) for abilities
         valid_abilities = abilities[~np.isnan(abilities)]
@@ -0,0 +1,218 @@
+"""
+PDF hisobotlar uchun vektor grafiklar (reportlab.graphics)
+
+Grafiklar to'g'ridan-to'g'ri ReportLab Drawing sifatida quriladi: matplotlib
+import qilinmaydi, rasm piksellarga aylantirilmaydi, natija har qanday
+o'lchamda aniq va PDF hajmi kichik. Global holat yo'q - oqimlarda (threads)
+bir vaqtda xavfsiz ishlatiladi.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.shapes import Drawing, Group, Line, Rect, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+from bot.utils import report_styles
+
+GRID_COLOR = colors.HexColor('#D5D8DC')
+GRADE_COLORS = {
+    'A+': '#2ECC71', 'A': '#3498DB', 'B+': '#9B59B6',
+    'B': '#F39C12', 'C+': '#E67E22', 'C': '#E74C3C', 'NC': '#95A5A6'
+}
+
+# Wright map: bir qatordagi 'X' belgilari chegarasi va savol yorliqlarini surish qadamlari (logit)
+WRIGHT_MAP_BIN_WIDTH = 0.3
+WRIGHT_MAP_MAX_MARKS = 12
+WRIGHT_MAP_LABEL_GAP = 0.12
+WRIGHT_MAP_LABEL_STEP = 0.15
+WRIGHT_MAP_MAX_LABEL_OFFSET = 0.6
+
+
+def sweep_label_offsets(sorted_values: np.ndarray, min_gap: float = WRIGHT_MAP_LABEL_GAP,
+                        step: float = WRIGHT_MAP_LABEL_STEP,
+                        max_offset: float = WRIGHT_MAP_MAX_LABEL_OFFSET) -> np.ndarray:
+    """
+    Tartiblangan qiymatlar uchun yorliqlarning gorizontal siljishi (bitta o'tish)
+
+    Oldingi qiymatga min_gap dan yaqin bo'lsa yorliq bir qadam o'ngga suriladi,
+    max_offset dan oshsa yana boshiga qaytadi.
+    """
+    offsets = np.zeros(len(sorted_values))
+    for i in range(1, len(sorted_values)):
+        if sorted_values[i] - sorted_values[i - 1] < min_gap:
+            offset = offsets[i - 1] + step
+            offsets[i] = offset if offset <= max_offset else 0.0
+    return offsets
+
+
+def _vertical_label(text: str, x: float, y: float, fontSize: float) -> Group:
+    """(x, y) markazli, 90° ga burilgan yozuv (o'q nomlari uchun)"""
+    label = String(0, 0, text, fontName=report_styles.fonts().regular, fontSize=fontSize, textAnchor='middle')
+    return Group(label, transform=(0, 1, -1, 0, x, y))
+
+
+def _bar_chart(drawing: Drawing, values: Sequence[float], labels: List[str],
+               title: str, x_label: str, y_label: str) -> VerticalBarChart:
+    """Sarlavha va o'q nomlari bilan ustunli diagramma (drawing ga qo'shiladi)"""
+    width, height = drawing.width, drawing.height
+    font = report_styles.fonts()
+
+    chart = VerticalBarChart()
+    chart.x, chart.y = 50, 40
+    chart.width, chart.height = width - 70, height - 75
+    chart.data = [list(values)]
+    chart.strokeColor = None
+    chart.categoryAxis.categoryNames = labels
+    chart.categoryAxis.labels.fontName = font.regular
+    chart.categoryAxis.labels.fontSize = 8
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = font.regular
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = GRID_COLOR
+    chart.valueAxis.gridStrokeDashArray = (2, 2)
+    chart.valueAxis.labelTextFormat = lambda value: f"{value:g}"
+    chart.bars[0].strokeColor = colors.black
+    chart.bars[0].strokeWidth = 0.5
+    drawing.add(chart)
+
+    drawing.add(String(width / 2, height - 18, title, fontName=font.bold, fontSize=12, textAnchor='middle'))
+    drawing.add(String(chart.x + chart.width / 2, 8, x_label, fontName=font.regular, fontSize=9, textAnchor='middle'))
+    drawing.add(_vertical_label(y_label, 14, chart.y + chart.height / 2, fontSize=9))
+    return chart
+
+
+def t_score_histogram(t_scores: Sequence[float], width: float = 6 * inch, height: float = 3.6 * inch,
+                      bins: int = 10) -> Drawing:
+    """T-Score taqsimoti gistogrammasi"""
+    counts, edges = np.histogram(np.asarray(t_scores, dtype=float), bins=bins)
+    labels = [f"{(left + right) / 2:.0f}" for left, right in zip(edges[:-1], edges[1:])]
+
+    drawing = Drawing(width, height)
+    chart = _bar_chart(drawing, counts.tolist(), labels, "T-Score Distribution", "T-Score", "Frequency")
+    chart.barSpacing = 0
+    chart.groupSpacing = 0
+    chart.bars[0].fillColor = colors.HexColor('#87CEEB')
+    return drawing
+
+
+def grade_distribution_chart(grade_counts: Dict[str, int], width: float = 6 * inch,
+                             height: float = 3.5 * inch) -> Drawing:
+    """Darajalar taqsimoti (har bir daraja o'z rangida, ustida soni)"""
+    grades = list(grade_counts)
+
+    drawing = Drawing(width, height)
+    chart = _bar_chart(drawing, [grade_counts[g] for g in grades], grades,
+                       "Darajalar Taqsimoti", "Daraja", "Talabgorlar Soni")
+    if max(grade_counts.values(), default=0) <= 8:
+        chart.valueAxis.valueStep = 1  # kichik sonlarda kasr bo'linmalar bo'lmasin
+    for idx, grade in enumerate(grades):
+        chart.bars[(0, idx)].fillColor = colors.HexColor(GRADE_COLORS.get(grade, '#95A5A6'))
+    chart.barLabelFormat = lambda value: f"{int(value)}" if value else ""
+    chart.barLabels.nudge = 6
+    chart.barLabels.fontName = report_styles.fonts().bold
+    chart.barLabels.fontSize = 8
+    return drawing
+
+
+def wright_map(person_ability: np.ndarray, item_difficulty: np.ndarray, item_names: Sequence[str],
+               width: float = 6 * inch, height: float = 5 * inch) -> Drawing:
+    """
+    Wright Map (Item-Person Map) - klassik matnli format
+
+    Chapda talabgorlar: har bir 0.3 logit oralig'i uchun bitta 'XXX' qatori (oraliq
+    qatorga sig'masa bitta X bir nechta talabgorni bildiradi). O'ngda savollar:
+    qiyinchilik bo'yicha tartiblangan belgilar, yaqin yorliqlar yonga suriladi.
+
+    Args:
+        person_ability: Qobiliyatlar (NaN'siz)
+        item_difficulty: Qiyinchiliklar (NaN'siz)
+        item_names: Savol nomlari (item_difficulty tartibida)
+    """
+    person_ability = np.asarray(person_ability, dtype=float)
+    item_difficulty = np.asarray(item_difficulty, dtype=float)
+    item_names = np.asarray(item_names, dtype=object)
+    font = report_styles.fonts()
+
+    all_measures = np.concatenate([person_ability, item_difficulty])
+    min_measure = float(np.floor(all_measures.min() - 0.5))
+    max_measure = float(np.ceil(all_measures.max() + 0.5))
+
+    drawing = Drawing(width, height)
+    top, bottom, left = height - 45, 50, 45
+    persons_right = left + (width - left - 10) * 0.5
+    items_left = persons_right + 6
+    items_right = width - 10
+    scale = (top - bottom) / (max_measure - min_measure)
+
+    def y_of(measure):
+        return bottom + (measure - min_measure) * scale
+
+    drawing.add(String(width / 2, height - 16, 'Wright Map (Item-Person Map)',
+                       fontName=font.bold, fontSize=12, textAnchor='middle'))
+    drawing.add(String((left + persons_right) / 2, top + 8, 'TALABGORLAR',
+                       fontName=font.bold, fontSize=9, textAnchor='middle'))
+    drawing.add(String((items_left + items_right) / 2, top + 8, 'SAVOLLAR',
+                       fontName=font.bold, fontSize=9, textAnchor='middle'))
+
+    # Logit shkalasi: har 0.5 da chiziq, butun sonlarda yozuv
+    for tick in np.arange(np.ceil(min_measure), np.floor(max_measure) + 0.5, 0.5):
+        y = y_of(tick)
+        drawing.add(Line(left, y, items_right, y, strokeColor=GRID_COLOR, strokeWidth=0.4,
+                         strokeDashArray=(2, 2)))
+        if float(tick).is_integer():
+            drawing.add(String(left - 4, y - 3, f"{tick:.0f}", fontName=font.regular, fontSize=7,
+                               textAnchor='end'))
+    drawing.add(_vertical_label('Logits (Qobiliyat / Qiyinchilik)', 14, (top + bottom) / 2, fontSize=8))
+    drawing.add(Line(persons_right + 3, bottom, persons_right + 3, top, strokeColor=colors.black, strokeWidth=0.8))
+    drawing.add(Line(left, y_of(0), items_right, y_of(0), strokeColor=colors.black, strokeWidth=0.8))
+
+    # Talabgorlar: har bir oraliq - bitta matn qatori
+    bins = np.arange(min_measure, max_measure + WRIGHT_MAP_BIN_WIDTH, WRIGHT_MAP_BIN_WIDTH)
+    counts, edges = np.histogram(person_ability, bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    persons_per_mark = max(1, int(np.ceil(counts.max() / WRIGHT_MAP_MAX_MARKS)))
+    marks = np.ceil(counts / persons_per_mark).astype(int)
+    mark_size = min(9.0, WRIGHT_MAP_BIN_WIDTH * scale * 0.9)
+    for center, n_marks in zip(centers[marks > 0], marks[marks > 0]):
+        drawing.add(String(persons_right - 2, y_of(center) - mark_size * 0.35, 'X' * int(n_marks),
+                           fontName=font.bold, fontSize=mark_size, fillColor=colors.HexColor('#2E86AB'),
+                           textAnchor='end'))
+
+    # Savollar: tartiblangan, yaqinlari yonga surilgan
+    order = np.argsort(item_difficulty)
+    sorted_difficulty = item_difficulty[order]
+    label_step = (items_right - items_left) / 2.7  # 1 siljish birligi (pt)
+    label_size = 6.5
+    min_gap = max(WRIGHT_MAP_LABEL_GAP, label_size / scale)  # yorliq balandligi (logitda)
+    item_x = items_left + (0.3 + sweep_label_offsets(sorted_difficulty, min_gap=min_gap)) * label_step
+    marker = 4.0
+    for x, difficulty, name in zip(item_x, sorted_difficulty, item_names[order]):
+        y = y_of(difficulty)
+        drawing.add(Rect(x - marker / 2, y - marker / 2, marker, marker, fillColor=colors.HexColor('#E63946'),
+                         strokeColor=colors.HexColor('#8B0000'), strokeWidth=0.5))
+        drawing.add(String(x + marker, y - 2.5, str(name), fontName=font.bold, fontSize=label_size))
+
+    # O'rtacha qiymatlar
+    mean_ability = float(person_ability.mean())
+    mean_difficulty = float(item_difficulty.mean())
+    drawing.add(Line(left, y_of(mean_ability), persons_right, y_of(mean_ability),
+                     strokeColor=colors.HexColor('#A23B72'), strokeWidth=1.2, strokeDashArray=(4, 2)))
+    drawing.add(Line(items_left, y_of(mean_difficulty), items_right, y_of(mean_difficulty),
+                     strokeColor=colors.HexColor('#F77F00'), strokeWidth=1.2, strokeDashArray=(4, 2)))
+
+    stats_text = (
+        f"Talabgorlar: {len(person_ability)} (o'rtacha {mean_ability:.2f}) | "
+        f"Savollar: {len(item_difficulty)} (o'rtacha {mean_difficulty:.2f})"
+    )
+    range_text = (
+        f"Qobiliyat: {person_ability.min():.2f} - {person_ability.max():.2f} | "
+        f"Qiyinchilik: {item_difficulty.min():.2f} - {item_difficulty.max():.2f}"
+    )
+    if persons_per_mark > 1:
+        range_text += f" | Har bir X = {persons_per_mark} talabgor"
+    drawing.add(String(width / 2, 26, stats_text, fontName=font.oblique, fontSize=8, textAnchor='middle'))
+    drawing.add(String(width / 2, 14, range_text, fontName=font.oblique, fontSize=8, textAnchor='middle'))
+    return drawing
@@ -0,0 +1,202 @@
+"""
+Hisobotlarni parallel yaratish va tayyor bo'lishi bilan yuborish
+
+Umumiy statistika, talabgorlar va bo'limlar hisobotlari bir-biriga bog'liq emas:
+ular bir vaqtda umumiy jarayonlar havzasida quriladi (har biri o'z ReportLab
+holati bilan), hammasi bitta ish papkasiga yoziladi. Qaysi PDF birinchi tayyor
+bo'lsa, o'sha darhol Telegramga yuklanadi - qolganlari shu orada qurilishda
+davom etadi. Tahlil natijasi ish papkasiga bir marta pickle qilinadi - har bir
+buyurtma bilan qayta uzatilmaydi.
+
+Jarayonlar havzasini ochib bo'lmasa (cheklangan muhit yoki bitta protsessor),
+hisobotlar bitta fon oqimida ketma-ket quriladi - yuklash baribir keyingi
+hisobot qurilishi bilan ustma-ust ketadi.
+"""
+import asyncio
+import dataclasses
+import logging
+import os
+import pickle
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bot.utils.pdf_generator import PDFReportGenerator
+from bot.utils.process_pool import submit_to_pool
+
+logger = logging.getLogger(__name__)
+
+# Hisobot turi -> PDFReportGenerator metodi
+REPORT_METHODS = {
+    'general': 'generate_report',
+    'person': 'generate_person_results_report',
+    'section': 'generate_section_results_report',
+}
+
+# 1 dan ko'p bo'lsa hisobotlar umumiy jarayonlar havzasida quriladi (1 - bitta fon oqimida)
+MAX_REPORT_WORKERS = min(3, os.cpu_count() or 1)
+
+
+@dataclass(eq=False)
+class ReportTask:
+    """
+    Bitta PDF hisobot buyurtmasi
+
+    Args:
+        kind: 'general', 'person' yoki 'section'
+        results: RaschAnalyzer.fit natijasi
+        caption: Telegram xabari izohi
+        filename: generate_* metodiga uzatiladigan fayl nomi
+        section_questions: Bo'limlar (person/section hisobotlari uchun)
+        upload_name: Telegramdagi fayl nomi (default: PDF fayl nomi)
+    """
+    kind: str
+    results: Optional[Dict[str, Any]]
+    caption: str
+    filename: Optional[str] = None
+    section_questions: Optional[Dict[str, list]] = None
+    upload_name: Optional[str] = None
+    # Jarayonga uzatishda results o'rniga pickle fayl yo'li
+    results_path: Optional[str] = None
+
+
+@lru_cache(maxsize=1)
+def _load_results(results_path: str) -> Dict[str, Any]:
+    """Worker jarayonida natijani o'qish (bir jarayonga tushgan keyingi buyurtma qayta o'qimaydi)"""
+    with open(results_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def build_report(output_dir: str, job_id: str, task: ReportTask) -> str:
+    """
+    Bitta hisobotni qurish (jarayonlar o'rtasida uzatiladi - modul darajasida)
+
+    Returns:
+        PDF fayl yo'li
+    """
+    results = task.results if task.results is not None else _load_results(task.results_path)
+    generator = PDFReportGenerator(output_dir=output_dir, job_id=job_id)
+    method = getattr(generator, REPORT_METHODS[task.kind])
+    if task.kind == 'general':
+        return method(results, filename=task.filename)
+    return method(results, filename=task.filename, section_questions=task.section_questions)
+
+
+def _detach_results(pdf_generator: PDFReportGenerator, tasks: List[ReportTask]) -> List[ReportTask]:
+    """
+    Har bir alohida natijani ish papkasiga bir marta pickle qilish
+
+    Qaytarilgan buyurtmalarda results o'rniga fayl yo'li - jarayonga faqat kichik buyurtma uzatiladi.
+    """
+    paths: Dict[int, str] = {}
+    detached = []
+    for task in tasks:
+        key = id(task.results)
+        if key not in paths:
+            # Noyob nom: worker jarayonidagi kesh boshqa chaqiruvning faylini qaytarmasligi uchun
+            paths[key] = os.path.join(pdf_generator.output_dir, f"results_{uuid.uuid4().hex}.pkl")
+            with open(paths[key], 'wb') as f:
+                pickle.dump(task.results, f, protocol=pickle.HIGHEST_PROTOCOL)
+        detached.append(dataclasses.replace(task, results=None, results_path=paths[key]))
+    return detached
+
+
+def _submit_all(submit: Callable[..., Future], pdf_generator: PDFReportGenerator,
+                tasks: List[ReportTask], submitted: List[ReportTask]) -> Dict[asyncio.Future, ReportTask]:
+    return {
+        asyncio.wrap_future(submit(build_report, pdf_generator.base_dir, pdf_generator.job_id, sent)): task
+        for task, sent in zip(tasks, submitted)
+    }
+
+
+async def generate_reports(pdf_generator: PDFReportGenerator, tasks: List[ReportTask],
+                           max_workers: Optional[int] = None) -> AsyncIterator[Tuple[ReportTask, str]]:
+    """
+    Hisobotlarni bir vaqtda qurish va tayyor bo'lish tartibida qaytarish
+
+    Barcha buyurtmalar darhol yuboriladi; iste'molchi bitta PDF ni yuklayotganda
+    qolganlari qurilishda davom etadi. Hisobot xatoligi iste'molchiga ko'tariladi
+    (qolgan buyurtmalar bekor qilinadi).
+
+    Args:
+        pdf_generator: Ish papkasi (hisobotlar shu ishga yoziladi)
+        tasks: Hisobot buyurtmalari
+        max_workers: 1 - bitta fon oqimida ketma-ket, ko'proq - umumiy jarayonlar
+            havzasida (default: MAX_REPORT_WORKERS)
+
+    Yields:
+        (buyurtma, PDF fayl yo'li)
+    """
+    if not tasks:
+        return
+
+    loop = asyncio.get_running_loop()
+    workers = min(max_workers or MAX_REPORT_WORKERS, len(tasks))
+    pending: Dict[asyncio.Future, ReportTask] = {}
+    detached: List[ReportTask] = []
+
+    if workers > 1:
+        try:
+            detached = await loop.run_in_executor(None, _detach_results, pdf_generator, tasks)
+            pending = _submit_all(submit_to_pool, pdf_generator, tasks, detached)
+        except (OSError, RuntimeError) as e:
+            # Jarayon ochib bo'lmasa (cheklangan muhit) - ketma-ket ishlash
+            logger.warning(f"Jarayonlar havzasini ishga tushirib bo'lmadi, hisobotlar ketma-ket quriladi: {e}")
+            pending = {}
+
+    # Umumiy havza yopilmaydi - faqat shu chaqiruvning fon oqimi
+    own_executor = None
+    if not pending:
+        own_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reports')
+        pending = _submit_all(own_executor.submit, pdf_generator, tasks, tasks)
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in [future for future in pending if future in done]:
+                task = pending.pop(future)
+                try:
+                    path = future.result()
+                except BrokenProcessPool as e:
+                    logger.warning(f"Hisobot jarayoni to'xtadi, '{task.kind}' qayta quriladi: {e}")
+                    path = await loop.run_in_executor(
+                        None, build_report, pdf_generator.base_dir, pdf_generator.job_id, task
+                    )
+                logger.info(f"📄 Hisobot tayyor: {os.path.basename(path)}")
+                yield task, path
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor is not None:
+            own_executor.shutdown(wait=False, cancel_futures=True)
+        for task in detached:
+            if task.results_path and os.path.exists(task.results_path):
+                os.remove(task.results_path)
+
+
+async def send_reports(pdf_generator: PDFReportGenerator, tasks: List[ReportTask],
+                       send_document: Callable[..., Awaitable[Any]],
+                       max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Hisobotlarni parallel qurib, har birini tayyor bo'lishi bilan yuborish
+
+    Args:
+        send_document: document/filename/caption qabul qiladigan korutina
+            (masalan, message.reply_document yoki partial(bot.send_document, chat_id=...))
+
+    Returns:
+        {hisobot turi: PDF fayl yo'li} (bir turdagi bir nechta hisobotda - oxirgisi)
+    """
+    paths = {}
+    async for task, path in generate_reports(pdf_generator, tasks, max_workers):
+        with open(path, 'rb') as pdf_file:
+            await send_document(
+                document=pdf_file,
+                filename=task.upload_name or os.path.basename(path),
+                caption=task.caption
+            )
+        paths[task.kind] = path
+    return paths
@@ -0,0 +1,199 @@
+"""
+Hisobotlar uchun umumiy shriftlar, paragraf va jadval uslublari
+
+Uslublar har bir jarayonda bir marta quriladi va barcha hisobot turlari
+(umumiy statistika, talabgorlar, bo'limlar, sertifikatlar, grafiklar) tomonidan
+qayta ishlatiladi. Kirill va o'zbek harflarini (ʻ, ғ, қ, ў, ҳ, θ) chiqarish uchun
+DejaVuSans TTF shrifti bir marta ro'yxatdan o'tkaziladi; topilmasa standart
+Helvetica ishlatiladi.
+
+Qaytarilgan obyektlar umumiy - ularni o'zgartirmang; boshqa uslub kerak bo'lsa
+ParagraphStyle(..., parent=...) yoki yangi TableStyle quring.
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.fonts import addMapping
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+logger = logging.getLogger(__name__)
+
+# Shrift qidiriladigan papkalar; REPORT_FONT_DIR muhit o'zgaruvchisi birinchi tekshiriladi
+FONT_SEARCH_DIRS = (
+    'assets/fonts',
+    '/usr/share/fonts/truetype/dejavu',
+    '/usr/share/fonts/dejavu',
+    '/usr/share/fonts/TTF',
+    '/usr/local/share/fonts',
+    '/Library/Fonts',
+    'C:\\Windows\\Fonts',
+)
+
+UNICODE_FONT_FAMILY = 'DejaVuSans'
+UNICODE_FONT_FILES = {
+    'regular': 'DejaVuSans.ttf',
+    'bold': 'DejaVuSans-Bold.ttf',
+    'oblique': 'DejaVuSans-Oblique.ttf',
+}
+
+HEADER_TEXT_COLOR = colors.whitesmoke
+BODY_BACKGROUND = colors.HexColor('#ECF0F1')
+STRIPE_COLORS = [colors.white, colors.HexColor('#F8F9FA')]
+
+
+class ReportFonts(NamedTuple):
+    """Hisobotlarda ishlatiladigan shrift nomlari"""
+    regular: str
+    bold: str
+    oblique: str
+
+    @property
+    def is_unicode(self) -> bool:
+        """Kirill/o'zbek harflari chiqadimi (TTF ro'yxatdan o'tgan)"""
+        return self.regular == UNICODE_FONT_FAMILY
+
+
+FALLBACK_FONTS = ReportFonts('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique')
+
+
+def _find_font_file(filename: str, search_dirs: Tuple[str, ...]) -> Optional[str]:
+    for directory in search_dirs:
+        path = os.path.join(directory, filename)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def fonts() -> ReportFonts:
+    """
+    Unicode shriftni bir marta ro'yxatdan o'tkazish
+
+    Returns:
+        ReportFonts - DejaVuSans (oddiy/qalin/qiya) yoki Helvetica oilasi
+    """
+    search_dirs = tuple(filter(None, (os.getenv('REPORT_FONT_DIR'),))) + FONT_SEARCH_DIRS
+    regular_path = _find_font_file(UNICODE_FONT_FILES['regular'], search_dirs)
+    bold_path = _find_font_file(UNICODE_FONT_FILES['bold'], search_dirs)
+    if not regular_path or not bold_path:
+        logger.warning("⚠️ DejaVuSans shrifti topilmadi - hisobotlarda Helvetica ishlatiladi "
+                       "(kirill harflari chiqmasligi mumkin)")
+        return FALLBACK_FONTS
+
+    regular = UNICODE_FONT_FAMILY
+    bold = f"{UNICODE_FONT_FAMILY}-Bold"
+    oblique_path = _find_font_file(UNICODE_FONT_FILES['oblique'], search_dirs)
+    # Qiya shakl bo'lmasa oddiy shakl ishlatiladi
+    oblique = f"{UNICODE_FONT_FAMILY}-Oblique" if oblique_path else regular
+
+    try:
+        pdfmetrics.registerFont(TTFont(regular, regular_path))
+        pdfmetrics.registerFont(TTFont(bold, bold_path))
+        if oblique_path:
+            pdfmetrics.registerFont(TTFont(oblique, oblique_path))
+    except Exception as e:
+        logger.warning(f"⚠️ DejaVuSans shriftini yuklab bo'lmadi ({e}) - Helvetica ishlatiladi")
+        return FALLBACK_FONTS
+
+    # Paragraph ichidagi <b>/<i> teglari uchun oila
+    addMapping(regular, 0, 0, regular)
+    addMapping(regular, 1, 0, bold)
+    addMapping(regular, 0, 1, oblique)
+    addMapping(regular, 1, 1, bold)
+    logger.info(f"🔤 Hisobot shrifti ro'yxatdan o'tdi: {regular_path}")
+    return ReportFonts(regular, bold, oblique)
+
+
+@lru_cache(maxsize=None)
+def stylesheet() -> StyleSheet1:
+    """
+    Namuna uslublar (Normal, Heading1, ...) va hisobot uslublari:
+    CustomTitle, CustomHeading, Footer
+    """
+    font = fonts()
+    styles = getSampleStyleSheet()
+
+    # Namuna uslublari shriftini Unicode shriftga almashtirish
+    for name in ('Normal', 'BodyText', 'Italic', 'Title', 'Heading1', 'Heading2', 'Heading3'):
+        style = styles[name]
+        if style.fontName.endswith('Bold'):
+            style.fontName = font.bold
+        elif style.fontName.endswith(('Italic', 'Oblique')):
+            style.fontName = font.oblique
+        else:
+            style.fontName = font.regular
+
+    styles.add(ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2C3E50'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    ))
+    styles.add(ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#34495E'),
+        spaceAfter=12,
+        spaceBefore=12
+    ))
+    styles.add(ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    ))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def info_table_style() -> TableStyle:
+    """Ikki ustunli ma'lumot jadvali (chapda qalin nomlar)"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), BODY_BACKGROUND),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), fonts().regular),
+        ('FONTNAME', (0, 0), (0, -1), fonts().bold),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+    ])
+
+
+def header_table_commands(header_color: str, align: str = 'CENTER', header_size: float = 11,
+                          body_size: float = 9, striped: bool = True) -> list:
+    """Rangli sarlavha qatorli jadval buyruqlari (katak buyruqlarini qo'shish uchun nusxa)"""
+    font = fonts()
+    commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), HEADER_TEXT_COLOR),
+        ('ALIGN', (0, 0), (-1, -1), align),
+        ('FONTNAME', (0, 0), (-1, -1), font.regular),
+        ('FONTNAME', (0, 0), (-1, 0), font.bold),
+        ('FONTSIZE', (0, 0), (-1, 0), header_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), BODY_BACKGROUND),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), body_size),
+    ]
+    if striped:
+        commands.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), STRIPE_COLORS))
+    return commands
+
+
+@lru_cache(maxsize=None)
+def header_table_style(header_color: str, align: str = 'CENTER', header_size: float = 11,
+                       body_size: float = 9, striped: bool = True) -> TableStyle:
+    """Rangli sarlavha qatorli jadval uslubi (parametrlar bo'yicha keshlanadi)"""
+    return TableStyle(header_table_commands(header_color, align, header_size, body_size, striped))
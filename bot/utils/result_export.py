@@ -0,0 +1,353 @@
+"""
+Tozalangan ma'lumotlar va tahlil natijalarini ustunli formatlarga eksport qilish
+
+Parquet (ustunli), XLSX (formulalar va shartli formatlash bilan) va CSV - PDF
+hisobotlarga tez alternativa: sahifa joylashuvi hisoblanmaydi, XLSX oqimli
+(write-only) rejimda qatorma-qator yoziladi.
+"""
+import importlib.util
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import ColorScaleRule, DataBarRule, FormulaRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from bot.utils.report_charts import GRADE_COLORS
+
+logger = logging.getLogger(__name__)
+
+# pyarrow ixtiyoriy - o'rnatilmagan bo'lsa Parquet eksporti o'chiriladi
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+PARQUET_COMPRESSION = 'zstd'
+
+# UZBMB darajalari: (T-Score chegarasi, daraja); pastrog'i - NC
+GRADE_THRESHOLDS = [(70, 'A+'), (65, 'A'), (60, 'B+'), (55, 'B'), (50, 'C+'), (46, 'C')]
+FAIL_GRADE = 'NC'
+
+# Foiz = T-Score / 65 × 100 (100 dan yuqorisi 100, 70 dan pasti 0)
+PERCENT_T_SCORE = 65
+MIN_PASSING_PERCENT = 70
+
+PERSONS_SHEET = 'Talabgorlar'
+ITEMS_SHEET = 'Savollar'
+SUMMARY_SHEET = 'Xulosa'
+# Teng T-Score'larni aniqlash uchun aniqlik (ko'rsatishdan ancha yuqori)
+T_SCORE_DECIMALS = 9
+
+HEADER_FILL = PatternFill('solid', fgColor='34495E')
+HEADER_FONT = Font(bold=True, color='FFFFFF')
+
+
+def persons_frame(results: Dict[str, Any]) -> pd.DataFrame:
+    """Har bir talabgor natijalari jadvali (RaschAnalyzer.fit natijasidan)"""
+    individual = results.get('person_statistics', {}).get('individual', [])
+    columns = ['person_id', 'person_name', 'raw_score', 'ability', 'se', 'z_score', 't_score']
+    frame = pd.DataFrame(individual, columns=columns)
+    return frame.astype({
+        'person_id': 'int32',
+        'raw_score': 'int32',
+        'ability': 'float64',
+        'se': 'float64',
+        'z_score': 'float64',
+        't_score': 'float64'
+    })
+
+
+def items_frame(results: Dict[str, Any]) -> pd.DataFrame:
+    """Har bir savol parametrlari jadvali (qiyinlik, o'rtacha, standart og'ish)"""
+    item_names = results.get('item_names', [])
+    stats = results.get('descriptive_stats', {})
+    item_means = stats.get('item_means', {})
+    item_sd = stats.get('item_sd', {})
+
+    return pd.DataFrame({
+        'item': [str(name) for name in item_names],
+        'difficulty': np.asarray(results.get('item_difficulty', []), dtype=float)[:len(item_names)],
+        'mean': [item_means.get(name, np.nan) for name in item_names],
+        'sd': [item_sd.get(name, np.nan) for name in item_names]
+    })
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parquet yozish uchun tayyorlash: ustun nomlari matn, aralash turdagi
+    object ustunlar matnga aylantiriladi (bo'sh qiymatlar saqlanadi)
+    """
+    safe = df.copy()
+    safe.columns = [str(col) for col in safe.columns]
+    for col in safe.columns:
+        if safe[col].dtype == 'object':
+            values = safe[col]
+            if not values.dropna().map(type).eq(str).all():
+                safe[col] = values.where(values.isna(), values.astype(str))
+    return safe
+
+
+def write_parquet(df: pd.DataFrame, file_path: str) -> str:
+    """
+    DataFrame'ni siqilgan Parquet faylga yozish
+
+    Raises:
+        RuntimeError: pyarrow o'rnatilmagan bo'lsa
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet eksporti uchun pyarrow o'rnatilmagan (pip install pyarrow)")
+
+    _arrow_safe(df).to_parquet(file_path, engine='pyarrow', compression=PARQUET_COMPRESSION, index=False)
+    return file_path
+
+
+def export_results_parquet(results: Dict[str, Any], output_dir: str, prefix: str = 'natijalar') -> Dict[str, str]:
+    """
+    Talabgorlar va savollar natijalarini alohida Parquet fayllarga yozish
+
+    Returns:
+        {'persons': fayl_yo'li, 'items': fayl_yo'li}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        'persons': write_parquet(persons_frame(results), os.path.join(output_dir, f"{prefix}_talabgorlar.parquet")),
+        'items': write_parquet(items_frame(results), os.path.join(output_dir, f"{prefix}_savollar.parquet"))
+    }
+    logger.info(f"📦 Parquet natijalar yozildi: {', '.join(paths.values())}")
+    return paths
+
+
+def t_score_percentages(t_scores: np.ndarray) -> np.ndarray:
+    """T-Score dan foiz (PDF hisobotdagi qoida bilan bir xil, NaN saqlanadi)"""
+    percentages = np.minimum(np.asarray(t_scores, dtype=float) / PERCENT_T_SCORE * 100, 100.0)
+    return np.where(percentages < MIN_PASSING_PERCENT, 0.0, percentages)
+
+
+def t_score_grades(t_scores: np.ndarray) -> np.ndarray:
+    """T-Score dan UZBMB darajasi (NaN uchun bo'sh satr)"""
+    t_scores = np.asarray(t_scores, dtype=float)
+    grades = np.select([t_scores >= limit for limit, _ in GRADE_THRESHOLDS],
+                       [grade for _, grade in GRADE_THRESHOLDS], FAIL_GRADE).astype(object)
+    grades[np.isnan(t_scores)] = ''
+    return grades
+
+
+def person_results_frame(results: Dict[str, Any],
+                         section_scores: Optional[Dict[str, List[Dict]]] = None) -> pd.DataFrame:
+    """
+    Talabgorlar natijalari T-Score bo'yicha kamayish tartibida, bo'lim T-Score'lari,
+    foiz va daraja bilan (XLSX/CSV eksporti uchun)
+
+    Args:
+        results: RaschAnalyzer.fit natijasi
+        section_scores: pdf_generator.calculate_section_scores natijasi
+    """
+    frame = persons_frame(results)
+    for section_name, scores in (section_scores or {}).items():
+        by_person = {score['person_id']: score['t_score'] for score in scores}
+        frame[section_name] = frame['person_id'].map(by_person).astype(float)
+
+    # Bir xil xom ballning T-Score'lari oxirgi xonalarda farq qilishi mumkin - o'rinlar
+    # (XLSX RANK() va CSV) teng chiqishi uchun T-Score shu aniqlikkacha yaxlitlanadi
+    frame['t_score'] = frame['t_score'].round(T_SCORE_DECIMALS)
+    frame = frame.sort_values('t_score', ascending=False, na_position='last', kind='stable')
+    frame['percentage'] = t_score_percentages(frame['t_score'].to_numpy())
+    frame['grade'] = t_score_grades(frame['t_score'].to_numpy())
+    return frame.reset_index(drop=True)
+
+
+def _header_row(sheet, titles: List[str]) -> List[WriteOnlyCell]:
+    cells = []
+    for title in titles:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cells.append(cell)
+    return cells
+
+
+def _cell_value(value: Any) -> Any:
+    """NaN/NA bo'sh katak bo'ladi, numpy sonlari Python turiga o'tadi"""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA:
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _grade_formula(t_cell: str) -> str:
+    formula = f'"{FAIL_GRADE}"'
+    for limit, grade in reversed(GRADE_THRESHOLDS):
+        formula = f'IF({t_cell}>={limit},"{grade}",{formula})'
+    return f'=IF({t_cell}="","",{formula})'
+
+
+def _percentage_formula(t_cell: str) -> str:
+    percent = f"{t_cell}/{PERCENT_T_SCORE}*100"
+    return f'=IF({t_cell}="","",ROUND(IF({percent}<{MIN_PASSING_PERCENT},0,MIN(100,{percent})),1))'
+
+
+def _write_persons_sheet(workbook: Workbook, frame: pd.DataFrame, section_names: List[str]) -> Dict[str, str]:
+    """
+    Talabgorlar varag'i: qiymatlar + formulalar (o'rin, foiz, daraja)
+
+    Returns:
+        Xulosa formulalari uchun ustun diapazonlari {'names', 't_score', 'grade'}
+    """
+    sheet = workbook.create_sheet(PERSONS_SHEET)
+    titles = (['O\'rin', 'Talabgor', 'Xom ball', 'Qobiliyat (θ)', 'SE', 'T-Score']
+              + [f"{name} (T-Score)" for name in section_names] + ['Foiz', 'Daraja'])
+    t_col = get_column_letter(6)
+    percent_col = get_column_letter(len(titles) - 1)
+    grade_col = get_column_letter(len(titles))
+    last_row = len(frame) + 1
+    t_range = f"${t_col}$2:${t_col}${max(last_row, 2)}"
+
+    for idx, width in enumerate([8, 28, 10, 13, 9, 10] + [16] * len(section_names) + [9, 9], start=1):
+        sheet.column_dimensions[get_column_letter(idx)].width = width
+    sheet.freeze_panes = 'C2'
+    sheet.append(_header_row(sheet, titles))
+
+    names = frame['person_name'].where(frame['person_name'].notna(), 'Talabgor ' + frame['person_id'].astype(str))
+    columns = [frame['raw_score'], frame['ability'].round(3), frame['se'].round(3)]
+    sections = [frame[name].round(1) for name in section_names]
+    for row_idx, (name, t_score, *values) in enumerate(zip(names, frame['t_score'], *columns, *sections), start=2):
+        t_cell = f"{t_col}{row_idx}"
+        # T-Score to'liq aniqlikda (daraja formulasi PDF bilan bir xil chiqsin), ko'rinishi 0.0
+        t_value = WriteOnlyCell(sheet, value=_cell_value(t_score))
+        t_value.number_format = '0.0'
+        values = [_cell_value(value) for value in values]
+        sheet.append(
+            [f'=IF({t_cell}="","",RANK({t_cell},{t_range}))', name]
+            + values[:3] + [t_value] + values[3:]
+            + [_percentage_formula(t_cell), _grade_formula(t_cell)]
+        )
+
+    if len(frame):
+        sheet.conditional_formatting.add(
+            f"{t_col}2:{t_col}{last_row}",
+            ColorScaleRule(start_type='min', start_color='F8696B', mid_type='percentile', mid_value=50,
+                           mid_color='FFEB84', end_type='max', end_color='63BE7B')
+        )
+        sheet.conditional_formatting.add(
+            f"{percent_col}2:{percent_col}{last_row}",
+            DataBarRule(start_type='num', start_value=0, end_type='num', end_value=100, color='5DADE2')
+        )
+        grade_range = f"{grade_col}2:{grade_col}{last_row}"
+        for grade, color in GRADE_COLORS.items():
+            sheet.conditional_formatting.add(grade_range, FormulaRule(
+                formula=[f'${grade_col}2="{grade}"'],
+                fill=PatternFill('solid', fgColor=color.lstrip('#'), bgColor=color.lstrip('#')),
+                font=Font(bold=True, color='FFFFFF')
+            ))
+
+    return {
+        'names': f"'{PERSONS_SHEET}'!$B$2:$B${max(last_row, 2)}",
+        't_score': f"'{PERSONS_SHEET}'!{t_range}",
+        'grade': f"'{PERSONS_SHEET}'!${grade_col}$2:${grade_col}${max(last_row, 2)}",
+    }
+
+
+def _write_items_sheet(workbook: Workbook, frame: pd.DataFrame) -> None:
+    """Savollar varag'i: qiyinlik, o'rtacha, SD va qiyinlik toifasi (formula)"""
+    sheet = workbook.create_sheet(ITEMS_SHEET)
+    for idx, width in enumerate([16, 11, 11, 11, 12], start=1):
+        sheet.column_dimensions[get_column_letter(idx)].width = width
+    sheet.freeze_panes = 'B2'
+    sheet.append(_header_row(sheet, ['Savol', 'Qiyinlik', "O'rtacha", 'SD', 'Toifa']))
+
+    for row_idx, (item, difficulty, mean, sd) in enumerate(zip(
+            frame['item'], frame['difficulty'].round(3), frame['mean'].round(3), frame['sd'].round(3)), start=2):
+        sheet.append([item, _cell_value(difficulty), _cell_value(mean), _cell_value(sd),
+                      f'=IF(B{row_idx}="","",IF(B{row_idx}>=1,"Qiyin",IF(B{row_idx}<=-1,"Oson","O\'rtacha")))'])
+
+    last_row = len(frame) + 1
+    if len(frame):
+        sheet.conditional_formatting.add(
+            f"B2:B{last_row}",
+            ColorScaleRule(start_type='min', start_color='63BE7B', mid_type='num', mid_value=0,
+                           mid_color='FFFFFF', end_type='max', end_color='F8696B')
+        )
+        sheet.conditional_formatting.add(
+            f"C2:C{last_row}",
+            DataBarRule(start_type='num', start_value=0, end_type='num', end_value=1, color='5DADE2')
+        )
+
+
+def _write_summary_sheet(workbook: Workbook, results: Dict[str, Any], ranges: Dict[str, str]) -> None:
+    """Xulosa varag'i: talabgorlar varag'idan formulalar bilan hisoblanadigan ko'rsatkichlar"""
+    sheet = workbook.create_sheet(SUMMARY_SHEET)
+    sheet.column_dimensions['A'].width = 26
+    sheet.column_dimensions['B'].width = 14
+    sheet.append(_header_row(sheet, ["Ko'rsatkich", 'Qiymat']))
+
+    t_range, grade_range = ranges['t_score'], ranges['grade']
+    sheet.append(['Talabgorlar soni', f"=COUNTA({ranges['names']})"])
+    sheet.append(['Savollar soni', _cell_value(results.get('n_items'))])
+    sheet.append(['Ishonchlilik', _cell_value(round(float(results.get('reliability', np.nan)), 3))])
+    sheet.append(["O'rtacha T-Score", f'=IFERROR(ROUND(AVERAGE({t_range}),1),"")'])
+    sheet.append(["T-Score standart og'ishi", f'=IFERROR(ROUND(STDEV({t_range}),1),"")'])
+    for _, grade in GRADE_THRESHOLDS + [(None, FAIL_GRADE)]:
+        sheet.append([f"{grade} darajasi", f'=COUNTIF({grade_range},"{grade}")'])
+
+
+def export_results_excel(results: Dict[str, Any], output_dir: str, prefix: str = 'natijalar',
+                         section_scores: Optional[Dict[str, List[Dict]]] = None) -> str:
+    """
+    Talabgorlar, savollar va xulosani bitta XLSX faylga yozish
+
+    Fayl oqimli (write-only) rejimda yoziladi: xotirada faqat joriy qator turadi.
+    O'rin, foiz, daraja va xulosa ko'rsatkichlari Excel formulalari, T-Score,
+    foiz, daraja va qiyinlik ustunlari shartli formatlangan.
+
+    Args:
+        results: RaschAnalyzer.fit natijasi
+        output_dir: Fayl yoziladigan papka
+        prefix: Fayl nomi boshi
+        section_scores: Bo'lim T-Score'lari (pdf_generator.calculate_section_scores)
+
+    Returns:
+        XLSX fayl yo'li
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    section_names = list(section_scores or {})
+    persons = person_results_frame(results, section_scores)
+
+    workbook = Workbook(write_only=True)
+    ranges = _write_persons_sheet(workbook, persons, section_names)
+    _write_items_sheet(workbook, items_frame(results))
+    _write_summary_sheet(workbook, results, ranges)
+
+    path = os.path.join(output_dir, f"{prefix}.xlsx")
+    workbook.save(path)
+    logger.info(f"📗 XLSX natijalar yozildi: {path} ({len(persons)} talabgor)")
+    return path
+
+
+def export_results_csv(results: Dict[str, Any], output_dir: str, prefix: str = 'natijalar',
+                       section_scores: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, str]:
+    """
+    Talabgorlar va savollar natijalarini alohida CSV fayllarga yozish
+
+    CSV formulalarni saqlamaydi - foiz va daraja tayyor qiymat sifatida yoziladi.
+    Excel kirill harflarini to'g'ri ochishi uchun UTF-8 BOM bilan.
+
+    Returns:
+        {'persons': fayl_yo'li, 'items': fayl_yo'li}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # T-Score ham to'liq aniqlikda - daraja va foiz yaxlitlangan qiymatdan emas
+    persons = person_results_frame(results, section_scores).round(
+        {'ability': 3, 'se': 3, 'z_score': 3, 'percentage': 1, **{name: 1 for name in section_scores or {}}}
+    )
+    # XLSX dagi RANK() kabi: teng T-Score bir xil o'rin oladi, T-Score yo'q qatorda o'rin bo'sh
+    persons.insert(0, 'rank', persons['t_score'].rank(method='min', ascending=False).astype('Int64'))
+
+    paths = {
+        'persons': os.path.join(output_dir, f"{prefix}_talabgorlar.csv"),
+        'items': os.path.join(output_dir, f"{prefix}_savollar.csv")
+    }
+    persons.to_csv(paths['persons'], index=False, encoding='utf-8-sig')
+    items_frame(results).round(3).to_csv(paths['items'], index=False, encoding='utf-8-sig')
+    logger.info(f"📄 CSV natijalar yozildi: {', '.join(paths.values())}")
+    return paths
@@ -2,8 +2,10 @@
 Namuna Excel fayllar yaratish uchun utility
 """
 import pandas as pd
+import numpy as np
 import os
 import logging
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +111,102 @@ class SampleFileGenerator:
         logger.info(f"✅ Turli format namuna yaratildi: {filepath}")
         return filepath
     
+    # Benchmark uchun sintetik eksport turlari
+    SYNTHETIC_KINDS = ['evalbee', 'google_forms', 'metadata_heavy']
+    
+    OPTION_LETTERS = list('ABCD')
+    
+    def generate_synthetic_export(self, kind: str, n_rows: int, n_columns: int,
+                                  seed: int = 0) -> Tuple[pd.DataFrame, Optional[List[str]]]:
+        """
+        Katta sintetik "iflos" eksport yaratish (benchmark va stress test uchun)
+        
+        Args:
+            kind: 'evalbee', 'google_forms' yoki 'metadata_heavy'
+            n_rows: Talabgorlar soni
+            n_columns: Taxminiy ustunlar soni (savollar soni shundan kelib chiqadi)
+            seed: Tasodifiy sonlar generatori uchun
+            
+        Returns:
+            (DataFrame, javoblar kaliti) - kalit faqat google_forms uchun, qolganlarida None
+        """
+        if kind not in self.SYNTHETIC_KINDS:
+            raise ValueError(f"Noma'lum eksport turi: {kind}")
+        
+        rng = np.random.default_rng(seed)
+        names = np.char.add(np.char.add('Talabgor', np.arange(n_rows).astype(str)),
+                            np.char.add(' Familiya', rng.integers(0, 10_000, n_rows).astype(str)))
+        
+        if kind == 'evalbee':
+            # Har bir savol uchun 3 ta ustun: Options, Key, Marks
+            n_questions = max((n_columns - 4) // 3, 3)
+            data = {
+                'Exam Name': ['Sinov imtihoni'] * n_rows,
+                'Roll No': np.arange(1, n_rows + 1),
+                'Name': names,
+                'Total Marks': np.zeros(n_rows, dtype=int)
+            }
+            keys = rng.choice(self.OPTION_LETTERS, n_questions)
+            for q in range(n_questions):
+                options = rng.choice(self.OPTION_LETTERS, n_rows)
+                data[f'Q {q + 1} Options'] = options
+                data[f'Q {q + 1} Key'] = np.repeat(keys[q], n_rows)
+                data[f'Q {q + 1} Marks'] = (options == keys[q]).astype(int)
+                data['Total Marks'] = data['Total Marks'] + data[f'Q {q + 1} Marks']
+            return pd.DataFrame(data), None
+        
+        if kind == 'google_forms':
+            # Timestamp, email, ism, ball va xom javoblar ("A) variant matni")
+            n_questions = max(n_columns - 4, 3)
+            key = list(rng.choice(self.OPTION_LETTERS, n_questions))
+            data = {
+                'Timestamp': pd.date_range('2024-01-15 09:00', periods=n_rows, freq='min').astype(str),
+                'Email Address': np.char.add(np.char.add('user', np.arange(n_rows).astype(str)), '@test.uz'),
+                'Full name': names,
+                'Score': [f"{score} / {n_questions}" for score in rng.integers(0, n_questions + 1, n_rows)]
+            }
+            for q in range(n_questions):
+                choices = rng.choice(self.OPTION_LETTERS, n_rows)
+                answers = np.char.add(choices, ') variant')
+                blanks = rng.random(n_rows) < 0.02
+                data[f'{q + 1}. Savol matni {q + 1}'] = np.where(blanks, None, answers)
+            return pd.DataFrame(data), key
+        
+        # metadata_heavy: preamble qatorlar, ko'p metadata ustunlar, aralash turdagi javoblar
+        meta_columns = ['ID', 'F.I.O', 'Email', 'Telegram', 'Telefon', 'Vaqt', 'Guruh', 'Ball', 'Izoh']
+        n_questions = max(n_columns - len(meta_columns), 3)
+        answers = rng.integers(0, 2, (n_rows, n_questions)).astype(object)
+        noise = rng.random((n_rows, n_questions))
+        answers[noise < 0.03] = None
+        answers[(noise >= 0.03) & (noise < 0.05)] = ' 1 '
+        data = {
+            'ID': [f"{i:05d}" for i in range(n_rows)],
+            'F.I.O': names,
+            'Email': np.char.add(np.char.add('user', np.arange(n_rows).astype(str)), '@test.uz'),
+            'Telegram': np.char.add('@user', np.arange(n_rows).astype(str)),
+            'Telefon': [f"+99890{i:07d}" for i in range(n_rows)],
+            'Vaqt': ['2024-01-15 10:30'] * n_rows,
+            'Guruh': rng.choice(['11-A', '11-B', '11-V'], n_rows),
+        }
+        for q in range(n_questions):
+            data[f'Savol {q + 1}'] = answers[:, q]
+        data['Ball'] = rng.integers(0, n_questions + 1, n_rows)
+        data['Izoh'] = ['izoh matni'] * n_rows
+        body = pd.DataFrame(data)
+        
+        preamble = pd.DataFrame([['Test natijalari hisoboti'] + [None] * (body.shape[1] - 1),
+                                 ['Maktab: 12-maktab', 'Sana: 2024-01-15'] + [None] * (body.shape[1] - 2)],
+                                columns=body.columns)
+        return pd.concat([preamble, body], ignore_index=True), None
+    
+    def create_synthetic_sample(self, kind: str, n_rows: int, n_columns: int, seed: int = 0) -> str:
+        """Sintetik eksportni Excel faylga yozish"""
+        df, _ = self.generate_synthetic_export(kind, n_rows, n_columns, seed)
+        filepath = os.path.join(self.output_dir, f'sintetik_{kind}_{n_rows}x{n_columns}.xlsx')
+        df.to_excel(filepath, index=False)
+        logger.info(f"✅ Sintetik namuna yaratildi: {filepath}")
+        return filepath
+    
     def create_all_samples(self):
         """Barcha namuna fayllarni yaratish"""
         samples = []
@@ -0,0 +1,90 @@
+"""
+Excel fayl sxemasini faqat sarlavha va birinchi qatorlar bo'yicha aniqlash
+
+Kitob openpyxl read-only rejimida ochiladi va qatorlar dangasa (lazy) o'qiladi.
+Shundan keyin to'liq o'qish faqat kerakli ustunlar bilan (usecols) bajariladi -
+yuzlab keraksiz ustunli keng Evalbee eksportlari xotiraga to'liq yuklanmaydi.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Sxemani aniqlash uchun o'qiladigan qatorlar soni (sarlavhadan tashqari)
+SCHEMA_SAMPLE_ROWS = 50
+
+
+def sample_frame(rows: Iterable[tuple]) -> pd.DataFrame:
+    """
+    openpyxl qatorlaridan DataFrame (birinchi qator - sarlavha)
+
+    Ustunlar pozitsiyasi fayldagi bilan bir xil; bo'sh sarlavhalar pandas kabi "Unnamed: N" bo'ladi.
+    """
+    rows = list(rows)
+    if not rows:
+        return pd.DataFrame()
+
+    width = max(len(row) for row in rows)
+    header = list(rows[0]) + [None] * (width - len(rows[0]))
+    columns = [str(value) if value is not None else f"Unnamed: {idx}" for idx, value in enumerate(header)]
+    body = [list(row) + [None] * (width - len(row)) for row in rows[1:]]
+    return pd.DataFrame(body, columns=columns)
+
+
+def read_sheet_samples(file_path: str, sample_rows: int = SCHEMA_SAMPLE_ROWS) -> Dict[str, pd.DataFrame]:
+    """
+    Har bir varaqning sarlavhasi va birinchi sample_rows qatorini o'qish
+
+    Returns:
+        {varaq_nomi: namuna DataFrame}
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        return {
+            str(worksheet.title): sample_frame(worksheet.iter_rows(max_row=sample_rows + 1, values_only=True))
+            for worksheet in workbook.worksheets
+        }
+    finally:
+        workbook.close()
+
+
+def infer_workbook_schema(file_path: str, cleaner: Optional[Any] = None,
+                          sample_rows: int = SCHEMA_SAMPLE_ROWS) -> Dict[str, Dict[str, Any]]:
+    """
+    Har bir varaq uchun to'liq o'qishda kerak bo'ladigan ustunlarni aniqlash
+
+    Args:
+        file_path: .xlsx fayl yo'li
+        cleaner: DataCleaner (default: yangi obyekt)
+        sample_rows: Namuna qatorlari soni
+
+    Returns:
+        {varaq_nomi: DataCleaner.infer_schema natijasi}
+    """
+    if cleaner is None:
+        from bot.utils.data_cleaner import DataCleaner
+        cleaner = DataCleaner()
+
+    return {name: cleaner.infer_schema(sample) for name, sample in read_sheet_samples(file_path, sample_rows).items()}
+
+
+def read_excel_with_schema(file_path: str, schemas: Dict[str, Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+    """
+    Kitobni bitta ochishda o'qish - har bir varaqdan faqat sxemadagi ustunlar
+
+    Returns:
+        {varaq_nomi: DataFrame}
+    """
+    sheets = {}
+    with pd.ExcelFile(file_path, engine='openpyxl') as workbook:
+        for name in workbook.sheet_names:
+            usecols = schemas.get(str(name), {}).get('usecols')
+            sheets[str(name)] = workbook.parse(name, usecols=usecols)
+            if usecols is not None:
+                skipped = len(schemas[str(name)]['skipped_columns'])
+                logger.info(f"🗂️ '{name}': {len(usecols)} ta ustun o'qildi, {skipped} tasi o'tkazib yuborildi")
+    return sheets
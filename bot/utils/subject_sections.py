@@ -92,3 +92,42 @@ def get_all_subjects() -> list:
         List of subject names
     """
     return list(SUBJECT_SECTIONS.keys())
+
+
+def format_question_list(questions: list) -> str:
+    """
+    Format a list of question numbers into a readable string
+
+    Args:
+        questions: List of question numbers
+
+    Returns:
+        Formatted string
+    """
+    if not questions:
+        return "Yo'q"
+
+    # Group consecutive numbers into ranges
+    questions = sorted(questions)
+    ranges = []
+    start = questions[0]
+    end = questions[0]
+
+    for i in range(1, len(questions)):
+        if questions[i] == end + 1:
+            end = questions[i]
+        else:
+            if start == end:
+                ranges.append(str(start))
+            else:
+                ranges.append(f"{start}-{end}")
+            start = questions[i]
+            end = questions[i]
+
+    # Add the last range
+    if start == end:
+        ranges.append(str(start))
+    else:
+        ranges.append(f"{start}-{end}")
+
+    return ", ".join(ranges)
@@ -318,6 +318,54 @@ class TestManager:
             'n_participants': len(response_matrix)
         }
 
+    def get_test_answer_matrix(self, test_id: str) -> Optional[Dict]:
+        """
+        Get chosen option indices for distractor analysis
+
+        Rows follow the same participant order as get_test_results_matrix.
+
+        Args:
+            test_id: Test identifier
+
+        Returns:
+            Dict with answers matrix (-1 for unanswered), answer key and option count
+        """
+        tests = self._load_tests()
+
+        if test_id not in tests:
+            return None
+
+        test = tests[test_id]
+        participants = test.get('participants', {})
+        questions = test.get('questions', [])
+
+        if not participants or not questions:
+            return None
+
+        n_questions = len(questions)
+        if isinstance(participants, dict):
+            submitted = [p for p in participants.values() if isinstance(p, dict) and p.get('submitted')]
+        else:
+            submitted = [p for p in participants if isinstance(p, dict)]
+
+        answers = []
+        for participant in submitted:
+            row = [-1] * n_questions
+            for i, result in enumerate(participant.get('results', [])[:n_questions]):
+                answer = result.get('student_answer')
+                row[i] = answer if isinstance(answer, int) else -1
+            answers.append(row)
+
+        if not answers:
+            return None
+
+        return {
+            'answers': answers,
+            'answer_key': [question.get('correct_answer', 0) for question in questions],
+            'n_options': max((len(question.get('options', [])) for question in questions), default=0) or None,
+            'item_names': [f"Savol_{i+1}" for i in range(n_questions)]
+        }
+
     def is_test_time_valid(self, test_id: str) -> Dict[str, Any]:
         """
         Check if current time is within test time range
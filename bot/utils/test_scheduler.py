@@ -1,14 +1,22 @@
+import asyncio
 import logging
+import os
+from functools import partial
 import pandas as pd
 from telegram.ext import Application
 from typing import Optional
 from .test_manager import TestManager
 from .rasch_analysis import RaschAnalyzer
 from .pdf_generator import PDFReportGenerator
+from .report_orchestrator import ReportTask, send_reports
+from .distractor_analysis import analyze_distractors
 from .user_data import UserDataManager
 
 logger = logging.getLogger(__name__)
 
+# Katta guruhlar uchun sertifikatlarni yozadigan jarayonlar soni
+CERTIFICATE_PROCESSES = min(4, os.cpu_count() or 1)
+
 
 async def check_and_finalize_expired_tests(application: Application, student_bot_app: Application = None) -> None:
     """
@@ -271,116 +279,108 @@ async def process_and_send_test_results(application: Application, test_id: str,
         # Perform Rasch analysis
         analyzer = RaschAnalyzer()
         analysis_results = analyzer.fit(df, person_names=person_names if person_names else None)
+
+        # Distraktorlar tahlili (tanlangan variantlar bo'yicha)
+        answer_data = test_manager.get_test_answer_matrix(test_id)
+        if answer_data:
+            try:
+                analysis_results['distractor_analysis'] = analyze_distractors(
+                    answer_data['answers'],
+                    answer_data['answer_key'],
+                    item_names=answer_data['item_names'],
+                    abilities=analysis_results['person_ability'],
+                    n_options=answer_data['n_options']
+                )
+            except ValueError as e:
+                logger.warning(f"Distraktorlar tahlilini bajarib bo'lmadi: {e}")
         
-        # Generate PDF reports
-        pdf_generator = PDFReportGenerator()
-        
-        # Get user data for section results
-        user_data = user_data_manager.get_user_data(teacher_id)
-        section_results_enabled = user_data.get('section_results_enabled', False)
-        section_questions = user_data.get('section_questions', {})
-        
-        # Generate general statistics report (umumiy statistika)
-        general_pdf_path = pdf_generator.generate_report(
-            analysis_results,
-            filename=f"test_{test_id}_umumiy"
-        )
+        # Generate PDF reports (ish papkasi xatolik bo'lsa ham o'chiriladi)
+        with PDFReportGenerator() as pdf_generator:
+            # Get user data for section results
+            user_data = user_data_manager.get_user_data(teacher_id)
+            section_results_enabled = user_data.get('section_results_enabled', False)
+            section_questions = user_data.get('section_questions', {})
         
-        with open(general_pdf_path, 'rb') as pdf_file:
-            await application.bot.send_document(
-                chat_id=teacher_id,
-                document=pdf_file,
-                filename=f"{test['name']}_umumiy_statistika.pdf",
-                caption="📊 Umumiy statistika va Wright Map"
-            )
+            # Hisobotlar parallel quriladi, har biri tayyor bo'lishi bilan o'qituvchiga yuboriladi
+            report_tasks = [
+                ReportTask('general', analysis_results, "📊 Umumiy statistika va Wright Map",
+                           filename=f"test_{test_id}_umumiy", upload_name=f"{test['name']}_umumiy_statistika.pdf"),
+                ReportTask('person', analysis_results, "👥 Talabgorlar natijalari",
+                           filename=f"test_{test_id}_talabgorlar",
+                           section_questions=section_questions if section_results_enabled else None,
+                           upload_name=f"{test['name']}_talabgorlar_natijalari.pdf"),
+            ]
+            if section_results_enabled and section_questions:
+                report_tasks.append(ReportTask('section', analysis_results, "📋 Bo'limlar bo'yicha natijalar",
+                                               filename=f"test_{test_id}_bulimlar", section_questions=section_questions,
+                                               upload_name=f"{test['name']}_bulimlar_natijalari.pdf"))
+            await send_reports(pdf_generator, report_tasks, partial(application.bot.send_document, chat_id=teacher_id))
         
-        # Generate person results report (talabgorlar natijalari)
-        person_pdf_path = pdf_generator.generate_person_results_report(
-            analysis_results,
-            filename=f"test_{test_id}_talabgorlar",
-            section_questions=section_questions if section_results_enabled else None
-        )
+            logger.info(f"Test {test_id} natijalari o'qituvchi {teacher_id} ga yuborildi")
         
-        with open(person_pdf_path, 'rb') as pdf_file:
-            await application.bot.send_document(
+            # Send certificates to all students
+            await application.bot.send_message(
                 chat_id=teacher_id,
-                document=pdf_file,
-                filename=f"{test['name']}_talabgorlar_natijalari.pdf",
-                caption="👥 Talabgorlar natijalari"
+                text="📜 Talabgorlarga sertifikatlar yuborilmoqda...",
+                parse_mode='Markdown'
             )
         
-        # Generate section results if enabled
-        if section_results_enabled and section_questions:
-            section_pdf_path = pdf_generator.generate_section_results_report(
-                analysis_results,
-                filename=f"test_{test_id}_bulimlar",
-                section_questions=section_questions
-            )
-            
-            with open(section_pdf_path, 'rb') as pdf_file:
-                await application.bot.send_document(
-                    chat_id=teacher_id,
-                    document=pdf_file,
-                    filename=f"{test['name']}_bulimlar_natijalari.pdf",
-                    caption="📋 Bo'limlar bo'yicha natijalar"
-                )
+            individual_results = analysis_results.get('person_statistics', {}).get('individual', [])
+            student_ids = results_data.get('student_ids', [])
         
-        logger.info(f"Test {test_id} natijalari o'qituvchi {teacher_id} ga yuborildi")
-        
-        # Send certificates to all students
-        await application.bot.send_message(
-            chat_id=teacher_id,
-            text="📜 Talabgorlarga sertifikatlar yuborilmoqda...",
-            parse_mode='Markdown'
-        )
-        
-        individual_results = analysis_results.get('person_statistics', {}).get('individual', [])
-        student_ids = results_data.get('student_ids', [])
-        
-        certificates_sent = 0
-        for idx, person_result in enumerate(individual_results):
-            if idx < len(student_ids):
-                student_id = student_ids[idx]
+            # Avval barcha sertifikatlar bitta shablon bilan yaratiladi, keyin yuboriladi
+            participants = test.get('participants', {})
+            certificate_students = []
+            for idx, person_result in enumerate(individual_results):
+                if idx < len(student_ids):
+                    student_id = student_ids[idx]
                 
-                # Get student's raw score from test results
-                participants = test.get('participants', {})
-                student_score_data = None
+                    # Get student's raw score from test results
+                    student_score_data = None
                 
-                if isinstance(participants, dict):
-                    student_score_data = participants.get(str(student_id))
-                elif isinstance(participants, list):
-                    for p in participants:
-                        if p.get('student_id') == student_id:
-                            student_score_data = p
-                            break
+                    if isinstance(participants, dict):
+                        student_score_data = participants.get(str(student_id))
+                    elif isinstance(participants, list):
+                        for p in participants:
+                            if p.get('student_id') == student_id:
+                                student_score_data = p
+                                break
                 
-                if student_score_data:
-                    score = student_score_data.get('score', 0)
-                    max_score = student_score_data.get('max_score', n_questions)
-                    percentage = student_score_data.get('percentage', 0)
-                    
-                    # Generate certificate
-                    try:
-                        cert_path = pdf_generator.generate_certificate(
-                            student_name=f"Talabgor {student_id}",
-                            test_name=test['name'],
-                            subject=test['subject'],
-                            score=score,
-                            max_score=max_score,
-                            percentage=percentage,
-                            theta=person_result.get('ability', 0.0),
-                            t_score=person_result.get('t_score', 50.0),
-                            filename=f"cert_{test_id}_{student_id}"
-                        )
-                        
-                        # Send certificate to student using student bot
-                        if student_bot_app:
-                            if await send_certificate_to_student(student_bot_app, student_id, cert_path, test['name']):
-                                certificates_sent += 1
-                        else:
-                            logger.warning(f"Student bot application topilmadi, sertifikat yuborilmadi: {student_id}")
-                    except Exception as cert_error:
-                        logger.error(f"Talabgor {student_id} uchun sertifikat yaratishda xatolik: {cert_error}")
+                    if student_score_data:
+                        certificate_students.append({
+                            'student_id': student_id,
+                            'student_name': f"Talabgor {student_id}",
+                            'score': student_score_data.get('score', 0),
+                            'max_score': student_score_data.get('max_score', n_questions),
+                            'percentage': student_score_data.get('percentage', 0),
+                            'theta': person_result.get('ability', 0.0),
+                            't_score': person_result.get('t_score', 50.0),
+                            'filename': f"cert_{test_id}_{student_id}"
+                        })
+
+            certificate_paths = []
+            if certificate_students:
+                try:
+                    loop = asyncio.get_running_loop()
+                    certificate_paths = await loop.run_in_executor(
+                        None,
+                        partial(pdf_generator.generate_certificates, test['name'], test['subject'],
+                                certificate_students, processes=CERTIFICATE_PROCESSES)
+                    )
+                except Exception as cert_error:
+                    logger.error(f"Test {test_id} sertifikatlarini yaratishda xatolik: {cert_error}")
+
+            certificates_sent = 0
+            for student, cert_path in zip(certificate_students, certificate_paths):
+                if cert_path is None:
+                    # Bu talabgor ma'lumotida xatolik - sertifikat yaratilmagan
+                    continue
+                # Send certificate to student using student bot
+                if student_bot_app:
+                    if await send_certificate_to_student(student_bot_app, student['student_id'], cert_path, test['name']):
+                        certificates_sent += 1
+                else:
+                    logger.warning(f"Student bot application topilmadi, sertifikat yuborilmadi: {student['student_id']}")
         
         # Notify teacher about certificates
         await application.bot.send_message(
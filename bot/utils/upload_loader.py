@@ -0,0 +1,290 @@
+"""
+Yuklangan fayllarni bir marta o'qish va keshlash uchun utility
+"""
+import codecs
+import csv
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+
+from bot.utils.schema_inference import infer_workbook_schema, read_excel_with_schema
+
+logger = logging.getLogger(__name__)
+
+# Fayl boshidagi "magic" baytlar
+XLSX_SIGNATURE = b'PK\x03\x04'
+XLS_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+PARQUET_SIGNATURE = b'PAR1'
+
+# BOM belgilari (UTF-32 UTF-16 dan oldin tekshirilishi kerak)
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+SNIFF_BYTES = 64 * 1024
+CSV_DELIMITERS = ',;\t|'
+
+# CSV va Parquet fayllar bitta varaqli kitob sifatida qaytariladi
+CSV_SHEET_NAME = 'CSV'
+PARQUET_SHEET_NAME = 'Parquet'
+
+# Shu muddatdan eski (tugallanmay qolgan tahlillardan qolgan) kesh fayllari o'chiriladi
+CACHE_MAX_AGE_SECONDS = 6 * 3600
+
+
+def cleanup_stale_cache(cache_dir: str = 'data/uploads/cache', max_age_seconds: float = CACHE_MAX_AGE_SECONDS) -> int:
+    """
+    Xatolik yoki qayta ishga tushirishdan keyin qolgan eski kesh fayllarini o'chirish
+
+    Returns:
+        O'chirilgan fayllar soni
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for entry in os.scandir(cache_dir):
+        try:
+            if entry.is_file() and entry.name.endswith('.pkl') and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Eski kesh faylini o'chirib bo'lmadi {entry.path}: {e}")
+
+    if removed:
+        logger.info(f"🧹 {removed} ta eski kesh fayli o'chirildi")
+    return removed
+
+
+class UploadedFile:
+    """
+    Yuklangan fayl - formati va kodirovkasi bir marta aniqlanadi,
+    bir marta o'qiladi va tozalash/tahlil bosqichlari o'rtasida bo'lishiladi
+
+    prune_columns=True bo'lsa (faqat tahlil uchun) .xlsx fayldan DataCleaner'ga kerak
+    bo'lmaydigan ustunlar o'qilmaydi; odatiy holatda barcha ustunlar bitta o'qishda olinadi.
+    """
+
+    def __init__(self, file_path: str, file_id: Optional[str] = None, cache_dir: str = 'data/uploads/cache',
+                 prune_columns: bool = False):
+        self.file_path = file_path
+        self.file_id = file_id
+        self.cache_dir = cache_dir
+        self.prune_columns = prune_columns
+        self.file_format = None
+        self.encoding = None
+        self.delimiter = None
+        self._sheets = None
+
+    def detect(self) -> str:
+        """
+        Fayl formatini (va CSV uchun kodirovka/ajratgichni) aniqlash
+
+        Returns:
+            'xlsx', 'xls', 'parquet' yoki 'csv'
+        """
+        if self.file_format is not None:
+            return self.file_format
+
+        with open(self.file_path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+
+        if head.startswith(XLSX_SIGNATURE):
+            self.file_format = 'xlsx'
+        elif head.startswith(XLS_SIGNATURE):
+            self.file_format = 'xls'
+        elif head.startswith(PARQUET_SIGNATURE):
+            self.file_format = 'parquet'
+        else:
+            self.file_format = 'csv'
+            self.encoding = self._detect_encoding(head)
+            self.delimiter = self._detect_delimiter(head, self.encoding)
+
+        logger.info(f"📂 Fayl formati: {self.file_format}"
+                    + (f" (kodirovka: {self.encoding}, ajratgich: {self.delimiter!r})" if self.file_format == 'csv' else ""))
+        return self.file_format
+
+    @staticmethod
+    def _detect_encoding(head: bytes) -> str:
+        """BOM va UTF-8 tekshiruvi orqali kodirovkani aniqlash"""
+        for bom, encoding in BOM_ENCODINGS:
+            if head.startswith(bom):
+                return encoding
+
+        # Oxirgi belgi kesilib qolgan bo'lishi mumkin - incremental decoder
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
+
+    @staticmethod
+    def _detect_delimiter(head: bytes, encoding: str) -> str:
+        """CSV ajratgichini aniqlash (default: vergul)"""
+        sample = head.decode(encoding, errors='ignore')
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+        except csv.Error:
+            return ','
+
+    def load(self) -> pd.DataFrame:
+        """
+        Faylni DataFrame sifatida qaytarish (faqat bir marta o'qiladi)
+
+        Ko'p varaqli Excel faylda birinchi varaq qaytariladi.
+        Qaytarilgan DataFrame keshda saqlanadi - uni joyida o'zgartirmang.
+        """
+        sheets = self.load_sheets()
+        return next(iter(sheets.values()))
+
+    def load_sheets(self) -> Dict[str, pd.DataFrame]:
+        """
+        Barcha varaqlarni {varaq_nomi: DataFrame} ko'rinishida qaytarish
+
+        Excel fayldagi barcha varaqlar bitta o'qishda olinadi, CSV va Parquet
+        fayllar esa bitta varaqli kitob sifatida qaytariladi.
+        """
+        if self._sheets is not None:
+            return self._sheets
+
+        cache_path = self._cache_path()
+        if cache_path and os.path.exists(cache_path):
+            try:
+                self._sheets = pd.read_pickle(cache_path)
+                logger.info(f"♻️ Keshdan o'qildi: {cache_path}")
+                return self._sheets
+            except Exception as e:
+                logger.warning(f"Keshni o'qib bo'lmadi {cache_path}: {e}")
+
+        self._sheets = self._parse()
+
+        if cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                cleanup_stale_cache(self.cache_dir)
+                pd.to_pickle(self._sheets, cache_path)
+            except Exception as e:
+                logger.warning(f"Keshga yozib bo'lmadi {cache_path}: {e}")
+
+        return self._sheets
+
+    def non_empty_sheets(self) -> Dict[str, pd.DataFrame]:
+        """Ma'lumot bor varaqlar (butunlay bo'sh varaqlar tashlab ketiladi)"""
+        return {name: frame for name, frame in self.load_sheets().items()
+                if not frame.dropna(how='all').empty}
+
+    def _parse(self) -> Dict[str, pd.DataFrame]:
+        """Aniqlangan format bo'yicha faylni o'qish"""
+        file_format = self.detect()
+
+        if file_format == 'csv':
+            frame = pd.read_csv(self.file_path, encoding=self.encoding, sep=self.delimiter)
+            return {CSV_SHEET_NAME: frame}
+
+        if file_format == 'parquet':
+            return {PARQUET_SHEET_NAME: pd.read_parquet(self.file_path)}
+
+        if file_format == 'xls':
+            try:
+                sheets = pd.read_excel(self.file_path, sheet_name=None, engine='xlrd')
+            except Exception as xlrd_error:
+                # .xls kengaytmali, lekin aslida boshqa Excel formatidagi fayllar uchun
+                logger.warning(f"xlrd failed for .xls file, trying openpyxl: {str(xlrd_error)}")
+                try:
+                    sheets = pd.read_excel(self.file_path, sheet_name=None, engine='openpyxl')
+                except Exception as openpyxl_error:
+                    raise Exception(
+                        f"Faylni o'qib bo'lmadi. xlrd xatoligi: {str(xlrd_error)}. "
+                        f"openpyxl xatoligi: {str(openpyxl_error)}"
+                    )
+        elif self.prune_columns:
+            # Avval sarlavhalar read-only rejimda o'qiladi - keraksiz ustunlar umuman yuklanmaydi
+            sheets = read_excel_with_schema(self.file_path, infer_workbook_schema(self.file_path))
+        else:
+            sheets = pd.read_excel(self.file_path, sheet_name=None, engine='openpyxl')
+
+        if not sheets:
+            raise ValueError("Excel faylda varaqlar topilmadi")
+
+        if len(sheets) > 1:
+            logger.info(f"📑 {len(sheets)} ta varaq o'qildi: {', '.join(map(str, sheets))}")
+        return {str(name): frame for name, frame in sheets.items()}
+
+    def _cache_path(self) -> Optional[str]:
+        if not self.file_id:
+            return None
+        suffix = '.pruned' if self.prune_columns else ''
+        return os.path.join(self.cache_dir, f"{self.file_id}{suffix}.pkl")
+
+    def discard(self):
+        """Kesh va vaqtinchalik fayllarni o'chirish"""
+        self._sheets = None
+        _forget(self.file_id)
+        self._remove_cache_file()
+
+    def _remove_cache_file(self):
+        cache_path = self._cache_path()
+        if cache_path and os.path.exists(cache_path):
+            try:
+                os.remove(cache_path)
+            except OSError as e:
+                logger.warning(f"Kesh faylini o'chirib bo'lmadi {cache_path}: {e}")
+
+
+# Xotiradagi kesh: file_id -> UploadedFile
+MAX_CACHED_UPLOADS = 16
+_uploads: "OrderedDict[str, UploadedFile]" = OrderedDict()
+_uploads_lock = threading.Lock()
+
+
+def get_upload(file_path: str, file_id: Optional[str] = None, prune_columns: bool = False) -> UploadedFile:
+    """
+    file_id bo'yicha keshlangan UploadedFile obyektini olish
+
+    Args:
+        file_path: Yuklangan faylning diskdagi yo'li
+        file_id: Telegram file_id (kesh kaliti)
+        prune_columns: Tahlil uchun - .xlsx fayldan faqat tozalashga kerakli ustunlarni o'qish
+
+    Returns:
+        UploadedFile obyekti
+    """
+    if not file_id:
+        return UploadedFile(file_path, prune_columns=prune_columns)
+
+    evicted = []
+    with _uploads_lock:
+        upload = _uploads.get(file_id)
+        if upload is not None and upload.file_path == file_path and upload.prune_columns == prune_columns:
+            _uploads.move_to_end(file_id)
+            return upload
+        if upload is not None:
+            evicted.append(upload)
+
+        upload = UploadedFile(file_path, file_id=file_id, prune_columns=prune_columns)
+        _uploads[file_id] = upload
+        while len(_uploads) > MAX_CACHED_UPLOADS:
+            evicted.append(_uploads.popitem(last=False)[1])
+
+    # Xotiradan chiqarilgan yozuvlarning disk keshi ham o'chiriladi
+    # (ishlayotgan tahlil o'z DataFrame'ini xotirada saqlab qoladi)
+    for stale in evicted:
+        stale._remove_cache_file()
+    return upload
+
+
+def _forget(file_id: Optional[str]):
+    if not file_id:
+        return
+    with _uploads_lock:
+        _uploads.pop(file_id, None)
@@ -0,0 +1,265 @@
+"""
+Katta fayllar uchun oldindan tekshiruv (preflight)
+
+To'liq o'qish, tozalash va Rasch tahlilidan oldin faqat sarlavha va bir nechta
+qator o'qiladi: o'lcham, xotira va taxminiy ishlash vaqti baholanadi. Juda katta
+fayllar rad etiladi, og'irlari esa navbatga qo'yiladi - boshqa o'qituvchilarning
+kutish vaqti himoyalanadi.
+"""
+import asyncio
+import logging
+import os
+import zipfile
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from bot.utils.schema_inference import sample_frame
+from bot.utils.upload_loader import SNIFF_BYTES, UploadedFile
+
+logger = logging.getLogger(__name__)
+
+# Namuna sifatida o'qiladigan qatorlar soni
+PREFLIGHT_SAMPLE_ROWS = 200
+
+# Bir katakni o'qish vaqti (sekund) - o'lchangan taxminiy qiymatlar
+PARSE_SECONDS_PER_CELL = {
+    'xlsx': 1.2e-5,
+    'xls': 4e-6,
+    'csv': 1e-7,
+    'parquet': 2e-8,
+}
+CLEAN_SECONDS_PER_CELL = 5e-7
+FIT_SECONDS_PER_RESPONSE = 2e-6
+
+# O'lcham noma'lum bo'lsa: bir katakka to'g'ri keladigan baytlar
+XLSX_XML_BYTES_PER_CELL = 40
+XLS_BYTES_PER_CELL = 12
+
+# Chegaralar
+MAX_UPLOAD_CELLS = 5_000_000
+MAX_UPLOAD_MEMORY_MB = 1024
+QUEUE_THRESHOLD_SECONDS = 15
+
+# Bir vaqtda bajariladigan og'ir tahlillar soni
+HEAVY_JOB_SLOTS = 1
+
+ACCEPT = 'accept'
+QUEUE = 'queue'
+REJECT = 'reject'
+
+
+def _xlsx_dimensions(file_path: str, sample_rows: int) -> Tuple[int, int, int, pd.DataFrame]:
+    """
+    XLSX: read-only rejimda varaqlar o'lchami va birinchi varaq namunasi
+
+    Returns:
+        (qatorlar, ustunlar, varaqlar soni, namuna)
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = columns = 0
+        sample = None
+        unsized = False
+        for worksheet in workbook.worksheets:
+            if sample is None:
+                sample = sample_frame(worksheet.iter_rows(max_row=sample_rows + 1, values_only=True))
+            if worksheet.max_row is None or worksheet.max_column is None:
+                unsized = True
+                continue
+            rows += worksheet.max_row
+            columns = max(columns, worksheet.max_column)
+        n_sheets = len(workbook.worksheets)
+    finally:
+        workbook.close()
+
+    sample = sample if sample is not None else pd.DataFrame()
+    if unsized:
+        # <dimension> yozuvi yo'q - varaq XML hajmidan baholash (zip bomb'dan ham himoya)
+        with zipfile.ZipFile(file_path) as archive:
+            xml_bytes = sum(info.file_size for info in archive.infolist()
+                            if info.filename.startswith('xl/worksheets/'))
+        columns = max(columns, len(sample.columns), 1)
+        rows = max(rows, xml_bytes // (XLSX_XML_BYTES_PER_CELL * columns))
+
+    return int(rows), int(columns), n_sheets, sample
+
+
+def _csv_dimensions(upload: UploadedFile, sample_rows: int) -> Tuple[int, int, int, pd.DataFrame]:
+    """CSV: namuna o'qiladi, qatorlar soni fayl boshidagi qatorlardan sanaladi yoki baholanadi"""
+    sample = pd.read_csv(upload.file_path, encoding=upload.encoding, sep=upload.delimiter, nrows=sample_rows)
+
+    file_size = os.path.getsize(upload.file_path)
+    with open(upload.file_path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+    lines = head.count(b'\n')
+    if len(head) >= file_size:
+        # Fayl to'liq o'qilgan - qatorlar aniq sanaladi (sarlavha chiqariladi)
+        if head and not head.endswith(b'\n'):
+            lines += 1
+        rows = max(lines - 1, len(sample))
+    else:
+        rows = int(file_size * max(lines, 1) / len(head))
+
+    return rows, len(sample.columns), 1, sample
+
+
+def _parquet_dimensions(file_path: str, sample_rows: int) -> Tuple[int, int, int, pd.DataFrame]:
+    """Parquet: o'lcham metadata'dan, namuna birinchi paketdan"""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    batch = next(parquet_file.iter_batches(batch_size=sample_rows), None)
+    sample = batch.to_pandas() if batch is not None else pd.DataFrame()
+    return metadata.num_rows, metadata.num_columns, 1, sample
+
+
+def preflight_upload(upload: UploadedFile, sample_rows: int = PREFLIGHT_SAMPLE_ROWS) -> Dict[str, Any]:
+    """
+    Faylni to'liq o'qimasdan o'lcham, xotira va ishlash vaqtini baholash
+
+    Args:
+        upload: Yuklangan fayl (formati shu yerda aniqlanadi)
+        sample_rows: Namuna sifatida o'qiladigan qatorlar soni
+
+    Returns:
+        {'file_format', 'sheets', 'rows', 'columns', 'cells', 'memory_mb',
+         'estimated_seconds', 'decision' (accept/queue/reject), 'reason'}
+    """
+    file_format = upload.detect()
+    file_size = os.path.getsize(upload.file_path)
+
+    if file_format == 'xlsx':
+        rows, columns, n_sheets, sample = _xlsx_dimensions(upload.file_path, sample_rows)
+    elif file_format == 'csv':
+        rows, columns, n_sheets, sample = _csv_dimensions(upload, sample_rows)
+    elif file_format == 'parquet':
+        rows, columns, n_sheets, sample = _parquet_dimensions(upload.file_path, sample_rows)
+    else:
+        # XLS: sarlavhalarni alohida o'qib bo'lmaydi - fayl hajmidan baholanadi
+        cells = file_size // XLS_BYTES_PER_CELL
+        columns = 1
+        rows, n_sheets, sample = cells, 1, pd.DataFrame()
+
+    if len(sample) > 0:
+        bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        columns = max(columns, len(sample.columns))
+    else:
+        bytes_per_row = 64 * max(columns, 1)
+
+    cells = int(rows) * int(columns)
+    memory_mb = rows * bytes_per_row / (1024 * 1024)
+    parse_seconds = PARSE_SECONDS_PER_CELL.get(file_format, PARSE_SECONDS_PER_CELL['xlsx'])
+    estimated_seconds = cells * (parse_seconds + CLEAN_SECONDS_PER_CELL + FIT_SECONDS_PER_RESPONSE)
+
+    decision, reason = ACCEPT, None
+    if cells > MAX_UPLOAD_CELLS:
+        decision, reason = REJECT, f"juda ko'p katak (~{cells:,}, chegara {MAX_UPLOAD_CELLS:,})"
+    elif memory_mb > MAX_UPLOAD_MEMORY_MB:
+        decision, reason = REJECT, f"xotira talabi juda katta (~{memory_mb:.0f} MB)"
+    elif estimated_seconds > QUEUE_THRESHOLD_SECONDS:
+        decision = QUEUE
+
+    estimate = {
+        'file_format': file_format,
+        'sheets': n_sheets,
+        'rows': int(rows),
+        'columns': int(columns),
+        'cells': cells,
+        'memory_mb': round(float(memory_mb), 1),
+        'estimated_seconds': round(float(estimated_seconds), 1),
+        'decision': decision,
+        'reason': reason
+    }
+    logger.info(f"🛫 Preflight: {file_size / (1024 * 1024):.1f} MB, ~{rows}×{columns}, "
+                f"~{estimate['memory_mb']} MB, ~{estimate['estimated_seconds']}s → {decision}")
+    return estimate
+
+
+def format_duration(seconds: float) -> str:
+    """Soniyalarni o'qituvchi uchun qisqa matnga aylantirish"""
+    seconds = max(int(round(seconds)), 1)
+    if seconds < 60:
+        return f"{seconds} soniya"
+    minutes, rest = divmod(seconds, 60)
+    return f"{minutes} daqiqa" + (f" {rest} soniya" if rest else "")
+
+
+def format_preflight_message(estimate: Dict[str, Any], wait_seconds: float = 0.0) -> Optional[str]:
+    """
+    Preflight natijasi bo'yicha o'qituvchiga xabar (kichik fayllar uchun None)
+    """
+    size_line = f"📏 Taxminiy o'lcham: {estimate['rows']:,} qator × {estimate['columns']} ustun"
+
+    if estimate['decision'] == REJECT:
+        return (
+            "❌ Fayl juda katta!\n\n"
+            f"{size_line}\n"
+            f"Sabab: {estimate['reason']}\n\n"
+            "Iltimos, faylni kichikroq qismlarga bo'lib yoki ortiqcha ustunlarsiz yuboring."
+        )
+
+    if estimate['decision'] == QUEUE:
+        total = wait_seconds + estimate['estimated_seconds']
+        return (
+            "⏳ Katta fayl qabul qilindi.\n\n"
+            f"{size_line}\n"
+            f"⏱ Taxminiy kutish: {format_duration(total)}"
+            + (f" (navbatda: {format_duration(wait_seconds)})" if wait_seconds > 0 else "")
+        )
+
+    return None
+
+
+class HeavyJobQueue:
+    """
+    Og'ir tahlillar navbati
+
+    Bir vaqtda faqat HEAVY_JOB_SLOTS ta og'ir ish bajariladi; navbatdagi ishlarning
+    taxminiy vaqti yig'ib boriladi va yangi o'qituvchiga kutish vaqti sifatida aytiladi.
+    """
+
+    def __init__(self, slots: int = HEAVY_JOB_SLOTS):
+        self.slots = slots
+        self._semaphore = asyncio.Semaphore(slots)
+        self._pending_seconds = 0.0
+
+    def expected_wait(self) -> float:
+        """Navbatdagi (va bajarilayotgan) ishlarning taxminiy umumiy vaqti"""
+        return self._pending_seconds / self.slots
+
+    @asynccontextmanager
+    async def slot(self, estimated_seconds: float):
+        """Navbatda joy olish (ish tugagach bo'shatiladi)"""
+        self._pending_seconds += estimated_seconds
+        try:
+            async with self._semaphore:
+                yield
+        finally:
+            self._pending_seconds -= estimated_seconds
+
+    def submit(self, estimated_seconds: float, job: Callable[[], Awaitable[Any]],
+               create_task: Callable[[Awaitable[Any]], asyncio.Task] = asyncio.create_task) -> asyncio.Task:
+        """
+        Ishni fon vazifasi sifatida navbatga qo'yish (chaqiruvchi kutmaydi)
+
+        Taxminiy vaqt darhol navbatga qo'shiladi - keyingi o'qituvchiga kutish vaqti to'g'ri aytiladi.
+
+        Args:
+            job: Argumentsiz korutina funksiyasi
+            create_task: Vazifa yaratuvchi (botda Application.create_task - xatoliklar error handler'ga boradi)
+        """
+        self._pending_seconds += estimated_seconds
+
+        async def run():
+            try:
+                async with self._semaphore:
+                    await job()
+            finally:
+                self._pending_seconds -= estimated_seconds
+
+        return create_task(run())
@@ -0,0 +1,288 @@
+"""
+Ko'p varaqli Excel kitoblarini (har bir sinf - alohida varaq) parallel tozalash va tahlil qilish
+"""
+import logging
+import os
+import re
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from bot.utils.cleaning_profiles import CleaningProfileManager
+from bot.utils.data_cleaner import DataCleaner
+from bot.utils.keyword_matcher import KeywordMatcher
+from bot.utils.process_pool import submit_to_pool
+from bot.utils.rasch_analysis import RaschAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# 1 dan ko'p bo'lsa varaqlar umumiy jarayonlar havzasida ishlanadi
+MAX_SHEET_WORKERS = min(4, os.cpu_count() or 1)
+
+# Birlashtirilgan natija uchun nom
+COMBINED_SHEET_NAME = 'Umumiy'
+
+# Tozalangan faylda birinchi ustun ism ustuni ekanligini aniqlash uchun
+_participant_column_matcher = KeywordMatcher(['talabgor', 'name', 'ism', 'student', 'participant'])
+
+# Tozalanmagan faylda birinchi ustun ism ustuni ekanligini aniqlash uchun
+_raw_participant_column_matcher = KeywordMatcher(
+    ['talabgor', 'name', 'ism', 'student', 'participant', 'foydalanuvchi'])
+
+
+def split_participant_column(data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[List]]:
+    """
+    Tayyor (tozalangan) faylda talabgor ustunini ajratib olish va javoblarni raqamga aylantirish
+
+    Returns:
+        (raqamli javoblar DataFrame, talabgor ismlari yoki None)
+    """
+    # File Analyzer tozalangan faylda birinchi ustun har doim ism ustuni
+    person_names = None
+    response_data = data
+    if len(data.columns) > 0:
+        first_col = data.columns[0]
+        if _raw_participant_column_matcher.matches(str(first_col).lower()):
+            person_names = data[first_col].tolist()
+            logger.info(f"✅ Talabgor ustuni aniqlandi va olib tashlandi: {first_col} ({len(person_names)} ta ism)")
+            response_data = data.drop(columns=[first_col])
+
+    numeric_data = response_data.apply(pd.to_numeric, errors='coerce')
+
+    # Konvertatsiyadan keyin butunlay bo'sh qator va ustunlar olib tashlanadi
+    numeric_data = numeric_data.dropna(how='all', axis=0)
+    numeric_data = numeric_data.dropna(how='all', axis=1)
+
+    return numeric_data, person_names
+
+
+def has_enough_responses(responses: pd.DataFrame) -> bool:
+    """Rasch tahlili uchun kamida 2 talabgor va 2 savol bormi"""
+    return not responses.empty and responses.shape[0] >= 2 and responses.shape[1] >= 2
+
+
+def sheets_share_layout(sheets: Dict[str, pd.DataFrame]) -> bool:
+    """
+    Varaqlar bir xil savollar tuzilishiga egami (sarlavhalar bir xil)
+
+    Faqat shunday kitob (har bir sinf - alohida varaq) varaqlar bo'yicha tahlil qilinadi;
+    aks holda varaqlar bitta testning qismlari emas (masalan, izoh yoki kalit varag'i).
+    """
+    layouts = [[str(column).strip().lower() for column in frame.dropna(how='all', axis=1).columns]
+               for frame in sheets.values()]
+    return len(layouts) > 1 and all(layout == layouts[0] for layout in layouts[1:])
+
+
+def clean_for_analysis(original_data: pd.DataFrame, profile_manager: Optional[CleaningProfileManager] = None,
+                       teacher_id: Optional[int] = None,
+                       answer_key: Optional[List[str]] = None) -> Tuple[pd.DataFrame, Optional[List]]:
+    """
+    Ma'lumotlarni DataCleaner bilan tozalash va talabgor ustunini ajratib olish
+
+    Args:
+        original_data: Asl DataFrame
+        profile_manager: Tozalash profillari keshi (ixtiyoriy)
+        teacher_id: O'qituvchi ID (profil keshi uchun)
+        answer_key: Xom javoblar fayli uchun to'g'ri javoblar kaliti (ixtiyoriy)
+
+    Returns:
+        (raqamli javoblar DataFrame, talabgor ismlari yoki None)
+    """
+    cleaner = DataCleaner(profile_manager=profile_manager)
+    if answer_key:
+        cleaned_data, metadata = cleaner.clean_raw_answers(original_data, answer_key)
+    else:
+        cleaned_data, metadata = cleaner.clean_data(original_data, teacher_id=teacher_id)
+
+    # Talabgor ustunini olib tashlash va ismlarni saqlash
+    person_names = None
+    if len(cleaned_data.columns) > 0:
+        first_col = cleaned_data.columns[0]
+        if _participant_column_matcher.matches(str(first_col).lower()):
+            person_names = cleaned_data[first_col].tolist()
+            logger.info(f"✅ {len(person_names)} ta talabgor ismlari saqlandi")
+            cleaned_data = cleaned_data.drop(columns=[first_col])
+            logger.info(f"✅ Tozalangan fayldan talabgor ustuni olib tashlandi: {first_col}")
+
+    # Raqamga aylantirish
+    for col in cleaned_data.columns:
+        cleaned_data[col] = pd.to_numeric(cleaned_data[col], errors='coerce')
+
+    cleaned_data = cleaned_data.dropna(how='all', axis=0)
+    cleaned_data = cleaned_data.dropna(how='all', axis=1)
+
+    return cleaned_data, person_names
+
+
+def clean_sheet(data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Bitta varaqni to'liq tozalash (worker jarayonida ishlaydi)"""
+    return DataCleaner().clean_data(data)
+
+
+def analyze_sheet(data: pd.DataFrame, answer_key: Optional[List[str]] = None,
+                  auto_clean: bool = True) -> Dict[str, Any]:
+    """
+    Bitta varaqning Rasch tahlilini bajarish (worker jarayonida ishlaydi)
+
+    Bitta varaqli fayl bilan bir xil: kalit berilgan bo'lsa xom javoblar baholanadi,
+    aks holda varaq tayyor deb o'qiladi va faqat auto_clean yoqilgan bo'lsa tozalanadi.
+
+    Returns:
+        {'results': RaschAnalyzer natijalari, 'responses': javoblar matritsasi, 'person_names': ismlar}
+    """
+    if answer_key:
+        responses, person_names = clean_for_analysis(data, answer_key=answer_key)
+        cleaned = True
+    else:
+        responses, person_names = split_participant_column(data)
+        cleaned = False
+
+    if not has_enough_responses(responses):
+        if cleaned or not auto_clean:
+            raise ValueError("Ma'lumotlar yetarli emas yoki formati noto'g'ri")
+        responses, person_names = clean_for_analysis(data)
+        cleaned = True
+
+    try:
+        results = RaschAnalyzer().fit(responses, person_names=person_names)
+    except Exception:
+        if cleaned or not auto_clean:
+            raise
+        responses, person_names = clean_for_analysis(data)
+        results = RaschAnalyzer().fit(responses, person_names=person_names)
+
+    return {'results': results, 'responses': responses, 'person_names': person_names}
+
+
+def process_sheets(sheets: Dict[str, pd.DataFrame], worker: Callable[[pd.DataFrame], Any],
+                   max_workers: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Har bir varaqni worker funksiyasi bilan parallel qayta ishlash
+
+    Args:
+        sheets: {varaq_nomi: DataFrame}
+        worker: Modul darajasidagi funksiya (jarayonlar o'rtasida uzatiladi)
+        max_workers: 1 - shu jarayonda ketma-ket, ko'proq - umumiy jarayonlar havzasida (default: MAX_SHEET_WORKERS)
+
+    Returns:
+        (natijalar {varaq_nomi: natija}, xatoliklar {varaq_nomi: xabar}) - varaqlar tartibi saqlanadi
+    """
+    workers = min(max_workers or MAX_SHEET_WORKERS, len(sheets))
+    outcomes: Dict[str, Any] = {}
+
+    if workers > 1:
+        try:
+            # Umumiy forkserver havzasi - bot jarayoni fork qilinmaydi, havza yopilmaydi
+            futures = {name: submit_to_pool(worker, frame) for name, frame in sheets.items()}
+            for name, future in futures.items():
+                try:
+                    outcomes[name] = future.result()
+                except BrokenProcessPool as e:
+                    # Worker jarayoni to'xtadi - varaq quyida shu jarayonda qayta ishlanadi
+                    logger.warning(f"'{name}' varag'i jarayoni to'xtadi, qayta ishlanadi: {e}")
+                except Exception as e:
+                    outcomes[name] = e
+        except (OSError, RuntimeError) as e:
+            # Jarayon ochib bo'lmasa (cheklangan muhit) - ketma-ket ishlash
+            logger.warning(f"Jarayonlar havzasini ishga tushirib bo'lmadi, ketma-ket ishlanadi: {e}")
+            outcomes = {}
+
+    for name, frame in sheets.items():
+        if name not in outcomes:
+            try:
+                outcomes[name] = worker(frame)
+            except Exception as e:
+                outcomes[name] = e
+
+    results = {}
+    errors = {}
+    for name in sheets:
+        outcome = outcomes[name]
+        if isinstance(outcome, Exception):
+            logger.error(f"❌ '{name}' varag'ini qayta ishlashda xatolik: {outcome}")
+            errors[name] = str(outcome)
+        else:
+            results[name] = outcome
+
+    return results, errors
+
+
+def clean_workbook(sheets: Dict[str, pd.DataFrame],
+                   max_workers: Optional[int] = None) -> Tuple[Dict[str, Tuple[pd.DataFrame, Dict]], Dict[str, str]]:
+    """Barcha varaqlarni parallel tozalash"""
+    return process_sheets(sheets, clean_sheet, max_workers)
+
+
+def analyze_workbook(sheets: Dict[str, pd.DataFrame], max_workers: Optional[int] = None,
+                     answer_key: Optional[List[str]] = None,
+                     auto_clean: bool = True) -> Tuple[Dict[str, Dict], Optional[Dict], Dict[str, str]]:
+    """
+    Barcha varaqlarni parallel tahlil qilish va birlashtirilgan tahlil
+
+    Birlashtirilgan tahlil faqat barcha varaqlarda savollar bir xil bo'lsa bajariladi.
+
+    Args:
+        answer_key: Xom javoblar uchun to'g'ri javoblar kaliti (barcha varaqlarga)
+        auto_clean: Tayyor bo'lmagan varaqlarni avtomatik tozalash (Auto File Cleaner)
+
+    Returns:
+        (varaqlar natijalari, birlashtirilgan natija yoki None, xatoliklar)
+    """
+    worker = partial(analyze_sheet, answer_key=answer_key, auto_clean=auto_clean)
+    sheet_results, errors = process_sheets(sheets, worker, max_workers)
+
+    combined = None
+    if len(sheet_results) > 1:
+        responses = [item['responses'] for item in sheet_results.values()]
+        if all(list(frame.columns) == list(responses[0].columns) for frame in responses):
+            person_names = []
+            for name, item in sheet_results.items():
+                names = item['person_names'] or [f"{i + 1}" for i in range(len(item['responses']))]
+                person_names.extend(f"{person} ({name})" for person in names)
+
+            combined_responses = pd.concat(responses, ignore_index=True)
+            try:
+                combined = RaschAnalyzer().fit(combined_responses, person_names=person_names)
+            except Exception as e:
+                logger.error(f"❌ Birlashtirilgan tahlilda xatolik: {e}")
+                errors[COMBINED_SHEET_NAME] = str(e)
+        else:
+            logger.info("ℹ️ Varaqlardagi savollar soni har xil - birlashtirilgan tahlil bajarilmaydi")
+
+    return {name: item['results'] for name, item in sheet_results.items()}, combined, errors
+
+
+def get_workbook_cleaning_report(cleaned: Dict[str, Tuple[pd.DataFrame, Dict]], errors: Dict[str, str]) -> str:
+    """Ko'p varaqli faylni tozalash bo'yicha qisqa umumiy hisobot"""
+    report = [f"📑 *KO'P VARAQLI FAYL* ({len(cleaned) + len(errors)} ta varaq)\n"]
+
+    total_rows = 0
+    for name, (data, metadata) in cleaned.items():
+        n_questions = len(metadata.get('detected_question_columns', []))
+        total_rows += len(data)
+        report.append(f"✅ *{name}*: {len(data)} qator, {n_questions} savol, "
+                      f"{len(metadata.get('removed_columns', []))} ustun o'chirildi")
+        for warning in metadata.get('warnings', [])[:2]:
+            report.append(f"   ⚠️ {warning}")
+
+    for name, error in errors.items():
+        report.append(f"❌ *{name}*: {error}")
+
+    report.append(f"\n👥 Jami: {total_rows} qator")
+    return "\n".join(report)
+
+
+def write_cleaned_workbook(cleaned: Dict[str, Tuple[pd.DataFrame, Dict]], file_path: str) -> str:
+    """Tozalangan varaqlarni bitta Excel faylga (har biri alohida varaq) yozish"""
+    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+        for name, (data, _) in cleaned.items():
+            data.to_excel(writer, sheet_name=name[:31], index=False)
+    return file_path
+
+
+def sheet_file_suffix(sheet_name: str) -> str:
+    """Varaq nomidan fayl nomiga mos qo'shimcha yasash"""
+    suffix = re.sub(r'[^\w-]+', '_', str(sheet_name), flags=re.UNICODE).strip('_')
+    return suffix or 'varaq'
@@ -38,6 +38,7 @@ async def run_teacher_bot():
         successful_payment_callback
     )
     from bot.utils.test_scheduler import check_and_finalize_expired_tests
+    from bot.main import post_shutdown
     from telegram.ext import CommandHandler, MessageHandler, CallbackQueryHandler, PreCheckoutQueryHandler, filters, ContextTypes
     
     async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
@@ -56,7 +57,7 @@ async def run_teacher_bot():
     
     logger.info("O'qituvchi boti ishga tushmoqda...")
     
-    application = Application.builder().token(bot_token).build()
+    application = Application.builder().token(bot_token).post_shutdown(post_shutdown).build()
     
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("help", help_command))
@@ -124,6 +125,8 @@ async def run_teacher_bot():
         await application.updater.stop()
         await application.stop()
         await application.shutdown()
+        # application.shutdown() post_shutdown'ni chaqirmaydi (faqat run_polling chaqiradi)
+        await application.post_shutdown(application)
 
 
 async def run_student_bot():
@@ -0,0 +1,10 @@
+import pytest
+
+from bot.utils.process_pool import shutdown_process_pool
+
+
+@pytest.fixture(scope="session", autouse=True)
+def process_pool():
+    # Umumiy havza testlar oxirida yopiladi - worker jarayonlari qolib ketmaydi
+    yield
+    shutdown_process_pool()
@@ -0,0 +1,23 @@
+from benchmarks.cleaner_benchmark import find_regressions, run_case
+from bot.utils.sample_file_generator import SampleFileGenerator
+
+
+def test_synthetic_exports_cleaned_with_step_timings(tmp_path):
+    generator = SampleFileGenerator(output_dir=str(tmp_path))
+
+    for kind in SampleFileGenerator.SYNTHETIC_KINDS:
+        result = run_case(generator, kind, n_rows=60, n_columns=16, repeats=1)
+
+        assert result['output_shape'][0] == 60
+        assert result['peak_memory_mb'] > 0
+        assert {'remove_empty', 'convert_numeric', 'standardize_names'} <= set(result['steps'])
+
+
+def test_regression_threshold():
+    baseline = [{'kind': 'evalbee', 'rows': 100, 'columns': 10, 'total_seconds': 0.10, 'peak_memory_mb': 5.0}]
+    slower = [{'kind': 'evalbee', 'rows': 100, 'columns': 10, 'total_seconds': 0.20, 'peak_memory_mb': 5.5}]
+    noisy = [{'kind': 'evalbee', 'rows': 100, 'columns': 10, 'total_seconds': 0.11, 'peak_memory_mb': 5.0}]
+
+    regressions = find_regressions(slower, baseline, threshold=0.25)
+    assert len(regressions) == 1 and "vaqt" in regressions[0]
+    assert find_regressions(noisy, baseline, threshold=0.25) == []
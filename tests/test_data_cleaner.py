@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from bot.utils.data_cleaner import DataCleaner
+
+
+def test_long_preamble_removed_in_large_file():
+    rng = np.random.default_rng(1)
+    n_preamble, n_students = 25, 600
+    preamble = [[f"Hisobot qatori {i}", "izoh", None, None] for i in range(n_preamble)]
+    answers = [[f"Talabgor {i}", *rng.integers(0, 2, 3)] for i in range(n_students)]
+    df = pd.DataFrame(preamble + answers, columns=["A", "B", "C", "D"])
+    # Bo'sh qatorlar o'chirilgandan keyin indeks 0 dan boshlanmaydi
+    df.index = df.index + 5
+
+    cleaned = DataCleaner()._remove_metadata_rows(df, {'removed_rows': []})
+
+    assert len(cleaned) == n_students
+    assert cleaned.iloc[0, 0] == "Talabgor 0"
+
+
+def test_text_rows_after_preamble_window_are_kept():
+    rows = [["Sarlavha", "x", "y"]] + [[f"Ism {i}", 1, 0] for i in range(300)]
+    rows[150] = ["Ism 149b", None, None]
+    df = pd.DataFrame(rows, columns=["A", "B", "C"])
+
+    metadata = {'removed_rows': []}
+    cleaned = DataCleaner()._remove_metadata_rows(df, metadata)
+
+    assert [r['index'] for r in metadata['removed_rows']] == [0]
+    assert len(cleaned) == 300
+
+
+def test_student_rows_with_text_columns_are_kept():
+    rng = np.random.default_rng(0)
+    n = 2000
+    header = pd.DataFrame([["Maktab 12", None, None, None, None],
+                           ["Familiya", "Ism", "Sinf", "Savol 1", "Savol 2"]],
+                          columns=["A", "B", "C", "D", "E"])
+    students = pd.DataFrame({"A": [f"Familiya {i}" for i in range(n)],
+                             "B": [f"Ism {i}" for i in range(n)],
+                             "C": ["9-A"] * n,
+                             "D": rng.integers(0, 2, n),
+                             "E": rng.integers(0, 2, n)})
+    df = pd.concat([header, students], ignore_index=True)
+
+    metadata = {'removed_rows': []}
+    cleaned = DataCleaner()._remove_metadata_rows(df, metadata)
+
+    assert [r['index'] for r in metadata['removed_rows']] == [0, 1]
+    assert len(cleaned) == n
+
+
+def test_cleaning_profile_reused_for_same_layout(tmp_path, monkeypatch):
+    from bot.utils.cleaning_profiles import CleaningProfileManager
+
+    manager = CleaningProfileManager(data_file=str(tmp_path / "profiles.json"))
+    cleaner = DataCleaner(profile_manager=manager)
+    week1 = pd.DataFrame({
+        "Email": [f"a{i}@maktab.uz" for i in range(6)],
+        "F.I.O": [f"Ism{i} Familiya{i}" for i in range(6)],
+        "Savol 1": [1, 0, 1, 1, 0, 1],
+        "Savol 2": [0, 0, 1, 1, 1, 0],
+    })
+    first, first_meta = cleaner.clean_data(week1, teacher_id=7)
+    assert 'cleaning_profile' not in first_meta
+
+    # Ikkinchi haftada aniqlash bosqichi umuman chaqirilmasligi kerak
+    def fail(*args, **kwargs):
+        raise AssertionError("column detection should be skipped")
+    monkeypatch.setattr(DataCleaner, "_smart_column_detection", fail)
+
+    # Yaqinda saqlangan profil tegilganda JSON qayta yozilmaydi
+    saves = []
+    monkeypatch.setattr(manager, "_save_profiles", saves.append)
+
+    week2 = week1.copy()
+    week2["Savol 1"] = [0, 0, 0, 1, 1, 1]
+    second, second_meta = cleaner.clean_data(week2, teacher_id=7)
+
+    assert second_meta['cleaning_profile'] == 'cached'
+    assert second_meta['file_format'] == first_meta['file_format'] == 'standard'
+    assert saves == []
+    assert list(second.columns) == list(first.columns) == ["Talabgor", "Savol_1", "Savol_2"]
+    assert second["Savol_1"].tolist() == [0, 0, 0, 1, 1, 1]
+    assert [c['name'] for c in second_meta['removed_columns']] == ["Email"]
+
+
+def test_numeric_conversion_uses_int8_and_reports_invalid_cells():
+    df = pd.DataFrame({
+        "Talabgor": [f"Ism{i} Familiya{i}" for i in range(4)],
+        "Savol 1": [1, 0, None, 1],
+        "Savol 2": [3, 5, 2, 0],
+        "Savol 3": [0, 2, 1, 0],
+    })
+    metadata = {'preserved_participant_columns': ["Talabgor"], 'warnings': []}
+
+    converted = DataCleaner()._convert_to_numeric(df, metadata)
+
+    assert str(converted["Savol 1"].dtype) == "Int8"
+    assert converted["Savol 1"].tolist() == [1, 0, 0, 1]
+    assert converted["Savol 2"].dtype == "float64"
+    assert metadata['invalid_cell_count'] == 4
+    assert metadata['invalid_cells'][0] == {'row': 0, 'column': "Savol 2", 'value': 3.0}
+
+    is_valid, message = DataCleaner()._validate_binary_data(converted, metadata)
+    assert not is_valid
+    assert "Savol 2: 1-qator: 3" in message
+
+
+def test_evalbee_raw_options_scored_against_key_columns():
+    df = pd.DataFrame({
+        "Name": ["Ali Valiyev", "Bobur Karimov", "Dilnoza Aliyeva"],
+        **{f"Q {q} Options": opts for q, opts in enumerate([["A", "B", "A"], ["C", "C", None], ["D", "b", "B"]], 1)},
+        **{f"Q {q} Key": [key] * 3 for q, key in enumerate(["A", "C", "B"], 1)},
+    })
+
+    cleaned, metadata = DataCleaner().clean_data(df)
+
+    assert metadata['scoring'] == 'raw_answers'
+    assert cleaned[["Savol_1", "Savol_2", "Savol_3"]].values.tolist() == [[1, 1, 0], [0, 1, 1], [1, 0, 1]]
+    assert metadata['distractor_frequencies']["Q 2 Marks"] == {'key': 'C', 'counts': {'C': 2}, 'blank': 1}
+
+
+def test_evalbee_marks_kept_unless_rescoring_requested():
+    df = pd.DataFrame({
+        "Name": ["Ali Valiyev", "Bobur Karimov", "Dilnoza Aliyeva"],
+        **{f"Q {q} Options": opts for q, opts in enumerate([["A", "B", "A"], ["C", "C", "D"], ["D", "B", "B"]], 1)},
+        **{f"Q {q} Key": [key] * 3 for q, key in enumerate(["A", "C", "B"], 1)},
+        # Evalbee qisman ball bergan (1-savol, 2-talabgor) - kalit bo'yicha 0
+        **{f"Q {q} Marks": marks for q, marks in enumerate([[1, 1, 1], [1, 1, 0], [0, 1, 1]], 1)},
+    })
+
+    cleaned, metadata = DataCleaner().clean_data(df)
+    assert 'scoring' not in metadata
+    assert cleaned[["Savol_1", "Savol_2", "Savol_3"]].values.tolist() == [[1, 1, 0], [1, 1, 1], [1, 0, 1]]
+    assert any("Marks saqlandi" in warning for warning in metadata['warnings'])
+    assert metadata['distractor_frequencies']["Q 1 Marks"]['key'] == 'A'
+
+    cleaned, metadata = DataCleaner().clean_data(df, rescore_raw_answers=True)
+    assert metadata['scoring'] == 'raw_answers'
+    assert cleaned[["Savol_1", "Savol_2", "Savol_3"]].values.tolist() == [[1, 1, 0], [0, 1, 1], [1, 0, 1]]
+
+
+def test_option_label_prefix_only_for_letter_keys():
+    from bot.utils.answer_scoring import score_answers
+
+    answers = pd.DataFrame({"Q1": ["1.5", "1", "A) Toshkent"], "Q2": ["B. Samarqand", "-1", "12"]})
+    scored, _ = score_answers(answers, ["1", "B"])
+    assert scored.values.tolist() == [[0, 1], [1, 0], [0, 0]]
+
+
+def test_google_forms_answers_scored_with_supplied_key():
+    from bot.utils.answer_scoring import parse_answer_key
+
+    df = pd.DataFrame({
+        "Timestamp": ["2024/05/01 10:00"] * 3,
+        "Email Address": ["a@x.uz", "b@x.uz", "c@x.uz"],
+        "Score": ["2 / 3", "1 / 3", "3 / 3"],
+        "Ism familiya": ["Ali Valiyev", "Bobur Karimov", "Dilnoza Aliyeva"],
+        "Poytaxt?": ["A) Toshkent", "B) Samarqand", "A) Toshkent"],
+        "2+2=?": ["C) 4", "C) 4", "C) 4"],
+        "Eng uzun daryo?": ["A) Sirdaryo", "B) Amudaryo", "B) Amudaryo"],
+    })
+
+    cleaned, metadata = DataCleaner().clean_raw_answers(df, parse_answer_key("1a2c3b"))
+
+    assert list(cleaned.columns) == ["Talabgor", "Savol_1", "Savol_2", "Savol_3"]
+    assert cleaned["Talabgor"].tolist() == ["Ali Valiyev", "Bobur Karimov", "Dilnoza Aliyeva"]
+    assert cleaned[["Savol_1", "Savol_2", "Savol_3"]].sum(axis=1).tolist() == [2, 2, 3]
+
+
+def test_mixed_answer_cells_normalized_without_per_cell_calls():
+    from bot.utils.answer_scoring import normalize_answers
+
+    df = pd.DataFrame({
+        "text": [" a ", None, "c) x"],
+        "float": [1.0, 2.5, np.nan],
+        "mixed": pd.Series(["b", 3.0, 7], dtype=object),
+        "int": [1, 2, 3],
+    })
+
+    assert normalize_answers(df).tolist() == [
+        ["A", "1", "B", "1"],
+        ["", "2.5", "3", "2"],
+        ["C) X", "", "7", "3"],
+    ]
+
+
+def test_clean_binary_matrix_takes_fast_path():
+    df = pd.read_excel("data/test/test_tozalangan.xlsx")
+
+    cleaned, metadata = DataCleaner().clean_data(df)
+
+    assert metadata["fast_path"] is True
+    assert list(cleaned.columns) == ["Talabgor"] + [f"Savol_{i}" for i in range(1, 6)]
+    assert cleaned["Talabgor"].tolist()[0] == "Ali Valiyev"
+    assert metadata["detected_name_columns"][0]["column"] == "Talabgor_2"
+    assert metadata["binary_check"]["ratio"] == 1.0
+
+    # Bitta bo'sh katak - odatdagi to'liq tozalash
+    df.loc[1, "Savol_3"] = None
+    _, metadata = DataCleaner().clean_data(df)
+    assert "fast_path" not in metadata
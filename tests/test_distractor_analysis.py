@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from bot.utils.distractor_analysis import analyze_distractors
+from bot.utils.pdf_generator import PDFReportGenerator
+from bot.utils.rasch_analysis import RaschAnalyzer
+from bot.utils import test_manager
+
+
+def test_option_frequencies_point_biserial_and_curves():
+    # 6 talabgor, 2 savol, 4 variant; kalit: A, C
+    answers = np.array([
+        [0, 2],
+        [0, 2],
+        [0, 1],
+        [1, 2],
+        [1, -1],
+        [3, 1],
+    ])
+    abilities = np.array([2.0, 1.5, 0.5, 0.0, -1.0, -2.0])
+
+    analysis = analyze_distractors(answers, [0, 2], abilities=abilities, n_options=4)
+    first, second = analysis['items']
+
+    assert analysis['option_labels'] == ['A', 'B', 'C', 'D']
+    assert [option['count'] for option in first['options']] == [3, 2, 0, 1]
+    assert first['key_label'] == 'A'
+    assert second['blank'] == 1
+
+    key = first['options'][0]
+    chosen = (answers[:, 0] == 0).astype(float)
+    assert np.isclose(key['point_biserial'], np.corrcoef(chosen, abilities)[0, 1])
+    assert first['options'][2]['point_biserial'] is None
+
+    # Yuqori guruh faqat A ni, past guruh B va D ni tanlagan
+    assert key['group_proportions'] == [0.0, 0.5, 1.0]
+    assert "C deyarli tanlanmagan" in first['flags']
+
+
+def test_answer_matrix_from_submissions_feeds_report(tmp_path):
+    manager = test_manager.TestManager(data_file=str(tmp_path / "tests.json"))
+    test_id = manager.create_test(1, {'name': 'Demo'})
+    for correct in [0, 1, 2]:
+        manager.add_question(test_id, {'text': 'Savol', 'options': ['a', 'b', 'c', 'd'], 'correct_answer': correct})
+
+    tests = manager._load_tests()
+    tests[test_id]['participants'] = {}
+    rng = np.random.default_rng(3)
+    for student in range(12):
+        chosen = rng.integers(-1, 4, size=3).tolist()
+        tests[test_id]['participants'][str(student)] = {
+            'student_id': student,
+            'submitted': True,
+            'results': [{'student_answer': answer, 'correct': answer == key}
+                        for answer, key in zip(chosen, [0, 1, 2])]
+        }
+    manager._save_tests(tests)
+
+    matrix = manager.get_test_results_matrix(test_id)
+    answer_data = manager.get_test_answer_matrix(test_id)
+    assert len(answer_data['answers']) == matrix['n_participants']
+    assert answer_data['answer_key'] == [0, 1, 2]
+    assert answer_data['n_options'] == 4
+
+    expected = (np.array(answer_data['answers']) == np.array([0, 1, 2])).astype(int)
+    assert (expected == np.array(matrix['matrix'])).all()
+
+    results = RaschAnalyzer().fit(pd.DataFrame(matrix['matrix'], columns=matrix['item_names']))
+    results['distractor_analysis'] = analyze_distractors(
+        answer_data['answers'], answer_data['answer_key'],
+        item_names=answer_data['item_names'], abilities=results['person_ability'],
+        n_options=answer_data['n_options']
+    )
+    path = PDFReportGenerator(output_dir=str(tmp_path)).generate_report(results)
+    assert os.path.exists(path) and path.endswith("statistika.pdf")
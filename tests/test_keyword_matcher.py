@@ -0,0 +1,19 @@
+from bot.utils.keyword_matcher import KeywordMatcher
+
+
+def test_returns_first_keyword_in_list_order():
+    matcher = KeywordMatcher(['savol', 'mat', 'matematika'])
+
+    # 'matematika' va 'mat' ikkalasi ham uchraydi - ro'yxatda birinchisi qaytadi
+    assert matcher.find('matematika_savol_1') == 'savol'
+    assert matcher.find('matematika_1') == 'mat'
+    assert matcher.find('fizika') is None
+
+
+def test_overlapping_keywords_and_index():
+    matcher = KeywordMatcher(['student name', 'name', '@'])
+
+    assert matcher.find('student name') == 'student name'
+    assert matcher.index('full name') == 1
+    assert matcher.matches('user@mail')
+    assert not KeywordMatcher([]).matches('anything')
@@ -0,0 +1,176 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from reportlab.graphics.shapes import Drawing
+
+from benchmarks.rasch_benchmark import simulate_responses
+from bot.utils import report_styles
+from bot.utils.pdf_generator import PDFReportGenerator, calculate_section_scores, cleanup_stale_job_dirs
+from bot.utils.report_charts import sweep_label_offsets
+from bot.utils.rasch_analysis import RaschAnalyzer
+
+
+@pytest.fixture(scope="module")
+def results():
+    responses, _, _ = simulate_responses(40, 12, seed=1)
+    frame = pd.DataFrame(responses, columns=[f"Savol_{i + 1}" for i in range(12)])
+    return RaschAnalyzer().fit(frame)
+
+
+def test_concurrent_jobs_write_to_separate_dirs(tmp_path, results):
+    first = PDFReportGenerator(output_dir=str(tmp_path))
+    second = PDFReportGenerator(output_dir=str(tmp_path))
+
+    first_pdf = first.generate_report(results, filename="statistika")
+    second_pdf = second.generate_report(results, filename="statistika")
+    assert os.path.basename(first_pdf) == os.path.basename(second_pdf) == "statistika.pdf"
+    assert first_pdf != second_pdf
+    assert os.listdir(first.output_dir) == ["statistika.pdf"]
+
+    first.cleanup()
+    assert not os.path.exists(first.output_dir)
+    assert os.path.exists(second_pdf)
+
+    with PDFReportGenerator(output_dir=str(tmp_path), job_id=second.job_id) as resumed:
+        assert resumed.output_dir == second.output_dir
+    assert not os.path.exists(second.output_dir)
+
+
+def test_stale_job_dirs_are_swept(tmp_path):
+    stale = PDFReportGenerator(output_dir=str(tmp_path))
+    fresh = PDFReportGenerator(output_dir=str(tmp_path))
+    os.utime(stale.output_dir, (0, 0))
+
+    assert cleanup_stale_job_dirs(str(tmp_path), max_age_seconds=3600) == 1
+    assert not os.path.exists(stale.output_dir)
+    assert os.path.exists(fresh.output_dir)
+
+
+def test_charts_are_vector_drawings(tmp_path, results):
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        for chart in (generator._create_t_score_distribution(results),
+                      generator._create_grade_distribution(results),
+                      generator._create_item_person_map(results)):
+            assert isinstance(chart, Drawing) and chart.getContents()
+
+        pdf_path = generator.generate_person_results_report(results)
+        assert os.listdir(generator.output_dir) == [os.path.basename(pdf_path)]
+
+
+def test_sweep_label_offsets_match_pairwise_placement():
+    values = np.sort(np.random.default_rng(3).normal(0, 0.3, 60))
+
+    # Oldingi O(n²) joylashtirish
+    expected = []
+    for value in values:
+        offset = 0
+        for previous, previous_offset in expected:
+            if abs(value - previous) < 0.12:
+                offset = previous_offset + 0.15
+                if offset > 0.6:
+                    offset = 0
+        expected.append((value, offset))
+
+    assert np.allclose(sweep_label_offsets(values), [offset for _, offset in expected])
+
+
+def test_batch_certificates_match_single_api(tmp_path):
+    students = [
+        {'student_name': f"Talabgor {i}", 'score': i, 'max_score': 30, 'percentage': i * 100 / 30,
+         'theta': (i - 15) / 5, 't_score': 50 + i - 15, 'filename': f"cert_{i}"}
+        for i in range(30)
+    ]
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        paths = generator.generate_certificates("Matematika", "Algebra", students)
+        assert [os.path.basename(path) for path in paths] == [f"cert_{i}.pdf" for i in range(30)]
+        assert all(os.path.getsize(path) > 0 for path in paths)
+
+        single = generator.generate_certificate("Talabgor 7", "Matematika", "Algebra", 7, 30, 23.3, -1.6, 42.0,
+                                                filename="yakka")
+        assert os.path.basename(single) == "yakka.pdf"
+
+
+def test_bad_student_record_does_not_drop_cohort(tmp_path):
+    students = [
+        {'student_name': f"Talabgor {i}", 'score': i, 'max_score': 3, 'percentage': i * 100 / 3,
+         'theta': 0.0, 't_score': 50.0, 'filename': f"cert_{i}"}
+        for i in range(3)
+    ]
+    students[1]['percentage'] = "yuz"
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        paths = generator.generate_certificates("Matematika", "Algebra", students)
+        assert paths[1] is None
+        assert [os.path.basename(path) for path in (paths[0], paths[2])] == ["cert_0.pdf", "cert_2.pdf"]
+
+
+def test_large_person_table_is_split_into_page_blocks(tmp_path, monkeypatch, results):
+    individual = results['person_statistics']['individual'] * 5
+    large = dict(results, n_persons=len(individual), person_statistics={'individual': individual})
+
+    built = []
+    monkeypatch.setattr("bot.utils.pdf_generator.SimpleDocTemplate.build",
+                        lambda self, story: built.extend(story))
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        generator.generate_person_results_report(large)
+
+    tables = [flowable for flowable in built if type(flowable).__name__ == 'Table'][1:]
+    assert len(tables) > 1
+    assert sum(len(table._cellvalues) - 1 for table in tables) == len(individual)
+    assert all(table._cellvalues[0][0] == 'Rank' for table in tables)
+
+
+def test_section_report_uses_page_blocks_and_person_lookup(tmp_path, monkeypatch):
+    responses, _, _ = simulate_responses(200, 12, seed=2)
+    large = RaschAnalyzer().fit(pd.DataFrame(responses, columns=[f"Savol_{i + 1}" for i in range(12)]))
+    individual = large['person_statistics']['individual']
+    sections = {'Algebra': [1, 2, 3, 4, 5, 6], 'Geometriya': [7, 8, 9, 10, 11, 12]}
+
+    built = []
+    monkeypatch.setattr("bot.utils.pdf_generator.SimpleDocTemplate.build",
+                        lambda self, story: built.extend(story))
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        generator.generate_section_results_report(large, section_questions=sections)
+
+    tables = [flowable for flowable in built if type(flowable).__name__ == 'Table'][1:-1]
+    assert len(tables) > 1
+    rows = [row for table in tables for row in table._cellvalues[1:]]
+    assert len(rows) == len(individual)
+
+    expected = {p['person_id']: f"{p['t_score']:.1f}" for p in calculate_section_scores(large, sections)['Algebra']}
+    assert all(row[3] == expected[int(row[1].split()[-1])] for row in rows)
+
+
+def test_report_styles_are_built_once(monkeypatch):
+    styles = report_styles.stylesheet()
+    assert report_styles.stylesheet() is styles
+    assert styles['CustomHeading'].fontName == report_styles.fonts().bold
+    assert report_styles.header_table_style('#3498DB') is report_styles.header_table_style('#3498DB')
+
+    monkeypatch.delenv('REPORT_FONT_DIR', raising=False)
+    monkeypatch.setattr(report_styles, 'FONT_SEARCH_DIRS', ())
+    assert report_styles.fonts.__wrapped__() == report_styles.FALLBACK_FONTS
+
+
+def test_section_scores_match_per_person_loop():
+    rng = np.random.default_rng(11)
+    matrix = rng.integers(0, 2, (50, 10))
+    matrix[:5] = 0
+    t_scores = rng.normal(50, 10, 50)
+    results = {'n_items': 10, 'response_matrix': matrix,
+               'person_statistics': {'individual': [{'t_score': float(t)} for t in t_scores]}}
+    sections = {'Algebra': [1, 2, 3, 3], 'Geometriya': [4, 5, 6, 7], "Bo'sh": [], 'Tashqi': [42]}
+
+    scores = calculate_section_scores(results, sections)
+
+    assert scores["Bo'sh"] == [] and scores['Tashqi'] == []
+    for person_idx, overall in enumerate(t_scores):
+        # Oldingi har bir talabgor uchun alohida hisob
+        raw = {name: int(matrix[person_idx, [q - 1 for q in sections[name]]].sum()) for name in ('Algebra', 'Geometriya')}
+        total = sum(raw.values())
+        for name in raw:
+            entry = scores[name][person_idx]
+            expected = overall * (raw[name] / total) if total > 0 else overall / 2
+            assert entry == {'person_id': person_idx + 1, 'raw_score': raw[name],
+                             'max_score': len(sections[name]), 't_score': expected}
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+from bot.utils.process_pool import get_process_pool, submit_to_pool
+
+
+def test_broken_pool_replaced_on_next_submit():
+    with pytest.raises(BrokenProcessPool):
+        submit_to_pool(os._exit, 1).result(timeout=60)
+    broken = get_process_pool()
+
+    assert submit_to_pool(pow, 2, 10).result(timeout=60) == 1024
+    assert get_process_pool() is not broken
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import write_csv
+from benchmarks.rasch_benchmark import run_case, simulate_responses
+from bot.utils.rasch_analysis import RaschAnalyzer
+
+
+def test_parameters_recovered_with_stage_timings(tmp_path):
+    result = run_case(n_persons=300, n_items=20, missing_rate=0.1, seed=2)
+
+    assert result['difficulty_rmse'] < 0.3
+    assert result['ability_correlation'] > 0.8
+    assert all(result[key] > 0 for key in ('mml_seconds', 'ability_seconds', 'se_seconds', 'total_seconds'))
+
+    path = write_csv([result], str(tmp_path / "rasch.csv"))
+    assert pd.read_csv(path).loc[0, 'items'] == 20
+
+
+def test_fit_accepts_missing_responses():
+    responses, _, _ = simulate_responses(50, 8, missing_rate=0.2, seed=1)
+
+    results = RaschAnalyzer().fit(pd.DataFrame(responses))
+
+    raw_scores = [person['raw_score'] for person in results['person_statistics']['individual']]
+    assert raw_scores == np.nansum(responses, axis=1).astype(int).tolist()
+    assert np.isfinite(results['item_difficulty']).all()
@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.rasch_benchmark import simulate_responses
+from bot.utils.pdf_generator import PDFReportGenerator
+from bot.utils.rasch_analysis import RaschAnalyzer
+from bot.utils.report_orchestrator import ReportTask, send_reports
+
+SECTIONS = {'Algebra': list(range(1, 7)), 'Geometriya': list(range(7, 13))}
+
+
+@pytest.fixture(scope="module")
+def results():
+    responses, _, _ = simulate_responses(40, 12, seed=2)
+    frame = pd.DataFrame(responses, columns=[f"Savol_{i + 1}" for i in range(12)])
+    return RaschAnalyzer().fit(frame)
+
+
+def _tasks(results):
+    return [
+        ReportTask('general', results, "umumiy", filename="statistika"),
+        ReportTask('person', results, "talabgorlar", section_questions=SECTIONS, upload_name="natijalar.pdf"),
+        ReportTask('section', results, "bo'limlar", section_questions=SECTIONS),
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_reports_are_sent_as_they_are_ready(tmp_path, results, max_workers):
+    sent = []
+
+    async def send_document(document, filename, caption):
+        sent.append((filename, caption, len(document.read())))
+
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        paths = asyncio.run(send_reports(generator, _tasks(results), send_document, max_workers=max_workers))
+        assert sorted(os.listdir(generator.output_dir)) == [
+            'bulimlar-statistikasi.pdf', 'statistika.pdf', 'talabgorlar-statistikasi.pdf'
+        ]
+
+    assert set(paths) == {'general', 'person', 'section'}
+    assert sorted((filename, caption) for filename, caption, _ in sent) == [
+        ('bulimlar-statistikasi.pdf', "bo'limlar"), ('natijalar.pdf', 'talabgorlar'), ('statistika.pdf', 'umumiy')
+    ]
+    assert all(size > 0 for _, _, size in sent)
+
+
+def test_report_failure_is_raised(tmp_path, results):
+    async def send_document(document, filename, caption):
+        pass
+
+    broken = dict(results, person_statistics={'individual': [{'t_score': 50.0}]}, n_persons=None)
+    with PDFReportGenerator(output_dir=str(tmp_path)) as generator:
+        with pytest.raises(KeyError):
+            asyncio.run(send_reports(generator, [ReportTask('person', broken, "x")], send_document))
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from bot.utils.rasch_analysis import RaschAnalyzer
+from bot.utils.result_export import (
+    PARQUET_AVAILABLE, export_results_csv, export_results_excel, export_results_parquet, t_score_grades, write_parquet
+)
+from bot.utils.upload_loader import UploadedFile
+
+requires_parquet = pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow o'rnatilmagan")
+
+
+@requires_parquet
+def test_cleaned_matrix_round_trips_through_parquet(tmp_path):
+    cleaned = pd.DataFrame({
+        "Talabgor": ["Ali Valiyev", 12345, None],
+        "Savol_1": pd.array([1, 0, 1], dtype="Int8"),
+        "Savol_2": [0.0, 1.0, np.nan],
+    })
+    path = write_parquet(cleaned, str(tmp_path / "cleaned.parquet"))
+
+    upload = UploadedFile(path)
+    data = upload.load()
+
+    assert upload.file_format == "parquet"
+    assert data["Talabgor"].tolist()[:2] == ["Ali Valiyev", "12345"]
+    assert str(data["Savol_1"].dtype) == "Int8"
+    assert data["Savol_2"].isna().tolist() == [False, False, True]
+
+
+@requires_parquet
+def test_person_and_item_results_exported(tmp_path):
+    rng = np.random.default_rng(5)
+    responses = pd.DataFrame(rng.integers(0, 2, (40, 6)), columns=[f"Savol_{i}" for i in range(1, 7)])
+    results = RaschAnalyzer().fit(responses, person_names=[f"Talabgor {i}" for i in range(40)])
+
+    paths = export_results_parquet(results, str(tmp_path))
+
+    persons = pd.read_parquet(paths["persons"])
+    items = pd.read_parquet(paths["items"])
+    assert len(persons) == 40 and persons["person_name"].iloc[0] == "Talabgor 0"
+    assert items["item"].tolist() == list(responses.columns)
+    assert np.allclose(items["difficulty"], results["item_difficulty"])
+
+
+def test_results_exported_to_excel_and_csv(tmp_path):
+    rng = np.random.default_rng(7)
+    responses = pd.DataFrame(rng.integers(0, 2, (30, 8)), columns=[f"Savol_{i}" for i in range(1, 9)])
+    results = RaschAnalyzer().fit(responses, person_names=[f"Талабгор {i}" for i in range(30)])
+    section_scores = {
+        'Algebra': [{'person_id': i + 1, 't_score': 20.0 + i} for i in range(30)],
+        'Geometriya': [{'person_id': i + 1, 't_score': 30.0} for i in range(30)],
+    }
+
+    workbook = load_workbook(export_results_excel(results, str(tmp_path), section_scores=section_scores))
+    persons = workbook['Talabgorlar']
+    header = [cell.value for cell in persons[1]]
+    assert header[-4:] == ['Algebra (T-Score)', 'Geometriya (T-Score)', 'Foiz', 'Daraja']
+    assert persons.max_row == 31
+    assert persons['A2'].value.startswith('=IF(F2="","",RANK(')
+    assert persons.conditional_formatting
+    assert workbook['Xulosa']['B2'].value == "=COUNTA('Talabgorlar'!$B$2:$B$31)"
+
+    t_scores = [persons.cell(row=row, column=6).value for row in range(2, 32)]
+    assert t_scores == sorted(t_scores, reverse=True)
+    assert [row[0].value for row in workbook['Savollar'].iter_rows(min_row=2)] == list(responses.columns)
+
+    paths = export_results_csv(results, str(tmp_path), section_scores=section_scores)
+    csv_persons = pd.read_csv(paths['persons'], encoding='utf-8-sig')
+    # RANK() kabi: teng T-Score'lar bir xil o'rinda
+    csv_t_scores = csv_persons['t_score'].tolist()
+    assert csv_persons['rank'].tolist() == [1 + sum(other > t for other in csv_t_scores) for t in csv_t_scores]
+    assert csv_persons['rank'].nunique() < 30
+    assert csv_persons['person_name'].str.startswith('Талабгор').all()
+    assert csv_persons['grade'].tolist() == t_score_grades(csv_persons['t_score'].to_numpy()).tolist()
+    assert set(csv_persons['grade']) <= {'A+', 'A', 'B+', 'B', 'C+', 'C', 'NC'}
+
+
+def test_csv_rank_blank_for_missing_t_score(tmp_path):
+    individual = [{'person_id': i + 1, 'person_name': f"T{i}", 'raw_score': 1, 'ability': 0.0, 'se': 1.0,
+                   'z_score': 0.0, 't_score': t}
+                  for i, t in enumerate([55.0, np.nan, 60.0, 55.0])]
+    results = {'person_statistics': {'individual': individual}, 'item_names': [], 'item_difficulty': []}
+
+    csv_persons = pd.read_csv(export_results_csv(results, str(tmp_path))['persons'], encoding='utf-8-sig')
+    assert csv_persons['rank'].tolist()[:3] == [1, 2, 2]
+    assert pd.isna(csv_persons['rank'].iloc[3])
+
+
+def test_t_score_grades_follow_uzbmb_thresholds():
+    grades = t_score_grades(np.array([70, 69.9, 65, 60, 55, 50, 46, 45.9, np.nan]))
+    assert grades.tolist() == ['A+', 'A', 'A', 'B+', 'B', 'C+', 'C', 'NC', '']
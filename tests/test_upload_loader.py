@@ -0,0 +1,88 @@
+import codecs
+import os
+import time
+
+from bot.utils import upload_loader
+from bot.utils.upload_loader import UploadedFile, cleanup_stale_cache, get_upload
+
+
+def test_csv_bom_and_delimiter_detected(tmp_path):
+    path = tmp_path / "javoblar.csv"
+    path.write_bytes(codecs.BOM_UTF8 + "Talabgor;Q1;Q2\nAli Valiyev;1;0\nBobur Karimov;0;1\n".encode("utf-8"))
+
+    upload = UploadedFile(str(path))
+    data = upload.load()
+
+    assert upload.file_format == "csv"
+    assert upload.encoding == "utf-8-sig"
+    assert upload.delimiter == ";"
+    assert list(data.columns) == ["Talabgor", "Q1", "Q2"]
+    assert data["Q1"].tolist() == [1, 0]
+
+
+def test_upload_parsed_once_per_file_id(tmp_path):
+    path = tmp_path / "javoblar.csv"
+    path.write_text("Q1,Q2\n1,0\n0,1\n", encoding="utf-8")
+
+    upload = get_upload(str(path), "file-id-1")
+    upload.cache_dir = str(tmp_path / "cache")
+    first = upload.load()
+
+    assert get_upload(str(path), "file-id-1") is upload
+    assert upload.load() is first
+
+    upload.discard()
+    assert get_upload(str(path), "file-id-1") is not upload
+
+
+def test_evicted_and_stale_cache_files_removed(tmp_path, monkeypatch):
+    path = tmp_path / "javoblar.csv"
+    path.write_text("Q1,Q2\n1,0\n0,1\n", encoding="utf-8")
+    monkeypatch.setattr(upload_loader, "MAX_CACHED_UPLOADS", 1)
+
+    first = get_upload(str(path), "evicted-id")
+    first.cache_dir = str(tmp_path / "cache")
+    first.load()
+    assert os.path.exists(first._cache_path())
+
+    # Xotiradan chiqarilgan yozuvning pickle fayli ham o'chadi, DataFrame esa qoladi
+    get_upload(str(path), "newer-id").discard()
+    assert not os.path.exists(first._cache_path())
+    assert first.load() is not None
+
+    orphan = tmp_path / "cache" / "orphan.pkl"
+    orphan.write_bytes(b"")
+    old = time.time() - 7 * 3600
+    os.utime(orphan, (old, old))
+    assert cleanup_stale_cache(str(tmp_path / "cache")) == 1
+    assert not orphan.exists()
+
+
+def test_wide_evalbee_export_reads_only_needed_columns(tmp_path):
+    import numpy as np
+    import pandas as pd
+
+    from bot.utils.data_cleaner import DataCleaner
+
+    rng = np.random.default_rng(1)
+    n = 12
+    columns = {"Exam Name": ["Test"] * n, "Roll No": list(range(n)), "Name": [f"Ism{i} Familiya{i}" for i in range(n)]}
+    for q in range(1, 6):
+        columns[f"Q {q} Options"] = rng.choice(list("ABCD"), n)
+        columns[f"Q {q} Marks"] = rng.integers(0, 2, n)
+    columns["Total Marks"] = rng.integers(0, 6, n)
+    frame = pd.DataFrame(columns)
+    path = tmp_path / "evalbee.xlsx"
+    frame.to_excel(path, index=False)
+
+    # Odatiy o'qish (File Analyzer va h.k.) barcha ustunlarni saqlaydi
+    assert list(UploadedFile(str(path)).load().columns) == list(frame.columns)
+
+    data = UploadedFile(str(path), prune_columns=True).load()
+
+    # Marks rejimi: Options va boshqa metadata ustunlari o'qilmaydi
+    assert list(data.columns) == ["Exam Name", "Name"] + [f"Q {q} Marks" for q in range(1, 6)]
+
+    cleaned, _ = DataCleaner().clean_data(data)
+    expected, _ = DataCleaner().clean_data(pd.read_excel(path))
+    pd.testing.assert_frame_equal(cleaned, expected)
@@ -0,0 +1,90 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from bot.utils import upload_preflight
+from bot.utils.upload_loader import UploadedFile
+from bot.utils.upload_preflight import QUEUE, REJECT, HeavyJobQueue, format_preflight_message, preflight_upload
+
+
+def _answers_frame(n_rows=300, n_items=20):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.integers(0, 2, (n_rows, n_items)), columns=[f"Q{i + 1}" for i in range(n_items)])
+    frame.insert(0, "Name", [f"Talabgor {i}" for i in range(n_rows)])
+    return frame
+
+
+def test_xlsx_dimensions_read_from_sample_only(tmp_path, monkeypatch):
+    path = tmp_path / "katta.xlsx"
+    _answers_frame().to_excel(path, index=False)
+
+    estimate = preflight_upload(UploadedFile(str(path)), sample_rows=50)
+    assert (estimate['rows'], estimate['columns']) == (301, 21)
+    assert estimate['decision'] == 'accept'
+    assert format_preflight_message(estimate) is None
+
+    monkeypatch.setattr(upload_preflight, 'QUEUE_THRESHOLD_SECONDS', 0.0)
+    assert preflight_upload(UploadedFile(str(path)))['decision'] == QUEUE
+
+    monkeypatch.setattr(upload_preflight, 'MAX_UPLOAD_CELLS', 1000)
+    rejected = preflight_upload(UploadedFile(str(path)))
+    assert rejected['decision'] == REJECT
+    assert "juda katta" in format_preflight_message(rejected)
+
+
+def test_csv_rows_estimated_from_head(tmp_path, monkeypatch):
+    path = tmp_path / "katta.csv"
+    _answers_frame(n_rows=5000).to_csv(path, index=False)
+    monkeypatch.setattr(upload_preflight, 'SNIFF_BYTES', 4096)
+
+    estimate = preflight_upload(UploadedFile(str(path)), sample_rows=100)
+    assert estimate['columns'] == 21
+    assert 4000 < estimate['rows'] < 6000
+
+
+def test_small_csv_rows_counted_beyond_sample(tmp_path):
+    path = tmp_path / "kichik.csv"
+    _answers_frame(n_rows=1000).to_csv(path, index=False)
+
+    estimate = preflight_upload(UploadedFile(str(path)))
+    assert (estimate['rows'], estimate['columns']) == (1000, 21)
+
+    # Oxirgi qatordan keyin yangi qator belgisi bo'lmasa ham
+    path.write_bytes(path.read_bytes().rstrip(b'\n'))
+    assert preflight_upload(UploadedFile(str(path)))['rows'] == 1000
+
+
+def test_heavy_job_queue_reports_pending_wait():
+    async def scenario():
+        queue = HeavyJobQueue(slots=1)
+        async with queue.slot(30):
+            inside = queue.expected_wait()
+        return inside, queue.expected_wait()
+
+    assert asyncio.run(scenario()) == (30, 0)
+
+
+def test_heavy_job_queue_holds_second_job_while_first_runs():
+    async def scenario():
+        queue = HeavyJobQueue(slots=1)
+        release = asyncio.Event()
+        started = []
+
+        async def job(name):
+            started.append(name)
+            await release.wait()
+
+        first = queue.submit(30, lambda: job("birinchi"))
+        second = queue.submit(20, lambda: job("ikkinchi"))
+        await asyncio.sleep(0)
+        in_flight = (list(started), queue.expected_wait())
+
+        release.set()
+        await asyncio.gather(first, second)
+        return in_flight, started, queue.expected_wait()
+
+    in_flight, started, after = asyncio.run(scenario())
+    assert in_flight == (["birinchi"], 50)
+    assert started == ["birinchi", "ikkinchi"]
+    assert after == 0
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from bot.utils.upload_loader import UploadedFile
+from bot.utils.workbook_processor import COMBINED_SHEET_NAME, analyze_workbook, clean_workbook, sheets_share_layout
+
+
+def _class_sheet(rng, n_students, prefix):
+    ability = rng.normal(size=(n_students, 1))
+    difficulty = np.linspace(-1.5, 1.5, 8)
+    answers = (rng.random((n_students, 8)) < 1 / (1 + np.exp(difficulty - ability))).astype(int)
+    frame = pd.DataFrame(answers, columns=[f"Savol {i}" for i in range(1, 9)])
+    frame.insert(0, "Talabgor", [f"{prefix} talabgor {i}" for i in range(n_students)])
+    return frame
+
+
+def test_all_sheets_read_cleaned_and_analyzed(tmp_path):
+    rng = np.random.default_rng(3)
+    path = tmp_path / "sinflar.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        _class_sheet(rng, 30, "9A").to_excel(writer, sheet_name="9A", index=False)
+        _class_sheet(rng, 25, "9B").to_excel(writer, sheet_name="9B", index=False)
+        pd.DataFrame().to_excel(writer, sheet_name="Bo'sh", index=False)
+
+    upload = UploadedFile(str(path))
+    sheets = upload.non_empty_sheets()
+    assert list(sheets) == ["9A", "9B"]
+    assert upload.load() is upload.load_sheets()["9A"]
+
+    cleaned, errors = clean_workbook(sheets, max_workers=2)
+    assert not errors
+    assert [len(data) for data, _ in cleaned.values()] == [30, 25]
+
+    sheet_results, combined, errors = analyze_workbook(sheets, max_workers=2)
+    assert not errors
+    assert sheet_results["9B"]["n_persons"] == 25
+    assert combined["n_persons"] == 55
+    assert combined["person_statistics"]["individual"][30]["person_name"] == "9B talabgor 0 (9B)"
+    assert COMBINED_SHEET_NAME not in sheet_results
+
+
+def test_workbook_path_only_for_shared_layout_and_key_reaches_sheets():
+    rng = np.random.default_rng(5)
+    key = list("ABCDABCD")
+
+    def raw_sheet(n_students, prefix):
+        answers = np.where(rng.random((n_students, 8)) < 0.6, key, "E")
+        frame = pd.DataFrame(answers, columns=[f"Savol {i}" for i in range(1, 9)])
+        frame.insert(0, "Talabgor", [f"{prefix} talabgor {i}" for i in range(n_students)])
+        return frame
+
+    sheets = {"9A": raw_sheet(30, "9A"), "9B": raw_sheet(25, "9B")}
+    assert sheets_share_layout(sheets)
+    assert not sheets_share_layout({"9A": sheets["9A"], "Izoh": pd.DataFrame({"Izoh": ["Test 1-chorak"]})})
+
+    # Kalitsiz va tozalash o'chiq bo'lsa xom harflar tahlil qilinmaydi
+    sheet_results, _, errors = analyze_workbook(sheets, max_workers=1, auto_clean=False)
+    assert not sheet_results and set(errors) == {"9A", "9B"}
+
+    sheet_results, combined, errors = analyze_workbook(sheets, max_workers=1, answer_key=key, auto_clean=False)
+    assert not errors
+    assert [results["n_items"] for results in sheet_results.values()] == [8, 8]
+    assert combined["n_persons"] == 55